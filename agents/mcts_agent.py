@@ -0,0 +1,259 @@
+import math
+import multiprocessing
+import random
+import time
+
+from agents.minimax_agent import SearchCancelled
+
+
+class _Node:
+    """Nó da árvore de busca: posição alcançada por move, jogado por player."""
+
+    __slots__ = ('move', 'player', 'parent', 'children', 'untried', 'visits', 'score', 'state_id')
+
+    def __init__(self, move, player, parent, untried, state_id):
+        self.move = move
+        self.player = player      # Quem fez a jogada que levou a este nó
+        self.parent = parent
+        self.children = []
+        self.untried = untried    # Jogadas ainda não expandidas
+        self.visits = 0
+        self.score = 0.0          # Soma dos resultados do ponto de vista de player
+        self.state_id = state_id
+
+
+def _other(player: str) -> str:
+    return 'O' if player == 'X' else 'X'
+
+
+class MCTSAgent:
+    """
+    Agente Monte Carlo Tree Search (UCT) para o jogo da velha e para
+    tabuleiros m,n,k (game/mnk_board.py).
+
+    Cada iteração desce a árvore pela fórmula UCT, expande uma jogada nova,
+    simula a partida até o fim (rollout) e propaga o resultado (vitória 1,
+    empate 0,5, derrota 0). A jogada escolhida é a mais visitada na raiz.
+
+    O orçamento é de time_limit segundos por jogada ou, sem time_limit, de
+    iterations iterações. rollout='random' sorteia as jogadas da simulação;
+    rollout='heuristic' vence quando possível e bloqueia a vitória imediata
+    do oponente. Com reuse_tree=True a subárvore da posição atual é
+    aproveitada entre jogadas. Com workers > 1 a busca é paralela na raiz:
+    cada processo constrói uma árvore independente e as visitas das jogadas
+    da raiz são somadas (sem reaproveitamento de árvore).
+
+    Depois de cada busca, last_iterations e iterations_per_second guardam o
+    volume de iterações realizado. Acionar o cancel_event (threading.Event)
+    passado a find_best_move, a partir de outra thread, interrompe a busca
+    (find_best_move levanta SearchCancelled). Na busca paralela o evento é
+    verificado a cada CANCEL_POLL_SECONDS e os processos em andamento são
+    encerrados.
+    """
+
+    CANCEL_POLL_SECONDS = 0.05
+
+    def __init__(
+        self,
+        ai_player: str = 'X',
+        human_player: str = 'O',
+        time_limit: float = None,
+        iterations: int = 1000,
+        exploration: float = math.sqrt(2),
+        rollout: str = 'random',
+        reuse_tree: bool = True,
+        workers: int = 1,
+        seed: int = None
+    ):
+        if rollout not in ('random', 'heuristic'):
+            raise ValueError(f"Rollout desconhecido: {rollout}. Use 'random' ou 'heuristic'.")
+        self.ai_player = ai_player
+        self.human_player = human_player
+        self.time_limit = time_limit
+        self.iterations = iterations
+        self.exploration = exploration
+        self.rollout = rollout
+        self.reuse_tree = reuse_tree
+        self.workers = workers
+        # Sem semente usa o gerador global (reproduzível com random.seed)
+        self.rng = random.Random(seed) if seed is not None else random
+        self.seed = seed
+        self.last_iterations = 0
+        self.iterations_per_second = 0.0
+        self._root = None
+        self._pool = None
+        self._cancel_event = None  # cancel_event da busca em andamento
+
+    def close(self):
+        """Encerra os processos da busca paralela, se houver."""
+        if self._pool is not None:
+            self._pool.close()
+            self._pool.join()
+            self._pool = None
+
+    def find_best_move(self, board, cancel_event=None) -> int:
+        """
+        Retorna o índice da jogada mais visitada pela busca a partir de board.
+        Levanta SearchCancelled se cancel_event for acionado antes ou durante a busca.
+        """
+        if cancel_event is not None and cancel_event.is_set():
+            raise SearchCancelled()
+        start = time.perf_counter()
+        if self.workers > 1:
+            visits, iterations = self._search_parallel(board, cancel_event)
+        else:
+            root = self._find_root(board)
+            self._cancel_event = cancel_event
+            try:
+                iterations = self._search(root, board)
+            finally:
+                self._cancel_event = None
+            visits = {child.move: child.visits for child in root.children}
+            self._root = root
+        elapsed = time.perf_counter() - start
+
+        self.last_iterations = iterations
+        self.iterations_per_second = iterations / elapsed if elapsed > 0 else 0.0
+        if not visits:
+            return self.rng.choice(list(board.get_available_moves()))
+        return max(visits, key=visits.get)
+
+    # --- Busca ---
+
+    def _new_root(self, board) -> _Node:
+        return _Node(None, self.human_player, None, list(board.get_available_moves()), board.state_id())
+
+    def _find_root(self, board) -> _Node:
+        """
+        Reaproveita a subárvore da posição atual: procura, até dois níveis
+        abaixo da raiz anterior (a nossa jogada e a resposta do oponente),
+        o nó com o mesmo estado e o mesmo jogador da vez.
+        """
+        sid = board.state_id()
+        if self.reuse_tree and self._root is not None:
+            frontier = [self._root]
+            for _ in range(3):
+                for node in frontier:
+                    if node.state_id == sid and node.player == self.human_player:
+                        node.parent = None
+                        return node
+                frontier = [child for node in frontier for child in node.children]
+        return self._new_root(board)
+
+    def _budget(self):
+        """Retorna uma função que diz se ainda há orçamento para outra iteração."""
+        if self.time_limit is not None:
+            deadline = time.perf_counter() + self.time_limit
+            return lambda i: time.perf_counter() < deadline
+        return lambda i: i < self.iterations
+
+    def _search(self, root: _Node, board) -> int:
+        has_budget = self._budget()
+        iterations = 0
+        c = self.exploration
+        while has_budget(iterations):
+            if self._cancel_event is not None and self._cancel_event.is_set():
+                raise SearchCancelled()
+            node = root
+            sim = board.copy()
+
+            # Seleção: desce enquanto o nó estiver totalmente expandido
+            while not node.untried and node.children:
+                log_n = math.log(node.visits)
+                node = max(
+                    node.children,
+                    key=lambda ch: ch.score / ch.visits + c * math.sqrt(log_n / ch.visits)
+                )
+                sim.make_move(node.move, node.player)
+
+            # Expansão
+            if node.untried and sim.check_winner() is None:
+                move = node.untried.pop(self.rng.randrange(len(node.untried)))
+                player = _other(node.player)
+                sim.make_move(move, player)
+                untried = list(sim.get_available_moves()) if sim.check_winner() is None else []
+                child = _Node(move, player, node, untried, sim.state_id())
+                node.children.append(child)
+                node = child
+
+            # Simulação e retropropagação
+            winner = self._simulate(sim, _other(node.player))
+            while node is not None:
+                node.visits += 1
+                if winner == node.player:
+                    node.score += 1.0
+                elif winner == 'Draw':
+                    node.score += 0.5
+                node = node.parent
+            iterations += 1
+        return iterations
+
+    def _simulate(self, board, player: str) -> str:
+        """Joga a partida até o fim a partir de board, com player na vez."""
+        winner = board.check_winner()
+        choice = self.rng.choice
+        while winner is None:
+            moves = board.get_available_moves()
+            if self.rollout == 'heuristic':
+                move = self._heuristic_move(board, moves, player)
+            else:
+                move = choice(moves)
+            board.make_move(move, player)
+            winner = board.check_winner()
+            player = _other(player)
+        return winner
+
+    def _heuristic_move(self, board, moves, player: str) -> int:
+        """Vitória imediata, senão bloqueio da vitória do oponente, senão uma jogada aleatória."""
+        for target in (player, _other(player)):
+            for move in moves:
+                board.make_move(move, target)
+                won = board.check_winner() == target
+                board.undo_move(move)
+                if won:
+                    return move
+        return self.rng.choice(moves)
+
+    # --- Paralelismo na raiz ---
+
+    def _search_parallel(self, board, cancel_event=None) -> tuple:
+        if self._pool is None:
+            self._pool = multiprocessing.Pool(self.workers)
+        base_seed = self.rng.randrange(2 ** 31)
+        tasks = [(self._worker_config(), board, base_seed + k) for k in range(self.workers)]
+        pending = self._pool.map_async(_run_root_search, tasks)
+        while not pending.ready():
+            if cancel_event is not None and cancel_event.is_set():
+                # Os trabalhadores não enxergam o evento: encerra-os e recria o pool na próxima busca
+                self._pool.terminate()
+                self._pool.join()
+                self._pool = None
+                raise SearchCancelled()
+            pending.wait(self.CANCEL_POLL_SECONDS)
+        visits = {}
+        iterations = 0
+        for worker_visits, worker_iterations in pending.get():
+            for move, count in worker_visits.items():
+                visits[move] = visits.get(move, 0) + count
+            iterations += worker_iterations
+        return visits, iterations
+
+    def _worker_config(self) -> dict:
+        return dict(
+            ai_player=self.ai_player,
+            human_player=self.human_player,
+            time_limit=self.time_limit,
+            iterations=self.iterations,
+            exploration=self.exploration,
+            rollout=self.rollout,
+            reuse_tree=False
+        )
+
+
+def _run_root_search(task) -> tuple:
+    """Executado em um processo trabalhador: uma árvore independente a partir de board."""
+    config, board, seed = task
+    agent = MCTSAgent(seed=seed, **config)
+    root = agent._new_root(board)
+    iterations = agent._search(root, board)
+    return {child.move: child.visits for child in root.children}, iterations
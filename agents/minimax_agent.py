@@ -1,30 +1,142 @@
 import math
+import random
+import time
+from itertools import islice
 from game.tic_tac_toe import TicTacToe
+from agents.opening_book import default_book
+from game.bitboard import BitBoard
+from game.symmetry import canonical_id
+
+
+def _geometry_of(board) -> tuple:
+    """(linhas, colunas, k) do tabuleiro; TicTacToe e BitBoard são sempre (3, 3, 3)."""
+    return getattr(board, 'rows', 3), getattr(board, 'cols', 3), getattr(board, 'k', 3)
+
+
+class SearchCancelled(Exception):
+    """Levantada quando o cancel_event passado a find_best_move é acionado."""
+
+
+class _SearchTimeout(Exception):
+    """Interrompe uma iteração do aprofundamento iterativo quando o tempo acaba."""
 
 
 class MinimaxAgent:
     """
     Agente Minimax para o Jogo da Velha.
     Usa busca exaustiva para escolher o movimento ótimo, assumindo que o oponente joga de forma ótima.
+
+    Com use_cache=True a busca é memoizada em uma tabela de transposição
+    compartilhada entre chamadas e entre instâncias. Com precompute=True a
+    árvore inteira do jogo é resolvida uma única vez e cada jogada passa a
+    ser uma consulta O(1).
+
+    Com alpha_beta=True a busca usa poda alfa-beta com ordenação de jogadas,
+    pontuação ajustada pela profundidade e, opcionalmente, um limite de
+    profundidade (max_depth) com avaliação heurística nas folhas.
+    O atributo nodes_searched guarda quantos nós a última busca visitou.
+    find_best_move aceita um threading.Event (cancel_event) próprio de cada
+    pedido: acioná-lo, de outra thread, interrompe a busca, ou a impede de
+    começar, e find_best_move levanta SearchCancelled.
+
+    Com symmetric=True a tabela de transposição é indexada pelo representante
+    canônico de cada posição (game/symmetry.py), de modo que posições
+    equivalentes por rotação ou reflexão são avaliadas uma única vez.
+
+    Com use_book=True o livro de aberturas (agents/opening_book.py), se já
+    tiver sido gerado, é consultado antes de qualquer busca no 3x3, e
+    solve_game_tree o usa no lugar de resolver a árvore. Com use_book=None
+    (padrão) o livro só é consultado no modo padrão: pedir um modo de busca
+    (alpha_beta, use_cache, precompute, symmetric ou max_depth) o desliga,
+    para que a busca (e nodes_searched) aconteça de fato.
+
+    Com random_ties=True, as jogadas respondidas pela solução (precompute)
+    ou pelo livro são sorteadas entre todas as de mesmo valor ótimo, em vez
+    de ser sempre a de menor índice: o jogo continua perfeito, mas variado
+    (usado pelo oponente Minimax do treino).
+
+    Em tabuleiros m,n,k maiores que 3x3 (game/mnk_board.py) a busca usa
+    aprofundamento iterativo com alfa-beta e tabela de transposição, parando
+    em time_limit segundos (ou max_depth) com a melhor jogada da última
+    profundidade concluída (guardada em search_depth). Com mais de 9 casas,
+    time_limit ou max_depth é obrigatório.
     """
 
-    def __init__(self, ai_player: str = 'X', human_player: str = 'O'):
+    # Ordem de preferência das casas: centro, cantos e laterais.
+    POSITIONAL_ORDER = (4, 0, 2, 6, 8, 1, 3, 5, 7)
+
+    WIN_LINES = (
+        (0, 1, 2), (3, 4, 5), (6, 7, 8),  # linhas
+        (0, 3, 6), (1, 4, 7), (2, 5, 8),  # colunas
+        (0, 4, 8), (2, 4, 6)              # diagonais
+    )
+
+    # Tabela de transposição compartilhada por todas as instâncias:
+    # (state_id, jogador_da_vez) -> valor do ponto de vista de quem joga.
+    _transposition_table = {}
+
+    # Solução completa do jogo (preenchida por solve_game_tree):
+    # (state_id, jogador_da_vez) -> (valor ajustado pela distância, [melhores jogadas])
+    _solution = None
+
+    # Busca m,n,k: vitória vale WIN_SCORE + casas livres (vitórias mais rápidas
+    # valem mais e o valor depende só da posição, o que permite guardá-lo na
+    # tabela). A tabela é só da geometria (rows, cols, k) da última busca:
+    # (state_id, jogador_da_vez) -> (profundidade, valor, tipo do limite, melhor jogada).
+    # Ao atingir MNK_TABLE_MAX_ENTRIES, a metade mais antiga é descartada.
+    WIN_SCORE = 1_000_000
+    EXACT, LOWER, UPPER = 0, 1, 2
+    _mnk_table = {}
+    _mnk_geometry = None
+    MNK_TABLE_MAX_ENTRIES = 200_000
+    NODES_PER_CLOCK_CHECK = 1024
+
+    def __init__(
+        self,
+        ai_player: str = 'X',
+        human_player: str = 'O',
+        use_cache: bool = False,
+        precompute: bool = False,
+        alpha_beta: bool = False,
+        max_depth: int = None,
+        symmetric: bool = False,
+        time_limit: float = None,
+        use_book: bool = None,
+        random_ties: bool = False
+    ):
         self.ai_player = ai_player
         self.human_player = human_player
+        self.use_cache = use_cache or precompute
+        self.alpha_beta = alpha_beta
+        self.max_depth = max_depth
+        self.symmetric = symmetric
+        self.time_limit = time_limit
+        if use_book is None:
+            use_book = not (self.use_cache or alpha_beta or symmetric or max_depth is not None)
+        self.use_book = use_book
+        self.random_ties = random_ties
+        self.nodes_searched = 0
+        self.search_depth = 0
+        self._deadline = None
+        self._cancel_event = None  # cancel_event da busca em andamento
+        if precompute:
+            MinimaxAgent.solve_game_tree()
 
-    def evaluate(self, board: TicTacToe) -> int:
+    def evaluate(self, board: TicTacToe, depth: int = 0) -> int:
         """
         Avalia o estado terminal do tabuleiro:
           +10 se o agente AI venceu;
           -10 se o oponente venceu;
           0 se empate.
+        Com depth > 0 a pontuação é ajustada (10 - depth / depth - 10) para
+        preferir vitórias mais rápidas e derrotas mais demoradas.
         Retorna None se o jogo não acabou.
         """
         result = board.check_winner()
         if result == self.ai_player:
-            return 10
+            return 10 - depth
         elif result == self.human_player:
-            return -10
+            return depth - 10
         elif result == 'Draw':
             return 0
         return None
@@ -35,7 +147,15 @@ class MinimaxAgent:
         depth: profundidade atual da recursão (opcional para aprimoramentos).
         is_maximizing: True se for a vez do jogador maximizador (AI), False caso contrário.
         """
-        score = self.evaluate(board)
+        self.nodes_searched += 1
+        if self._cancel_event is not None and self._cancel_event.is_set():
+            raise SearchCancelled()
+        if self.use_cache:
+            to_move = self.ai_player if is_maximizing else self.human_player
+            val = self._cached_negamax(board, to_move)
+            return val if is_maximizing else -val
+
+        score = self.evaluate(board, depth)
         if score is not None:
             return score
 
@@ -44,7 +164,7 @@ class MinimaxAgent:
             for move in board.get_available_moves():
                 board.make_move(move, self.ai_player)
                 val = self.minimax(board, depth + 1, False)
-                board.board[move] = None  # desfaz movimento
+                board.undo_move(move)  # desfaz movimento
                 best_val = max(best_val, val)
             return best_val
         else:
@@ -52,23 +172,458 @@ class MinimaxAgent:
             for move in board.get_available_moves():
                 board.make_move(move, self.human_player)
                 val = self.minimax(board, depth + 1, True)
-                board.board[move] = None  # desfaz movimento
+                board.undo_move(move)  # desfaz movimento
+                best_val = min(best_val, val)
+            return best_val
+
+    def alphabeta(
+        self,
+        board: TicTacToe,
+        depth: int,
+        alpha: float,
+        beta: float,
+        is_maximizing: bool
+    ) -> float:
+        """
+        Minimax com poda alfa-beta.
+        Interrompe a exploração de um ramo assim que ele não pode mais alterar
+        a decisão e, se max_depth for atingido, devolve a avaliação heurística.
+        """
+        self.nodes_searched += 1
+        if self._cancel_event is not None and self._cancel_event.is_set():
+            raise SearchCancelled()
+        score = self.evaluate(board, depth)
+        if score is not None:
+            return score
+        if self.max_depth is not None and depth >= self.max_depth:
+            return self.heuristic(board)
+
+        if is_maximizing:
+            best_val = -math.inf
+            for move in self._ordered_moves(board, self.ai_player):
+                board.make_move(move, self.ai_player)
+                val = self.alphabeta(board, depth + 1, alpha, beta, False)
+                board.undo_move(move)  # desfaz movimento
+                best_val = max(best_val, val)
+                alpha = max(alpha, val)
+                if alpha >= beta:
+                    break
+            return best_val
+        else:
+            best_val = math.inf
+            for move in self._ordered_moves(board, self.human_player):
+                board.make_move(move, self.human_player)
+                val = self.alphabeta(board, depth + 1, alpha, beta, True)
+                board.undo_move(move)  # desfaz movimento
                 best_val = min(best_val, val)
+                beta = min(beta, val)
+                if alpha >= beta:
+                    break
             return best_val
 
-    def find_best_move(self, board: TicTacToe) -> int:
+    def heuristic(self, board: TicTacToe) -> float:
+        """
+        Avaliação de posições não terminais usada quando max_depth é atingido.
+        Cada linha ainda aberta soma 1 (uma peça) ou 3 (duas peças) para quem a
+        ocupa. O total é dividido por 25 para ficar sempre abaixo, em módulo,
+        de qualquer resultado decidido (o menor deles vale 10 - 9 = 1).
+        """
+        state = board.get_state()
+        score = 0
+        for line in self.WIN_LINES:
+            cells = [state[i] for i in line]
+            mine = cells.count(self.ai_player)
+            theirs = cells.count(self.human_player)
+            if mine and not theirs:
+                score += 1 if mine == 1 else 3
+            elif theirs and not mine:
+                score -= 1 if theirs == 1 else 3
+        return score / 25
+
+    def _ordered_moves(self, board: TicTacToe, player: str) -> list:
+        """
+        Ordena as jogadas para maximizar as podas: primeiro as que vencem,
+        depois as que bloqueiam uma vitória do oponente e, por fim, centro,
+        cantos e laterais.
+        """
+        other = 'O' if player == 'X' else 'X'
+        state = board.get_state()
+        available = set(board.get_available_moves())
+        wins, blocks = [], []
+        for a, b, c in self.WIN_LINES:
+            cells = (state[a], state[b], state[c])
+            if cells.count(None) != 1:
+                continue
+            empty = (a, b, c)[cells.index(None)]
+            if cells.count(player) == 2:
+                wins.append(empty)
+            elif cells.count(other) == 2:
+                blocks.append(empty)
+        ordered = []
+        for move in wins + blocks + [m for m in self.POSITIONAL_ORDER if m in available]:
+            if move not in ordered:
+                ordered.append(move)
+        return ordered
+
+    def _cached_negamax(self, board: TicTacToe, to_move: str) -> int:
+        """
+        Minimax memoizado na forma negamax: retorna o valor do estado do
+        ponto de vista de to_move (10 - n para vitória em n lances, n - 10 para
+        derrota em n lances, 0 empate), de modo que vitórias mais rápidas e
+        derrotas mais demoradas são preferidas.
+        Por não depender de ai_player, a tabela é válida para qualquer instância.
+        """
+        self.nodes_searched += 1
+        if self._cancel_event is not None and self._cancel_event.is_set():
+            raise SearchCancelled()
+        sid = board.state_id()
+        if self.symmetric:
+            sid = canonical_id(sid)[0]
+        key = (sid, to_move)
+        cached = MinimaxAgent._transposition_table.get(key)
+        if cached is not None:
+            return cached
+
+        result = board.check_winner()
+        if result == 'Draw':
+            best_val = 0
+        elif result is not None:
+            best_val = 10 if result == to_move else -10
+        else:
+            other = 'O' if to_move == 'X' else 'X'
+            best_val = -math.inf
+            for move in board.get_available_moves():
+                board.make_move(move, to_move)
+                val = self._one_ply_back(-self._cached_negamax(board, other))
+                board.undo_move(move)  # desfaz movimento
+                if val > best_val:
+                    best_val = val
+
+        MinimaxAgent._transposition_table[key] = best_val
+        return best_val
+
+    @staticmethod
+    def _one_ply_back(value: int) -> int:
+        """Valor de um resultado visto um lance antes: vitórias e derrotas ficam um lance mais distantes."""
+        if value > 0:
+            return value - 1
+        if value < 0:
+            return value + 1
+        return 0
+
+    @classmethod
+    def solve_game_tree(cls) -> dict:
+        """
+        Resolve uma única vez todas as posições legais alcançáveis a partir do
+        tabuleiro vazio (com 'X' ou 'O' começando), guardando para cada posição não
+        terminal o valor e a lista de melhores jogadas de quem está na vez.
+        Se o livro de aberturas existir, a solução é lida dele, sem busca.
+        """
+        if cls._solution is not None:
+            return cls._solution
+        book = default_book()
+        if book is not None:
+            cls._solution = book.solution()
+        else:
+            cls._solution = cls.search_game_tree()
+        return cls._solution
+
+    @classmethod
+    def search_game_tree(cls) -> dict:
+        """Resolve a árvore inteira por busca (sem cache nem livro); usado por solve_game_tree."""
+        solution = {}
+        board = BitBoard()
+        solver = cls()
+
+        def visit(to_move):
+            key = (board.state_id(), to_move)
+            if key in solution or board.check_winner() is not None:
+                return
+            other = 'O' if to_move == 'X' else 'X'
+            values = {}
+            for move in board.get_available_moves():
+                board.make_move(move, to_move)
+                values[move] = cls._one_ply_back(-solver._cached_negamax(board, other))
+                visit(other)
+                board.undo_move(move)  # desfaz movimento
+            best_val = max(values.values())
+            solution[key] = (best_val, [m for m, v in values.items() if v == best_val])
+
+        visit('X')
+        visit('O')
+        return solution
+
+    def find_best_move(self, board: TicTacToe, cancel_event=None) -> int:
         """
         Retorna o índice (0-8) do melhor movimento para o agente AI no tabuleiro atual.
+        Levanta SearchCancelled se cancel_event (threading.Event) for acionado
+        antes ou durante a busca.
         """
+        self.nodes_searched = 0
+        if cancel_event is not None and cancel_event.is_set():
+            raise SearchCancelled()
+        self._cancel_event = cancel_event
+        try:
+            return self._find_best_move(board)
+        finally:
+            self._cancel_event = None
+
+    def _find_best_move(self, board: TicTacToe) -> int:
+        if _geometry_of(board) != (3, 3, 3):
+            return self._find_best_move_iterative(board)
+        # A solução e o livro são exatos; com max_depth vale a busca limitada
+        if MinimaxAgent._solution is not None and self.max_depth is None:
+            entry = MinimaxAgent._solution.get((board.state_id(), self.ai_player))
+            if entry is not None:
+                return self._pick(entry[1])
+        if self.use_book and self.max_depth is None:
+            book = default_book()
+            if book is not None:
+                entry = book.lookup(board.state_id(), self.ai_player)
+                if entry is not None:
+                    return self._pick(entry[1])
+
+        if self.alpha_beta:
+            return self._find_best_move_alphabeta(board)
+
         best_move = None
         best_val = -math.inf
         for move in board.get_available_moves():
             board.make_move(move, self.ai_player)
             move_val = self.minimax(board, 0, False)
-            board.board[move] = None  # desfaz movimento
+            board.undo_move(move)  # desfaz movimento
 
             if move_val > best_val:
                 best_val = move_val
                 best_move = move
 
         return best_move
+
+    def _pick(self, best_moves: list) -> int:
+        """Uma das melhores jogadas: a de menor índice ou, com random_ties, sorteada."""
+        if self.random_ties and len(best_moves) > 1:
+            return random.choice(best_moves)
+        return best_moves[0]
+
+    def _find_best_move_alphabeta(self, board: TicTacToe) -> int:
+        """Raiz da busca alfa-beta: percorre as jogadas já ordenadas."""
+        best_move = None
+        best_val = -math.inf
+        alpha, beta = -math.inf, math.inf
+        for move in self._ordered_moves(board, self.ai_player):
+            board.make_move(move, self.ai_player)
+            move_val = self.alphabeta(board, 1, alpha, beta, False)
+            board.undo_move(move)  # desfaz movimento
+
+            if move_val > best_val:
+                best_val = move_val
+                best_move = move
+            alpha = max(alpha, best_val)
+
+        return best_move
+
+    # --- Tabuleiros m,n,k ---
+
+    def _find_best_move_iterative(self, board) -> int:
+        """
+        Tenta primeiro resolver a posição até o fim com metade de time_limit
+        (as folhas heurísticas das buscas rasas podam pouco, e em tabuleiros
+        como o 4x4 a busca completa termina antes). Se não conseguir, faz
+        aprofundamento iterativo (profundidade 1, 2, ...) até max_depth ou
+        até esgotar o tempo, devolvendo a jogada da última profundidade
+        concluída.
+        """
+        if board.cells > 9 and self.time_limit is None and self.max_depth is None:
+            raise ValueError(f"Tabuleiro {board.rows}x{board.cols}: defina time_limit ou max_depth.")
+        geometry = _geometry_of(board)
+        if MinimaxAgent._mnk_geometry != geometry:
+            MinimaxAgent._mnk_table.clear()
+            MinimaxAgent._mnk_geometry = geometry
+        original = board
+        board = original.copy()  # Um timeout interrompe a busca com jogadas ainda feitas
+        empties = len(board.get_available_moves())
+        max_depth = min(self.max_depth or empties, empties)
+        best_move = self._mnk_moves(board, None, self.ai_player)[0]
+        self.search_depth = 0
+        start = time.perf_counter()
+        try:
+            if max_depth == empties:
+                self._deadline = start + self.time_limit / 2 if self.time_limit else None
+                try:
+                    _, best_move = self._mnk_root(board, empties)
+                    self.search_depth = empties
+                    return best_move
+                except _SearchTimeout:
+                    board = original.copy()
+
+            self._deadline = start + self.time_limit if self.time_limit else None
+            for depth in range(1, max_depth + 1):
+                try:
+                    value, move = self._mnk_root(board, depth)
+                except _SearchTimeout:
+                    break
+                best_move = move
+                self.search_depth = depth
+                if abs(value) >= self.WIN_SCORE:
+                    break  # Resultado já decidido
+        finally:
+            self._deadline = None
+        return best_move
+
+    def _mnk_root(self, board, depth: int) -> tuple:
+        other = self.human_player
+        key = (board.state_id(), self.ai_player)
+        entry = MinimaxAgent._mnk_table.get(key)
+        best_move, best_val = None, -math.inf
+        alpha = -math.inf
+        for move in self._mnk_moves(board, entry[3] if entry else None, self.ai_player):
+            board.make_move(move, self.ai_player)
+            val = -self._mnk_negamax(board, other, depth - 1, -math.inf, -alpha)
+            board.undo_move(move)  # desfaz movimento
+            if val > best_val:
+                best_val, best_move = val, move
+            alpha = max(alpha, val)
+        self._mnk_store(key, (depth, best_val, self.EXACT, best_move))
+        return best_val, best_move
+
+    def _mnk_negamax(self, board, to_move: str, depth: int, alpha: float, beta: float) -> float:
+        """Negamax com alfa-beta e tabela de transposição, do ponto de vista de to_move."""
+        self.nodes_searched += 1
+        if self._cancel_event is not None and self._cancel_event.is_set():
+            raise SearchCancelled()
+        if (self._deadline is not None and self.nodes_searched % self.NODES_PER_CLOCK_CHECK == 0
+                and time.perf_counter() > self._deadline):
+            raise _SearchTimeout()
+
+        result = board.check_winner()
+        if result == 'Draw':
+            return 0
+        if result is not None:
+            # Quem acabou de jogar venceu
+            free = board.geometry.full_mask & ~(board.x_bits | board.o_bits)
+            return -(self.WIN_SCORE + bin(free).count('1'))
+        if self._mnk_dead_draw(board, to_move):
+            return 0
+        if depth == 0:
+            return self._mnk_heuristic(board, to_move)
+
+        key = (board.state_id(), to_move)
+        entry = MinimaxAgent._mnk_table.get(key)
+        tt_move = None
+        if entry is not None:
+            entry_depth, value, bound, tt_move = entry
+            if entry_depth >= depth:
+                if bound == self.EXACT:
+                    return value
+                if bound == self.LOWER:
+                    alpha = max(alpha, value)
+                else:
+                    beta = min(beta, value)
+                if alpha >= beta:
+                    return value
+
+        original_alpha = alpha
+        other = 'O' if to_move == 'X' else 'X'
+        best_val, best_move = -math.inf, None
+        for move in self._mnk_moves(board, tt_move, to_move):
+            board.make_move(move, to_move)
+            val = -self._mnk_negamax(board, other, depth - 1, -beta, -alpha)
+            board.undo_move(move)  # desfaz movimento
+            if val > best_val:
+                best_val, best_move = val, move
+            alpha = max(alpha, val)
+            if alpha >= beta:
+                break
+
+        if best_val <= original_alpha:
+            bound = self.UPPER
+        elif best_val >= beta:
+            bound = self.LOWER
+        else:
+            bound = self.EXACT
+        # Vitórias e derrotas forçadas valem para qualquer profundidade
+        proven = (abs(best_val) >= self.WIN_SCORE
+                  and (bound == self.EXACT or (bound == self.LOWER) == (best_val > 0)))
+        self._mnk_store(key, (board.cells if proven else depth, best_val, bound, best_move))
+        return best_val
+
+    def _mnk_store(self, key: tuple, entry: tuple):
+        table = MinimaxAgent._mnk_table
+        if len(table) >= self.MNK_TABLE_MAX_ENTRIES and key not in table:
+            for old in list(islice(table, len(table) // 2)):  # As mais antigas
+                del table[old]
+        table[key] = entry
+
+    @staticmethod
+    def _mnk_dead_draw(board, to_move: str) -> bool:
+        """
+        True se nenhum jogador ainda consegue completar uma linha: todas já
+        têm peças dos dois, ou faltam mais peças do que jogadas restantes.
+        """
+        x_bits, o_bits = board.x_bits, board.o_bits
+        free = bin(board.geometry.full_mask & ~(x_bits | o_bits)).count('1')
+        x_moves = (free + 1) // 2 if to_move == 'X' else free // 2
+        o_moves = free - x_moves
+        k = board.k
+        for mask in board.geometry.win_masks:
+            x, o = x_bits & mask, o_bits & mask
+            if not o and k - bin(x).count('1') <= x_moves:
+                return False
+            if not x and k - bin(o).count('1') <= o_moves:
+                return False
+        return True
+
+    def _mnk_moves(self, board, first: int = None, to_move: str = None) -> list:
+        """
+        Jogadas do centro para as bordas, começando pela melhor jogada da
+        tabela de transposição. Se to_move pode vencer agora, só a vitória é
+        considerada; se o oponente ameaça vencer, só os bloqueios (qualquer
+        outra jogada perde na seguinte). Em tabuleiros grandes (mais de 25
+        casas) só entram as casas vizinhas de alguma peça já jogada.
+        """
+        geo = board.geometry
+        occupied = board.x_bits | board.o_bits
+        candidates = geo.full_mask & ~occupied
+        if to_move is not None:
+            mine, theirs = (board.x_bits, board.o_bits) if to_move == 'X' else (board.o_bits, board.x_bits)
+            wins = blocks = 0
+            for mask in geo.win_masks:
+                gap = mask & ~occupied
+                if gap and not gap & (gap - 1):  # Exatamente uma casa livre na linha
+                    if mine & mask | gap == mask:
+                        wins = gap
+                        break
+                    if theirs & mask | gap == mask:
+                        blocks |= gap
+            if wins:
+                return [wins.bit_length() - 1]
+            if blocks:
+                candidates = blocks
+        if geo.cells > 25 and occupied and candidates == geo.full_mask & ~occupied:
+            near = 0
+            bits = occupied
+            while bits:
+                low = bits & -bits
+                near |= geo.neighbors[low.bit_length() - 1]
+                bits ^= low
+            candidates &= near
+        moves = [m for m in geo.center_order if candidates >> m & 1]
+        if first is not None and first in moves:
+            moves.remove(first)
+            moves.insert(0, first)
+        return moves
+
+    def _mnk_heuristic(self, board, to_move: str) -> float:
+        """
+        Avaliação na profundidade limite: cada linha ocupada por um único
+        jogador soma 4^(peças - 1) para ele. Fica sempre abaixo de WIN_SCORE.
+        """
+        mine, theirs = (board.x_bits, board.o_bits) if to_move == 'X' else (board.o_bits, board.x_bits)
+        score = 0
+        for mask in board.geometry.win_masks:
+            m, t = mine & mask, theirs & mask
+            if m and not t:
+                score += 4 ** (bin(m).count('1') - 1)
+            elif t and not m:
+                score -= 4 ** (bin(t).count('1') - 1)
+        return score
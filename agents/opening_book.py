@@ -0,0 +1,154 @@
+"""
+Livro de aberturas e tabela de finais do jogo da velha 3x3.
+
+Guarda, para cada posição não terminal (no referencial canônico de
+game/symmetry.py) e cada jogador da vez, o valor teórico da posição
+para quem joga (10 - n para vitória em n lances, n - 10 para derrota em n
+lances, 0 empate) e todas as melhores jogadas: entre vitórias, só as mais
+rápidas. Como o 3x3 é pequeno, o "livro" cobre o jogo inteiro: aberturas,
+meio-jogo e finais são respondidos por consulta, sem busca.
+
+O arquivo é gerado uma única vez (python build_opening_book.py) e lido sob
+demanda na primeira consulta. Layout (little-endian):
+  - 4 bytes : assinatura b'TTTB'
+  - uint16  : versão do formato
+  - uint16  : reservado
+  - uint32  : número de registros
+  - uint32  : CRC32 dos registros
+  - registros RECORD_DTYPE ordenados por (state_id canônico, jogador da vez)
+"""
+import os
+import struct
+import threading
+import zlib
+
+import numpy as np
+
+from agents.q_table_io import atomic_write
+from game.symmetry import INVERSE, canonical_id, from_canonical_action, to_canonical_action, transform_state_id
+
+MAGIC = b'TTTB'
+VERSION = 2  # 2: valores ajustados pela distância até o fim
+_PREFIX = struct.Struct('<4sHHII')
+
+# to_move: 0 para 'X', 1 para 'O'; moves: máscara de 9 bits das melhores
+# jogadas no referencial canônico.
+RECORD_DTYPE = np.dtype([('state_id', '<u4'), ('to_move', 'u1'), ('value', 'i1'), ('moves', '<u2')])
+
+DEFAULT_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'opening_book.bin')
+
+_PLAYER_CODES = {'X': 0, 'O': 1}
+
+
+class OpeningBook:
+    """Consulta ao livro: (state_id canônico, jogador da vez) -> (valor, máscara de jogadas)."""
+
+    def __init__(self, records: np.ndarray):
+        self._entries = {
+            (int(r['state_id']), int(r['to_move'])): (int(r['value']), int(r['moves']))
+            for r in records
+        }
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def lookup(self, state_id: int, to_move: str):
+        """
+        Retorna (valor, [melhores jogadas em ordem crescente]) para a posição
+        state_id com to_move na vez, ou None se ela não estiver no livro.
+        """
+        canon_sid, t = canonical_id(state_id)
+        entry = self._entries.get((canon_sid, _PLAYER_CODES[to_move]))
+        if entry is None:
+            return None
+        value, mask = entry
+        moves = sorted(from_canonical_action(m, t) for m in range(9) if mask >> m & 1)
+        return value, moves
+
+    def solution(self) -> dict:
+        """
+        Expande o livro para todas as posições (as 8 imagens de cada posição
+        canônica), no formato de MinimaxAgent.solve_game_tree:
+        (state_id, jogador da vez) -> (valor, [melhores jogadas em ordem crescente]).
+        """
+        solution = {}
+        players = {code: player for player, code in _PLAYER_CODES.items()}
+        for (canon_sid, code), (value, mask) in self._entries.items():
+            canon_moves = [m for m in range(9) if mask >> m & 1]
+            for t in range(8):
+                key = (transform_state_id(canon_sid, t), players[code])
+                if key not in solution:
+                    solution[key] = (value, sorted(INVERSE[t][m] for m in canon_moves))
+        return solution
+
+    def best_move(self, state_id: int, to_move: str):
+        """Menor índice entre as melhores jogadas, ou None fora do livro."""
+        entry = self.lookup(state_id, to_move)
+        return entry[1][0] if entry is not None else None
+
+
+def build_records() -> np.ndarray:
+    """Resolve o jogo e reduz a solução às posições canônicas."""
+    from agents.minimax_agent import MinimaxAgent  # Evita importação circular
+
+    solution = MinimaxAgent.search_game_tree()
+    canonical = {}
+    for (sid, to_move), (value, moves) in solution.items():
+        canon_sid, t = canonical_id(sid)
+        mask = 0
+        for move in moves:
+            mask |= 1 << to_canonical_action(move, t)
+        canonical[(canon_sid, _PLAYER_CODES[to_move])] = (value, mask)
+
+    records = np.zeros(len(canonical), dtype=RECORD_DTYPE)
+    for i, (key, (value, mask)) in enumerate(sorted(canonical.items())):
+        records[i] = (key[0], key[1], value, mask)
+    return records
+
+
+def save(path: str, records: np.ndarray):
+    """Grava os registros no formato binário do livro (de forma atômica)."""
+    data = np.ascontiguousarray(records, dtype=RECORD_DTYPE).tobytes()
+
+    def write(f):
+        f.write(_PREFIX.pack(MAGIC, VERSION, 0, len(records), zlib.crc32(data)))
+        f.write(data)
+
+    atomic_write(path, write)
+
+
+def load(path: str) -> OpeningBook:
+    """Lê e valida um livro gravado por save."""
+    with open(path, 'rb') as f:
+        prefix = f.read(_PREFIX.size)
+        if len(prefix) < _PREFIX.size:
+            raise ValueError(f"Arquivo truncado: {path}")
+        magic, version, _, count, checksum = _PREFIX.unpack(prefix)
+        if magic != MAGIC:
+            raise ValueError(f"{path} não é um livro de aberturas.")
+        if version != VERSION:
+            raise ValueError(f"Versão {version} do livro de aberturas não suportada (esperada {VERSION}).")
+        data = f.read()
+    if len(data) != count * RECORD_DTYPE.itemsize or zlib.crc32(data) != checksum:
+        raise ValueError(f"Livro de aberturas corrompido: {path}")
+    return OpeningBook(np.frombuffer(data, dtype=RECORD_DTYPE))
+
+
+_default_book = None
+_default_loaded = False
+_default_lock = threading.Lock()
+
+
+def default_book():
+    """
+    Livro em DEFAULT_PATH, carregado na primeira chamada. Retorna None se o
+    arquivo ainda não foi gerado.
+    """
+    global _default_book, _default_loaded
+    if not _default_loaded:
+        with _default_lock:
+            if not _default_loaded:
+                if os.path.isfile(DEFAULT_PATH):
+                    _default_book = load(DEFAULT_PATH)
+                _default_loaded = True
+    return _default_book
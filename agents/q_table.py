@@ -0,0 +1,200 @@
+"""
+Backends da tabela Q usados pelo QLearningAgent.
+
+  - DictQTable: formato original, {state_key: {str(action): q_value}}.
+  - DenseQTable: matriz NumPy float32[num_states, 9], com cada posição legal
+    mapeada para um índice inteiro denso e as jogadas ilegais mascaradas.
+
+Os dois expõem a mesma interface (get, set, max_q, best_actions, to_dict,
+from_dict), e ambos leem e escrevem o formato JSON original.
+"""
+import numpy as np
+
+from game.bitboard import BitBoard, legal_state_ids
+from game.symmetry import canonical_state, to_canonical_action
+
+
+def state_key(state: tuple) -> str:
+    """Converte a tupla do estado na chave textual do formato JSON ('X', 'O' ou '-')."""
+    return ''.join([s if s is not None else '-' for s in state])
+
+
+def state_from_key(key: str) -> tuple:
+    """Inverso de state_key."""
+    return tuple(None if c == '-' else c for c in key)
+
+
+def canonicalize_q_dict(data: dict) -> dict:
+    """
+    Converte uma tabela no formato JSON para o referencial canônico
+    (game/symmetry.py). Entradas equivalentes por simetria são unidas pela
+    média dos seus valores.
+    """
+    sums = {}
+    for key, actions in data.items():
+        cstate, t = canonical_state(state_from_key(key))
+        ckey = state_key(cstate)
+        for action, value in actions.items():
+            caction = str(to_canonical_action(int(action), t))
+            total, count = sums.get((ckey, caction), (0.0, 0))
+            sums[(ckey, caction)] = (total + value, count + 1)
+    result = {}
+    for (ckey, caction), (total, count) in sums.items():
+        result.setdefault(ckey, {})[caction] = total / count
+    return result
+
+
+class DictQTable:
+    """Tabela Q em dicionário de dicionários (formato original do projeto)."""
+
+    def __init__(self):
+        self.table = {}  # {state_key: {action: q_value}}
+        self.dirty = set()  # chaves alteradas desde o último take_dirty()
+
+    def __len__(self):
+        return len(self.table)
+
+    def get(self, state: tuple, action: int) -> float:
+        entry = self.table.get(state_key(state))
+        if entry is None:
+            return 0.0
+        return entry.get(str(action), 0.0)
+
+    def set(self, state: tuple, action: int, value: float):
+        key = state_key(state)
+        if key not in self.table:
+            self.table[key] = {}
+        self.table[key][str(action)] = value
+        self.dirty.add(key)
+
+    def max_q(self, state: tuple, moves) -> float:
+        entry = self.table.get(state_key(state), {})
+        return max(entry.get(str(a), 0.0) for a in moves)
+
+    def best_actions(self, state: tuple, moves) -> list:
+        entry = self.table.get(state_key(state), {})
+        q_values = {move: entry.get(str(move), 0.0) for move in moves}
+        max_q = max(q_values.values())
+        return [move for move, q in q_values.items() if q == max_q]
+
+    def to_dict(self) -> dict:
+        return self.table
+
+    def take_dirty(self) -> dict:
+        """Cópia das entradas alteradas desde a última chamada (e limpa a marcação)."""
+        delta = {key: dict(self.table[key]) for key in self.dirty}
+        self.dirty.clear()
+        return delta
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'DictQTable':
+        table = cls()
+        table.table = data
+        return table
+
+
+class DenseQTable:
+    """
+    Tabela Q densa: uma linha float32 de 9 ações para cada uma das 8.533
+    posições legais (com 'X' ou 'O' começando). O índice de cada estado é pré-calculado, então consultar
+    e atualizar custam apenas alguns acessos a arrays. Jogadas ilegais valem
+    -inf, o que torna a escolha gulosa e o max futuro operações de linha.
+    """
+
+    _state_ids = None      # índice denso -> state_id
+    _index = None          # tupla do estado -> índice denso
+    _legal_mask = None     # bool[num_states, 9]
+    _sid_index = None      # int32[2**18]: state_id -> índice denso (-1 se ilegal)
+
+    def __init__(self, dtype=np.float32):
+        self._build_index()
+        num_states = len(DenseQTable._state_ids)
+        self.values = np.where(DenseQTable._legal_mask, 0.0, -np.inf).astype(dtype)
+        # Marca os pares (estado, ação) já atualizados, para exportar ao JSON
+        # exatamente as entradas que o formato em dicionário teria.
+        self.visited = np.zeros((num_states, 9), dtype=bool)
+
+    @classmethod
+    def _build_index(cls):
+        if cls._index is not None:
+            return
+        state_ids = legal_state_ids()
+        index = {}
+        legal_mask = np.zeros((len(state_ids), 9), dtype=bool)
+        sid_index = np.full(1 << 18, -1, dtype=np.int32)
+        for i, sid in enumerate(state_ids):
+            board = BitBoard.from_state_id(sid)
+            index[board.get_state()] = i
+            legal_mask[i, list(board.get_available_moves())] = True
+            sid_index[sid] = i
+        cls._state_ids = state_ids
+        cls._sid_index = sid_index
+        cls._index = index
+        cls._legal_mask = legal_mask
+
+    def __len__(self):
+        return int(self.visited.any(axis=1).sum())
+
+    def state_index(self, state: tuple) -> int:
+        """Índice denso do estado (KeyError se a posição não for legal)."""
+        return DenseQTable._index[state]
+
+    @classmethod
+    def indices(cls, state_ids: np.ndarray) -> np.ndarray:
+        """Índices densos de um array de state_ids (versão vetorizada de state_index)."""
+        cls._build_index()
+        return cls._sid_index[state_ids]
+
+    def get(self, state: tuple, action: int) -> float:
+        return float(self.values[DenseQTable._index[state], action])
+
+    def set(self, state: tuple, action: int, value: float):
+        idx = DenseQTable._index[state]
+        self.values[idx, action] = value
+        self.visited[idx, action] = True
+
+    def max_q(self, state: tuple, moves=None) -> float:
+        return float(self.values[DenseQTable._index[state]].max())
+
+    def best_actions(self, state: tuple, moves=None) -> list:
+        # moves é ignorado: as jogadas disponíveis já estão codificadas na
+        # máscara de legalidade (as ilegais valem -inf).
+        row = self.values[DenseQTable._index[state]]
+        return np.flatnonzero(row == row.max()).tolist()
+
+    @classmethod
+    def from_arrays(cls, values: np.ndarray, visited: np.ndarray) -> 'DenseQTable':
+        """Cria a tabela sobre arrays já existentes (ex.: numpy.memmap), sem copiá-los."""
+        cls._build_index()
+        expected = (len(cls._state_ids), 9)
+        if values.shape != expected or visited.shape != expected:
+            raise ValueError(f"Dimensões inválidas da tabela Q: {values.shape}, esperado {expected}")
+        table = cls.__new__(cls)
+        table.values = values
+        table.visited = visited
+        return table
+
+    def copy(self) -> 'DenseQTable':
+        """Cópia independente dos arrays (tamanho fixo, não cresce com o treino)."""
+        return DenseQTable.from_arrays(np.array(self.values), np.array(self.visited))
+
+    def to_dict(self) -> dict:
+        data = {}
+        for idx, action in zip(*np.nonzero(self.visited)):
+            key = state_key(BitBoard.from_state_id(DenseQTable._state_ids[idx]).get_state())
+            data.setdefault(key, {})[str(action)] = float(self.values[idx, action])
+        return data
+
+    @classmethod
+    def from_dict(cls, data: dict, dtype=np.float32) -> 'DenseQTable':
+        table = cls(dtype)
+        for key, actions in data.items():
+            idx = DenseQTable._index.get(state_from_key(key))
+            if idx is None:
+                raise ValueError(f"Estado inválido na tabela Q: {key}")
+            for action, value in actions.items():
+                if not DenseQTable._legal_mask[idx, int(action)]:
+                    raise ValueError(f"Ação inválida na tabela Q: {key} -> {action}")
+                table.values[idx, int(action)] = value
+                table.visited[idx, int(action)] = True
+        return table
@@ -0,0 +1,229 @@
+"""
+Formato binário da tabela Q densa e gravação atômica de arquivos.
+
+Layout do arquivo (little-endian):
+  - 4 bytes  : assinatura b'TTTQ'
+  - uint16   : versão do formato
+  - uint16   : reservado
+  - uint32   : tamanho do cabeçalho
+  - cabeçalho JSON (UTF-8) com hiperparâmetros, esquema de codificação dos
+    estados, layout da tabela (symmetric, self_play), dtype, dimensões e o
+    CRC32 dos dados
+  - preenchimento até múltiplo de 64 bytes
+  - valores Q: dtype[num_states * 9]
+  - entradas visitadas: uint8[num_states * 9]
+
+Os dados ficam alinhados e contíguos, então o arquivo pode ser aberto com
+numpy.memmap quase instantaneamente e compartilhado entre processos.
+
+No JSON, tabelas no layout padrão (sem simetria nem self-play) são o
+dicionário puro {estado: {ação: valor}}; as demais são gravadas como
+{"layout": {...}, "q_table": {...}} (ver split_layout e join_layout).
+"""
+import json
+import os
+import struct
+import tempfile
+import threading
+import zlib
+
+import numpy as np
+
+from agents.q_table import DenseQTable
+
+MAGIC = b'TTTQ'
+VERSION = 1
+ENCODING = 'legal-state-index'
+_PREFIX = struct.Struct('<4sHHI')
+_ALIGNMENT = 64
+
+
+def atomic_write(path: str, write_fn, mode: str = 'wb'):
+    """
+    Grava em um arquivo temporário no mesmo diretório e o renomeia sobre o
+    destino, de modo que uma falha no meio da gravação nunca corrompa o
+    arquivo existente. write_fn recebe o arquivo aberto.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(prefix='.tmp-', dir=directory)
+    try:
+        with os.fdopen(fd, mode) as f:
+            write_fn(f)
+            f.flush()
+            os.fsync(f.fileno())
+        # mkstemp cria o arquivo com permissão 0600; usa a permissão padrão.
+        umask = os.umask(0)
+        os.umask(umask)
+        os.chmod(tmp_path, 0o666 & ~umask)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+class BackgroundWriter:
+    """
+    Thread de gravação com fila de um só lugar. submit() entrega um trabalho
+    (função sem argumentos) e retorna imediatamente; se o anterior ainda não
+    começou, é substituído pelo novo (só o estado mais recente importa).
+    Erros da thread são relançados no próximo submit(), wait() ou close().
+    """
+
+    def __init__(self, name: str = 'background-writer'):
+        self._pending = None
+        self._running = False
+        self._closed = False
+        self._error = None
+        self._condition = threading.Condition()
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+
+        self.completed = 0
+        self.replaced = 0
+
+    def submit(self, job) -> bool:
+        """Agenda job. Retorna True se um trabalho pendente foi descartado."""
+        with self._condition:
+            self._raise_error()
+            replaced = self._pending is not None
+            if replaced:
+                self.replaced += 1
+            self._pending = job
+            self._condition.notify_all()
+        return replaced
+
+    def wait(self):
+        """Espera a thread ficar ociosa."""
+        with self._condition:
+            while self._pending is not None or self._running:
+                self._condition.wait()
+            self._raise_error()
+
+    def close(self):
+        """Executa o que estiver pendente e encerra a thread."""
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        self._thread.join()
+        self._raise_error()
+
+    def _raise_error(self):
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise RuntimeError(f"Falha na gravação em segundo plano ({self._thread.name})") from error
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while self._pending is None and not self._closed:
+                    self._condition.wait()
+                if self._pending is None:
+                    return
+                job, self._pending = self._pending, None
+                self._running = True
+            try:
+                job()
+                self.completed += 1
+            except Exception as exc:
+                self._error = exc
+            finally:
+                with self._condition:
+                    self._running = False
+                    self._condition.notify_all()
+
+
+def split_layout(data: dict) -> tuple:
+    """Separa o conteúdo de uma tabela Q em JSON em (dicionário da tabela, layout)."""
+    if 'layout' in data and 'q_table' in data:
+        return data['q_table'], data['layout']
+    return data, {}
+
+
+def join_layout(q_dict: dict, layout: dict) -> dict:
+    """Inverso de split_layout: o layout só é gravado se não for o padrão."""
+    if not any(layout.values()):
+        return q_dict
+    return {'layout': layout, 'q_table': q_dict}
+
+
+def save_binary(
+    path: str,
+    table: DenseQTable,
+    hyperparameters: dict = None,
+    symmetric: bool = False,
+    self_play: bool = False
+):
+    """Grava a tabela densa no formato binário (de forma atômica)."""
+    values = np.ascontiguousarray(table.values)
+    visited = np.ascontiguousarray(table.visited, dtype=np.uint8)
+    checksum = zlib.crc32(visited.tobytes(), zlib.crc32(values.tobytes()))
+    header = json.dumps({
+        'hyperparameters': hyperparameters or {},
+        'encoding': ENCODING,
+        'symmetric': symmetric,
+        'self_play': self_play,
+        'num_states': values.shape[0],
+        'num_actions': values.shape[1],
+        'dtype': values.dtype.str,
+        'crc32': checksum,
+    }).encode('utf-8')
+    data_offset = _data_offset(len(header))
+
+    def write(f):
+        f.write(_PREFIX.pack(MAGIC, VERSION, 0, len(header)))
+        f.write(header)
+        f.write(b'\0' * (data_offset - _PREFIX.size - len(header)))
+        f.write(values.tobytes())
+        f.write(visited.tobytes())
+
+    atomic_write(path, write)
+
+
+def read_header(path: str) -> tuple:
+    """Lê e valida o cabeçalho. Retorna (cabeçalho, offset dos dados)."""
+    with open(path, 'rb') as f:
+        prefix = f.read(_PREFIX.size)
+        if len(prefix) != _PREFIX.size:
+            raise ValueError(f"Arquivo de tabela Q truncado: {path}")
+        magic, version, _, header_len = _PREFIX.unpack(prefix)
+        if magic != MAGIC:
+            raise ValueError(f"Arquivo não é uma tabela Q binária: {path}")
+        if version != VERSION:
+            raise ValueError(f"Versão de tabela Q não suportada: {version}")
+        header = json.loads(f.read(header_len).decode('utf-8'))
+    if header['encoding'] != ENCODING:
+        raise ValueError(f"Codificação de estados desconhecida: {header['encoding']}")
+    return header, _data_offset(header_len)
+
+
+def load_binary(path: str, use_mmap: bool = True, verify: bool = True) -> tuple:
+    """
+    Abre uma tabela Q binária. Retorna (DenseQTable, cabeçalho).
+
+    Com use_mmap=True os arrays são mapeados em modo copy-on-write: as páginas
+    do arquivo são compartilhadas entre processos até serem alteradas, e as
+    alterações nunca voltam ao arquivo (use save_binary para persistir).
+    """
+    header, offset = read_header(path)
+    shape = (header['num_states'], header['num_actions'])
+    dtype = np.dtype(header['dtype'])
+    visited_offset = offset + shape[0] * shape[1] * dtype.itemsize
+    if use_mmap:
+        values = np.memmap(path, dtype=dtype, mode='c', offset=offset, shape=shape)
+        visited = np.memmap(path, dtype=np.uint8, mode='c', offset=visited_offset, shape=shape)
+    else:
+        with open(path, 'rb') as f:
+            f.seek(offset)
+            values = np.fromfile(f, dtype=dtype, count=shape[0] * shape[1]).reshape(shape)
+            visited = np.fromfile(f, dtype=np.uint8, count=shape[0] * shape[1]).reshape(shape)
+    if verify:
+        checksum = zlib.crc32(visited.tobytes(), zlib.crc32(values.tobytes()))
+        if checksum != header['crc32']:
+            raise ValueError(f"Checksum inválido na tabela Q: {path}")
+    return DenseQTable.from_arrays(values, visited.view(bool)), header
+
+
+def _data_offset(header_len: int) -> int:
+    end = _PREFIX.size + header_len
+    return (end + _ALIGNMENT - 1) // _ALIGNMENT * _ALIGNMENT
@@ -1,15 +1,51 @@
+import atexit
 import json
+import os
 import random
-from game.tic_tac_toe import TicTacToe
-from tqdm import tqdm
+import threading
+
+import numpy as np
+
+from agents.q_table import DictQTable, DenseQTable, canonicalize_q_dict, state_key
+from agents.q_table_io import BackgroundWriter, atomic_write, join_layout, load_binary, save_binary, split_layout
+from game.symmetry import canonical_state, from_canonical_action, swap_players, to_canonical_action
 
 
 class QLearningAgent:
     """
     Agente Q-Learning para o Jogo da Velha.
     Mantém uma tabela Q em arquivo JSON para persistência e continuidade do treinamento.
+
+    backend='dense' guarda a tabela em uma matriz NumPy indexada por estado
+    (ver agents/q_table.py); backend='dict' mantém o dicionário original.
+
+    Com symmetric=True cada estado é reduzido ao seu representante canônico
+    entre as 8 simetrias do tabuleiro (game/symmetry.py), e as ações são
+    traduzidas para esse referencial. Posições equivalentes passam a
+    compartilhar a mesma entrada, o que reduz a tabela e acelera o aprendizado.
+    Com self_play=True a tabela é a do treino contra si mesmo, em que toda
+    posição é vista por quem joga, como se fosse 'X' (ver
+    TrainingManager._play_episode_vs_self). Um agente que joga com 'O'
+    (player='O') sobre essa tabela troca as peças (swap_players) de todo
+    estado recebido, tanto nas consultas quanto nas atualizações.
+
+    symmetric e self_play formam o layout da tabela, gravado junto com ela.
+    Com None (padrão) o agente segue o layout do arquivo (sem arquivo, False).
+    Uma tabela salva sem simetria pode ser carregada com symmetric=True (é
+    convertida, e passa a ser gravada com simetria); as demais divergências
+    entre o pedido e o arquivo levantam ValueError.
+
+    Arquivos com extensão .qbin usam o formato binário de agents/q_table_io.py,
+    aberto via numpy.memmap (copiado para a memória na primeira gravação); os
+    demais usam JSON. Ambos são salvos de forma
+    atômica (grava em arquivo temporário e renomeia). Com q_table_file=None o
+    agente não lê nem grava arquivos.
     """
 
+    BINARY_EXTENSION = '.qbin'
+
+    BACKENDS = {'dict': DictQTable, 'dense': DenseQTable}
+
     def __init__(
         self,
         alpha: float = 0.5,
@@ -17,32 +53,60 @@ class QLearningAgent:
         epsilon: float = 1,
         epsilon_decay: float = 0.995,
         min_epsilon: float = 0.01,
-        q_table_file: str = 'q_table.json'
+        q_table_file: str = 'q_table.json',
+        backend: str = 'dense',
+        symmetric: bool = None,
+        self_play: bool = None,
+        player: str = 'X'
     ):
+        if backend not in self.BACKENDS:
+            raise ValueError(f"Backend inválido: {backend}. Use 'dict' ou 'dense'.")
         self.alpha = alpha
         self.gamma = gamma
         self.epsilon = epsilon
         self.epsilon_decay = epsilon_decay
         self.min_epsilon = min_epsilon
         self.q_table_file = q_table_file
-        self.q_table = {}  # {state_key: {action: q_value}}
+        self.backend = backend
+        self.symmetric = symmetric
+        self.self_play = self_play
+        self.player = player
+        self.q_table = self.BACKENDS[backend]()
+        self.q_table_meta = {}  # cabeçalho do arquivo binário carregado, se houver
+        self._writer = None  # thread de save_q_table(background=True)
+        self._delta_lock = threading.Lock()
+        self._delta = {}
+        self._mirror = None
+        self._mirror_table = None
         self._load_q_table()
+        self._swap_sides = self.self_play and player == 'O'
 
     def _state_key(self, state: tuple) -> str:
-        return ''.join([s if s is not None else '-' for s in state])
+        return state_key(state)
+
+    def _own_view(self, state: tuple) -> tuple:
+        """O estado como a tabela o guarda: com as peças trocadas quando _swap_sides."""
+        return swap_players(state) if self._swap_sides else state
 
     def get_q(self, state: tuple, action: int) -> float:
-        key = self._state_key(state)
-        if key not in self.q_table:
-            self.q_table[key] = {}
-        return self.q_table[key].get(str(action), 0.0)
+        state = self._own_view(state)
+        if self.symmetric:
+            state, t = canonical_state(state)
+            action = to_canonical_action(action, t)
+        return self.q_table.get(state, action)
 
     def choose_action(self, state: tuple, available_moves: list) -> int:
         if random.random() < self.epsilon:
             return random.choice(available_moves)
-        q_values = {move: self.get_q(state, move) for move in available_moves}
-        max_q = max(q_values.values())
-        best_moves = [move for move, q in q_values.items() if q == max_q]
+        state = self._own_view(state)
+        if self.symmetric:
+            cstate, t = canonical_state(state)
+            cmoves = [to_canonical_action(a, t) for a in available_moves]
+            best_moves = [
+                from_canonical_action(a, t) for a in self.q_table.best_actions(cstate, cmoves)
+            ]
+        else:
+            best_moves = self.q_table.best_actions(state, available_moves)
         return random.choice(best_moves)
 
     def update_q(
@@ -53,25 +117,220 @@ class QLearningAgent:
         next_state: tuple,
         next_moves: list
     ):
-        key = self._state_key(state)
-        if key not in self.q_table:
-            self.q_table[key] = {}
-        old_q = self.q_table[key].get(str(action), 0.0)
+        state, next_state = self._own_view(state), self._own_view(next_state)
+        if self.symmetric:
+            state, t = canonical_state(state)
+            action = to_canonical_action(action, t)
+            next_state, nt = canonical_state(next_state)
+            next_moves = [to_canonical_action(a, nt) for a in next_moves]
+        old_q = self.q_table.get(state, action)
         future_q = 0.0
         if next_moves:
-            future_q = max(self.get_q(next_state, a) for a in next_moves)
+            future_q = self.q_table.max_q(next_state, next_moves)
         new_q = old_q + self.alpha * (reward + self.gamma * future_q - old_q)
-        self.q_table[key][str(action)] = new_q
+        self.q_table.set(state, action, new_q)
+
+    def update_episode(self, trajectory: list, trace_lambda: float):
+        """
+        Atualiza a tabela com o retorno λ da partida encerrada. trajectory é a
+        lista de transições (state, action, reward, next_state, next_moves) na
+        ordem em que ocorreram; ela é percorrida de trás para frente com
+        G_t = r_t + γ[(1-λ) max Q(s_{t+1}) + λ G_{t+1}], de modo que a
+        recompensa final chega a todas as jogadas da partida de uma só vez.
+        λ=0 equivale a update_q aplicado em ordem inversa; λ=1, ao retorno
+        de Monte Carlo.
+        """
+        gamma, ret = self.gamma, None
+        for state, action, reward, next_state, next_moves in reversed(trajectory):
+            future = self._max_q(next_state, next_moves) if next_moves else 0.0
+            if ret is None:
+                target = reward + gamma * future
+            else:
+                target = reward + gamma * ((1 - trace_lambda) * future + trace_lambda * ret)
+            self._move_towards(state, action, target)
+            ret = target
+
+    def _max_q(self, state: tuple, moves: list) -> float:
+        state = self._own_view(state)
+        if self.symmetric:
+            state, t = canonical_state(state)
+            moves = [to_canonical_action(a, t) for a in moves]
+        return self.q_table.max_q(state, moves)
+
+    def _move_towards(self, state: tuple, action: int, target: float):
+        state = self._own_view(state)
+        if self.symmetric:
+            state, t = canonical_state(state)
+            action = to_canonical_action(action, t)
+        old_q = self.q_table.get(state, action)
+        self.q_table.set(state, action, old_q + self.alpha * (target - old_q))
+
+    def encode_transition(self, state: tuple, action: int, reward: float, next_state: tuple, next_moves: list) -> tuple:
+        """
+        Transição como inteiros da tabela densa, para o ReplayBuffer: (linha
+        do estado, ação, recompensa, linha do estado seguinte ou -1 se
+        terminal), no referencial canônico quando symmetric=True.
+        """
+        state, next_state = self._own_view(state), self._own_view(next_state)
+        if self.symmetric:
+            state, t = canonical_state(state)
+            action = to_canonical_action(action, t)
+            if next_moves:
+                next_state, _ = canonical_state(next_state)
+        index = DenseQTable._index
+        return index[state], action, reward, index[next_state] if next_moves else -1
+
+    def update_batch(self, states: np.ndarray, actions: np.ndarray, rewards: np.ndarray, next_states: np.ndarray):
+        """
+        Atualização Q de um lote de transições de encode_transition (backend
+        'dense'). Pares (estado, ação) repetidos no lote recebem a média dos
+        seus erros de TD.
+        """
+        table = self.q_table
+        has_next = next_states >= 0
+        future = np.zeros(len(states))
+        future[has_next] = table.values[next_states[has_next]].max(axis=1)
+        td_error = rewards + self.gamma * future - table.values[states, actions]
+
+        flat = states.astype(np.int64) * 9 + actions
+        touched, inverse = np.unique(flat, return_inverse=True)
+        sums = np.bincount(inverse, weights=td_error)
+        counts = np.bincount(inverse)
+        table.values.reshape(-1)[touched] += self.alpha * sums / counts
+        table.visited.reshape(-1)[touched] = True
+
+    def hyperparameters(self) -> dict:
+        return {
+            'alpha': self.alpha,
+            'gamma': self.gamma,
+            'epsilon': self.epsilon,
+            'epsilon_decay': self.epsilon_decay,
+            'min_epsilon': self.min_epsilon,
+        }
+
+    def _is_binary_file(self) -> bool:
+        return self.q_table_file.endswith(self.BINARY_EXTENSION)
+
+    def layout(self) -> dict:
+        return {'symmetric': self.symmetric, 'self_play': self.self_play}
 
     def _load_q_table(self):
-        try:
-            with open(self.q_table_file, 'r') as f:
-                self.q_table = json.load(f)
-        except FileNotFoundError:
-            self.q_table = {}
+        stored = None  # layout do arquivo, se ele existir
+        table = data = None
+        if self.q_table_file is not None:  # None: agente sem persistência
+            if self._is_binary_file():
+                if os.path.isfile(self.q_table_file):
+                    table, self.q_table_meta = load_binary(self.q_table_file)
+                    stored = self.q_table_meta
+            else:
+                try:
+                    with open(self.q_table_file, 'r') as f:
+                        data, stored = split_layout(json.load(f))
+                except FileNotFoundError:
+                    pass
+        self._resolve_layout(stored)
+        file_symmetric = bool(stored and stored.get('symmetric', False))
+
+        if table is not None:
+            if self.backend == 'dense' and file_symmetric == self.symmetric:
+                self.q_table = table
+                return
+            data = table.to_dict()
+        if data is None:
+            return
+        if self.symmetric and not file_symmetric:
+            data = canonicalize_q_dict(data)
+        self.q_table = self.BACKENDS[self.backend].from_dict(data)
+
+    def _resolve_layout(self, stored: dict):
+        """Completa symmetric e self_play com o layout do arquivo, validando os valores pedidos."""
+        for name in ('symmetric', 'self_play'):
+            requested = getattr(self, name)
+            in_file = bool(stored.get(name, False)) if stored is not None else None
+            if requested is None:
+                setattr(self, name, bool(in_file))
+            elif in_file is not None and requested != in_file and not (name == 'symmetric' and requested):
+                raise ValueError(
+                    f"{self.q_table_file} foi salva com {name}={in_file}; não pode ser carregada com {name}={requested}."
+                )
+
+    def save_q_table(self, background: bool = False):
+        """
+        Grava a tabela em q_table_file. Com background=True a chamada só copia
+        o necessário e a gravação fica com uma thread própria (ver
+        wait_for_save): a tabela densa é copiada inteira (tamanho fixo), e a
+        de dicionário entrega apenas as entradas alteradas desde a gravação
+        anterior, que a thread aplica a um espelho da tabela. Gravações que se
+        acumulam enquanto o disco está ocupado são reduzidas à mais recente.
+        """
+        if self.q_table_file is None:
+            return
+        self._detach_mapping()
+        if not background:
+            self.wait_for_save()
+            self._write_q_table(self.q_table, self.hyperparameters(), self.q_table_file)
+            return
+
+        if self._writer is None:
+            self._writer = BackgroundWriter('q-table-writer')
+            atexit.register(self.wait_for_save)
+        table = self.q_table
+        if isinstance(table, DenseQTable):
+            copy = table.copy()
+            snapshot = lambda: copy
+        else:
+            snapshot = self._dict_snapshot(table)
+        hyperparameters, path = self.hyperparameters(), self.q_table_file
+        self._writer.submit(lambda: self._write_q_table(snapshot(), hyperparameters, path))
+
+    def _detach_mapping(self):
+        """
+        Copia para a memória os arrays de uma tabela mapeada do arquivo: a
+        gravação o substitui com os.replace, o que falha no Windows enquanto
+        ele estiver mapeado.
+        """
+        table = self.q_table
+        if isinstance(table, DenseQTable) and isinstance(table.values, np.memmap):
+            table.values, table.visited = np.array(table.values), np.array(table.visited)
+
+    def wait_for_save(self):
+        """Espera a gravação em segundo plano pendente, se houver."""
+        if self._writer is not None:
+            self._writer.wait()
 
-    def save_q_table(self):
-        with open(self.q_table_file, 'w') as f:
-            json.dump(self.q_table, f, indent=2)
+    def _dict_snapshot(self, table: DictQTable):
+        """
+        Acumula as entradas alteradas e devolve a função que, na thread de
+        gravação, as aplica ao espelho e retorna a tabela a gravar.
+        """
+        if self._mirror_table is not table:
+            # Primeira gravação desta tabela: o espelho parte de uma cópia completa
+            self.wait_for_save()
+            self._mirror_table = table
+            self._mirror = {}
+            table.dirty.clear()
+            delta = {key: dict(entry) for key, entry in table.table.items()}
+        else:
+            delta = table.take_dirty()
+        with self._delta_lock:
+            self._delta.update(delta)
+        mirror = self._mirror
 
+        def apply() -> DictQTable:
+            with self._delta_lock:
+                pending, self._delta = self._delta, {}
+            mirror.update(pending)
+            return DictQTable.from_dict(mirror)
+        return apply
 
+    def _write_q_table(self, table, hyperparameters: dict, path: str):
+        if path.endswith(self.BINARY_EXTENSION):
+            if not isinstance(table, DenseQTable):
+                table = DenseQTable.from_dict(table.to_dict())
+            save_binary(path, table, hyperparameters, self.symmetric, self.self_play)
+        else:
+            atomic_write(
+                path,
+                lambda f: json.dump(join_layout(table.to_dict(), self.layout()), f, indent=2),
+                mode='w'
+            )
@@ -0,0 +1,121 @@
+"""
+Registro de agentes compartilhado pelo processo.
+
+Tabelas Q carregadas ficam em cache, indexadas pelo caminho do arquivo e
+pela data de modificação: enquanto o arquivo não muda, criar um novo agente
+Q-Learning não lê o disco. O cache respeita um limite de memória, descartando
+as tabelas usadas há mais tempo (LRU). Agentes Minimax são reaproveitados por
+lado ('X'/'O') e compartilham a solução do jogo.
+
+Uso:
+    from agents.registry import registry
+    agent = registry.q_learning_agent('q_table.json', epsilon=0.01)
+"""
+import os
+import threading
+from collections import OrderedDict
+
+from agents.minimax_agent import MinimaxAgent
+from agents.qlearning_agent import QLearningAgent
+
+
+def _table_size(table) -> int:
+    """Tamanho aproximado, em bytes, de uma tabela Q carregada."""
+    if hasattr(table, 'values'):
+        return table.values.nbytes + table.visited.nbytes
+    # DictQTable: ~100 bytes por par (estado, ação)
+    return sum(len(actions) for actions in table.to_dict().values()) * 100
+
+
+class AgentRegistry:
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self._tables = OrderedDict()  # (caminho, symmetric, backend) -> (mtime, tamanho, tabela, cabeçalho, layout)
+        self._minimax = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.loads = 0
+
+    def get_q_table(self, q_table_file: str, symmetric: bool = None, backend: str = 'dense') -> tuple:
+        """
+        Retorna (tabela, cabeçalho, layout) do arquivo, lendo o disco apenas se
+        ele ainda não estiver em cache ou tiver sido modificado desde a
+        leitura. Com symmetric=None a tabela é carregada no layout gravado
+        nela (ver QLearningAgent).
+        """
+        path = os.path.abspath(q_table_file)
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except FileNotFoundError:
+            mtime = None
+        key = (path, symmetric, backend)
+
+        with self._lock:
+            entry = self._tables.get(key)
+            if entry is not None and entry[0] == mtime:
+                self._tables.move_to_end(key)
+                self.hits += 1
+                return entry[2], entry[3], entry[4]
+
+        loader = QLearningAgent(q_table_file=q_table_file, backend=backend, symmetric=symmetric)
+        size = _table_size(loader.q_table)
+        with self._lock:
+            self.loads += 1
+            self._tables[key] = (mtime, size, loader.q_table, loader.q_table_meta, loader.layout())
+            self._tables.move_to_end(key)
+            self._evict()
+        return loader.q_table, loader.q_table_meta, loader.layout()
+
+    def _evict(self):
+        total = sum(entry[1] for entry in self._tables.values())
+        while total > self.max_bytes and len(self._tables) > 1:
+            _, entry = self._tables.popitem(last=False)
+            total -= entry[1]
+
+    def q_learning_agent(
+        self,
+        q_table_file: str,
+        epsilon: float = 0.01,
+        symmetric: bool = None,
+        backend: str = 'dense',
+        **kwargs
+    ) -> QLearningAgent:
+        """
+        Cria um agente Q-Learning sobre a tabela em cache, no layout gravado
+        no arquivo (a menos que symmetric seja dado). Passe player='O' para o
+        agente que joga com 'O': tabelas de self-play são então consultadas
+        com as peças trocadas. A tabela é
+        compartilhada entre os agentes do mesmo arquivo: use-a apenas para
+        jogar, não para treinar.
+        """
+        table, meta, layout = self.get_q_table(q_table_file, symmetric, backend)
+        agent = QLearningAgent(epsilon=epsilon, q_table_file=None, backend=backend, **layout, **kwargs)
+        agent.q_table = table
+        agent.q_table_meta = meta
+        agent.q_table_file = q_table_file
+        return agent
+
+    def minimax_agent(self, symbol: str, **kwargs) -> MinimaxAgent:
+        """Agente Minimax reaproveitado para o lado symbol ('X' ou 'O')."""
+        key = (symbol, tuple(sorted(kwargs.items())))
+        with self._lock:
+            agent = self._minimax.get(key)
+            if agent is None:
+                agent = MinimaxAgent(ai_player=symbol, human_player='O' if symbol == 'X' else 'X', **kwargs)
+                self._minimax[key] = agent
+        return agent
+
+    def solve_minimax(self) -> dict:
+        """Resolve o jogo (uma única vez por processo); depois, toda jogada do Minimax é uma consulta."""
+        with self._lock:
+            return MinimaxAgent.solve_game_tree()
+
+    def clear(self):
+        with self._lock:
+            self._tables.clear()
+            self._minimax.clear()
+
+
+# Registro único do processo
+registry = AgentRegistry()
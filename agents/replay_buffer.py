@@ -0,0 +1,60 @@
+import numpy as np
+
+
+class ReplayBuffer:
+    """
+    Buffer circular de transições codificadas como inteiros, para
+    atualizações da tabela Q em lote (ver QLearningAgent.encode_transition
+    e update_batch).
+
+    Cada transição ocupa uma posição de arrays de tamanho fixo: linha da
+    tabela densa do estado, ação, recompensa e linha do estado seguinte
+    (-1 se terminal). Ao encher, as transições mais antigas são
+    sobrescritas.
+    """
+
+    def __init__(self, capacity: int = 50_000, seed: int = None):
+        self.capacity = capacity
+        self.states = np.zeros(capacity, dtype=np.int32)
+        self.actions = np.zeros(capacity, dtype=np.int8)
+        self.rewards = np.zeros(capacity, dtype=np.float32)
+        self.next_states = np.zeros(capacity, dtype=np.int32)
+        self.position = 0
+        self.size = 0
+        self.rng = np.random.default_rng(seed)
+
+    def __len__(self):
+        return self.size
+
+    def add(self, state: int, action: int, reward: float, next_state: int):
+        i = self.position
+        self.states[i] = state
+        self.actions[i] = action
+        self.rewards[i] = reward
+        self.next_states[i] = next_state
+        self.position = (i + 1) % self.capacity
+        self.size = min(self.size + 1, self.capacity)
+
+    def sample(self, batch_size: int) -> tuple:
+        """batch_size transições sorteadas com reposição: (states, actions, rewards, next_states)."""
+        idx = self.rng.integers(0, self.size, batch_size)
+        return self.states[idx], self.actions[idx], self.rewards[idx], self.next_states[idx]
+
+    def get_state(self) -> tuple:
+        """(arrays, meta) com o conteúdo do buffer e o estado do gerador, para checkpoints."""
+        arrays = {
+            'states': self.states[:self.size], 'actions': self.actions[:self.size],
+            'rewards': self.rewards[:self.size], 'next_states': self.next_states[:self.size],
+        }
+        meta = {'capacity': self.capacity, 'position': self.position, 'rng': self.rng.bit_generator.state}
+        return {k: v.copy() for k, v in arrays.items()}, meta
+
+    def set_state(self, arrays: dict, meta: dict):
+        """Inverso de get_state."""
+        if meta['capacity'] != self.capacity:
+            raise ValueError(f"Capacidade do buffer incompatível: {meta['capacity']} != {self.capacity}")
+        self.size = len(arrays['states'])
+        for name in ('states', 'actions', 'rewards', 'next_states'):
+            getattr(self, name)[:self.size] = arrays[name]
+        self.position = meta['position']
+        self.rng.bit_generator.state = meta['rng']
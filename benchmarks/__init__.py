@@ -0,0 +1,8 @@
+"""
+Benchmarks dos caminhos críticos do projeto (regras do jogo, agentes,
+persistência da tabela Q e laço de treino).
+
+Uso:
+    python -m benchmarks.run
+    python -m benchmarks.run --json resultados.json --baseline benchmarks/baseline.json
+"""
@@ -0,0 +1,190 @@
+"""
+Casos de benchmark. Cada caso é uma função de preparação que recebe o
+diretório de trabalho temporário e devolve (fn, ops): fn() executa ops
+operações medidas. A preparação (leitura de arquivos, criação de agentes)
+fica fora da medição. Casos que abrem arquivos no diretório temporário
+devolvem também uma função de encerramento, (fn, ops, teardown), chamada
+antes de o diretório ser removido.
+"""
+import os
+import random
+import shutil
+
+from agents.minimax_agent import MinimaxAgent
+from agents.qlearning_agent import QLearningAgent
+from game.bitboard import BitBoard
+from game.tic_tac_toe import TicTacToe
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+Q_TABLE_FILE = os.path.join(ROOT, 'v1-q_table.json')
+
+# Posições representativas (sequências de jogadas a partir do tabuleiro vazio)
+POSITIONS = {
+    'empty': [],
+    'corner': [0],
+    'midgame': [4, 0, 8, 2],
+    'endgame': [4, 0, 8, 2, 1, 7],
+}
+
+CASES = {}
+
+
+def case(name):
+    def register(setup):
+        CASES[name] = setup
+        return setup
+    return register
+
+
+def _play(board, moves):
+    player = 'X'
+    for move in moves:
+        board.make_move(move, player)
+        player = 'O' if player == 'X' else 'X'
+    return board, player
+
+
+# --- Regras do jogo ---
+
+def _board_cases(prefix, board_class):
+    @case(f'{prefix}.check_winner')
+    def _(workdir):
+        board, _ = _play(board_class(), POSITIONS['midgame'])
+        return lambda: [board.check_winner() for _ in range(1000)], 1000
+
+    @case(f'{prefix}.get_available_moves')
+    def _(workdir):
+        board, _ = _play(board_class(), POSITIONS['midgame'])
+        return lambda: [board.get_available_moves() for _ in range(1000)], 1000
+
+    @case(f'{prefix}.make_move')
+    def _(workdir):
+        board = board_class()
+
+        def run():
+            for _ in range(100):
+                for move in range(9):
+                    board.make_move(move, 'X')
+                board.reset()
+        return run, 900
+
+
+_board_cases('tictactoe', TicTacToe)
+_board_cases('bitboard', BitBoard)
+
+
+# --- Minimax ---
+
+def _minimax_case(name, position, **options):
+    @case(name)
+    def _(workdir):
+        board, player = _play(BitBoard(), POSITIONS[position])
+        other = 'O' if player == 'X' else 'X'
+
+        def run():
+            # Sem a solução em memória, cada chamada faz a busca (ou consulta o livro)
+            MinimaxAgent._solution = None
+            MinimaxAgent._transposition_table.clear()
+            return MinimaxAgent(player, other, **options).find_best_move(board)
+        return run, 1
+
+
+for _position in POSITIONS:
+    _minimax_case(f'minimax.alphabeta.{_position}', _position, alpha_beta=True, use_book=False)
+_minimax_case('minimax.exhaustive.midgame', 'midgame', use_book=False)
+_minimax_case('minimax.book.empty', 'empty', alpha_beta=True, use_book=True)
+
+
+# --- Q-Learning ---
+
+def _q_agent(symmetric=False):
+    agent = QLearningAgent(epsilon=0, q_table_file=None, symmetric=symmetric)
+    source = QLearningAgent(q_table_file=Q_TABLE_FILE)
+    agent.q_table = source.q_table
+    return agent
+
+
+def _sample_states(count, seed=0):
+    """Estados (e jogadas disponíveis) de partidas aleatórias."""
+    rng = random.Random(seed)
+    samples = []
+    while len(samples) < count:
+        board, player = BitBoard(), 'X'
+        while board.check_winner() is None and len(samples) < count:
+            moves = board.get_available_moves()
+            samples.append((board.get_state(), moves))
+            board.make_move(rng.choice(moves), player)
+            player = 'O' if player == 'X' else 'X'
+    return samples
+
+
+@case('qlearning.choose_action')
+def _(workdir):
+    agent = _q_agent()
+    samples = _sample_states(1000)
+    return lambda: [agent.choose_action(state, moves) for state, moves in samples], len(samples)
+
+
+@case('qlearning.update_q')
+def _(workdir):
+    agent = _q_agent()
+    samples = _sample_states(1001)
+    transitions = [
+        (state, moves[0], 0.0, samples[i + 1][0], samples[i + 1][1])
+        for i, (state, moves) in enumerate(samples[:-1])
+    ]
+    return lambda: [agent.update_q(*t) for t in transitions], len(transitions)
+
+
+# --- Persistência da tabela Q ---
+
+@case('qtable.load_json')
+def _(workdir):
+    return lambda: QLearningAgent(q_table_file=Q_TABLE_FILE), 1
+
+
+@case('qtable.save_json')
+def _(workdir):
+    path = os.path.join(workdir, 'q_table.json')
+    shutil.copyfile(Q_TABLE_FILE, path)
+    agent = QLearningAgent(q_table_file=path)
+    return agent.save_q_table, 1
+
+
+@case('qtable.save_binary')
+def _(workdir):
+    agent = QLearningAgent(q_table_file=Q_TABLE_FILE)
+    agent.q_table_file = os.path.join(workdir, 'q_table.qbin')
+    return agent.save_q_table, 1
+
+
+@case('qtable.load_binary')
+def _(workdir):
+    agent = QLearningAgent(q_table_file=Q_TABLE_FILE)
+    agent.q_table_file = os.path.join(workdir, 'q_table.qbin')
+    agent.save_q_table()
+    return lambda: QLearningAgent(q_table_file=agent.q_table_file), 1
+
+
+# --- Treino ponta a ponta ---
+
+def _training_case(opponent):
+    @case(f'training.episodes.{opponent}')
+    def _(workdir):
+        from training_manager import TrainingManager
+        manager = TrainingManager(
+            'X', opponent, num_episodes=0, q_table_file=None, history_dir=os.path.join(workdir, 'history')
+        )
+        manager.agent.epsilon = 0.1  # Pouca exploração, como na fase final de um treino
+        stats = {'wins': 0, 'draws': 0, 'losses': 0}
+        random.seed(0)
+
+        def run():
+            for ep in range(200):
+                manager.run_episode(ep, stats)
+                manager._append_history_entry(ep, stats['wins'], stats['draws'], stats['losses'], manager.agent.epsilon)
+        return run, 200, manager.history.close
+
+
+_training_case('random')
+_training_case('minimax')
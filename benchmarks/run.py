@@ -0,0 +1,139 @@
+"""
+Executa os benchmarks de benchmarks/cases.py e compara com um baseline.
+
+Cada caso é calibrado para que uma rodada dure ao menos --min-time
+segundos; o resultado é a melhor de --repeat rodadas (a menos afetada por
+ruído do sistema), em operações por segundo.
+
+Exemplos:
+    python -m benchmarks.run
+    python -m benchmarks.run --filter minimax qlearning
+    python -m benchmarks.run --save-baseline benchmarks/baseline.json
+    python -m benchmarks.run --baseline benchmarks/baseline.json --threshold 0.15 --json resultados.json
+
+Com --baseline, o código de saída é 1 se algum caso ficar mais de
+--threshold (fração) mais lento que no baseline.
+"""
+import argparse
+import json
+import platform
+import sys
+import tempfile
+import time
+
+from benchmarks.cases import CASES
+
+
+def measure(fn, ops: int, min_time: float, repeat: int) -> dict:
+    """Mede fn (que executa ops operações) e retorna as estatísticas do caso."""
+    clock = time.perf_counter
+    number = 1
+    while True:
+        start = clock()
+        for _ in range(number):
+            fn()
+        elapsed = clock() - start
+        if elapsed >= min_time:
+            break
+        number = max(number * 2, int(number * min_time / max(elapsed, 1e-9)))
+
+    best = elapsed
+    for _ in range(repeat - 1):
+        start = clock()
+        for _ in range(number):
+            fn()
+        best = min(best, clock() - start)
+
+    total_ops = ops * number
+    return {
+        'ops_per_sec': total_ops / best,
+        'ns_per_op': best / total_ops * 1e9,
+        'calls': number,
+        'ops_per_call': ops,
+        'repeat': repeat,
+    }
+
+
+def run(names: list, min_time: float, repeat: int) -> dict:
+    results = {}
+    for name in names:
+        with tempfile.TemporaryDirectory() as workdir:
+            fn, ops, *teardown = CASES[name](workdir)
+            try:
+                results[name] = measure(fn, ops, min_time, repeat)
+            finally:
+                for close in teardown:
+                    close()
+        r = results[name]
+        print(f"{name:<36} {r['ops_per_sec']:>14,.1f} ops/s {r['ns_per_op']:>16,.0f} ns/op")
+    return results
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> dict:
+    """Razão atual/baseline de ops/s por caso; regressão se a razão < 1 - threshold."""
+    comparison = {}
+    for name, r in results.items():
+        base = baseline.get('results', {}).get(name)
+        if base is None:
+            continue
+        ratio = r['ops_per_sec'] / base['ops_per_sec']
+        comparison[name] = {
+            'baseline_ops_per_sec': base['ops_per_sec'],
+            'ratio': ratio,
+            'regression': ratio < 1 - threshold,
+        }
+    return comparison
+
+
+def print_comparison(comparison: dict, threshold: float):
+    print(f"\n{'Caso':<36} {'vs baseline':>12}")
+    for name, c in comparison.items():
+        flag = '  REGRESSÃO' if c['regression'] else ''
+        print(f"{name:<36} {(c['ratio'] - 1) * 100:>+11.1f}%{flag}")
+    regressions = sum(c['regression'] for c in comparison.values())
+    print(f"\n{regressions} regressão(ões) acima de {threshold * 100:.0f}%")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description='Benchmarks do jogo, dos agentes e do treino')
+    parser.add_argument('--filter', nargs='+', default=None, help='Executa só os casos que contêm algum destes textos')
+    parser.add_argument('--list', action='store_true', help='Lista os casos e sai')
+    parser.add_argument('--min-time', type=float, default=0.2, help='Duração mínima de cada rodada (s)')
+    parser.add_argument('--repeat', type=int, default=5, help='Rodadas por caso (vale a melhor)')
+    parser.add_argument('--json', default=None, help='Grava os resultados neste arquivo JSON')
+    parser.add_argument('--baseline', default=None, help='Arquivo JSON de baseline para comparação')
+    parser.add_argument('--threshold', type=float, default=0.10, help='Queda de desempenho tolerada (fração)')
+    parser.add_argument('--save-baseline', default=None, help='Grava os resultados como novo baseline')
+    args = parser.parse_args(argv)
+
+    names = [n for n in CASES if not args.filter or any(f in n for f in args.filter)]
+    if args.list:
+        print('\n'.join(names))
+        return 0
+
+    report = {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'results': run(names, args.min_time, args.repeat),
+    }
+
+    status = 0
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        report['threshold'] = args.threshold
+        report['comparison'] = compare(report['results'], baseline, args.threshold)
+        print_comparison(report['comparison'], args.threshold)
+        if any(c['regression'] for c in report['comparison'].values()):
+            status = 1
+
+    for path in (args.json, args.save_baseline):
+        if path:
+            with open(path, 'w') as f:
+                json.dump(report, f, indent=2)
+    return status
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,30 @@
+"""
+Gera o livro de aberturas / tabela de finais (agents/opening_book.py).
+
+Exemplos:
+    python build_opening_book.py
+    python build_opening_book.py --output outro_livro.bin
+"""
+import argparse
+import time
+
+from agents import opening_book
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Gera o livro de aberturas do jogo da velha')
+    parser.add_argument(
+        '--output', default=opening_book.DEFAULT_PATH,
+        help='Arquivo de destino (padrão: opening_book.bin na raiz do projeto)'
+    )
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    records = opening_book.build_records()
+    opening_book.save(args.output, records)
+    elapsed = time.perf_counter() - start
+    print(f"{len(records)} posições canônicas gravadas em {args.output} ({elapsed:.2f}s)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,135 @@
+import io
+import json
+import random
+import time
+
+import numpy as np
+
+from agents.q_table import DenseQTable, DictQTable
+from agents.q_table_io import BackgroundWriter, atomic_write
+
+FORMAT_VERSION = 1
+
+
+def capture_state(manager, episode: int, stats: dict) -> dict:
+    """
+    Copia o estado completo do treino ao fim do episódio episode: tabela Q,
+    epsilon, contadores, estado do gerador aleatório global, buffer de
+    replay (se houver) e tamanho dos arquivos de histórico (para descartar,
+    ao retomar, o que vier depois).
+    A cópia é feita na thread do treino; a gravação pode ocorrer em outra.
+    """
+    agent = manager.agent
+    manager.history.flush()
+    table = agent.q_table
+    state = {
+        'meta': {
+            'version': FORMAT_VERSION,
+            'episode': episode,
+            'stats': dict(stats),
+            'epsilon': agent.epsilon,
+            'hyperparameters': agent.hyperparameters(),
+            'agent_symbol': manager.agent_symbol,
+            'opponent_type': manager.opponent_type,
+            'symmetric': agent.symmetric,
+            'backend': agent.backend,
+            'random_state': random.getstate(),
+            'history_offsets': manager.history.offsets(),
+            'timestamp': time.time(),
+        }
+    }
+    if isinstance(table, DenseQTable):
+        state['values'] = np.array(table.values)
+        state['visited'] = np.array(table.visited, dtype=bool)
+    else:
+        state['meta']['q_table'] = {key: dict(entry) for key, entry in table.to_dict().items()}
+    if getattr(manager, 'replay', None) is not None:
+        arrays, state['meta']['replay'] = manager.replay.get_state()
+        state.update({f'replay_{name}': array for name, array in arrays.items()})
+    return state
+
+
+def write_checkpoint(path: str, state: dict):
+    """Grava o estado capturado em um arquivo .npz (de forma atômica)."""
+    arrays = {k: v for k, v in state.items() if k != 'meta'}
+    meta = np.frombuffer(json.dumps(state['meta']).encode('utf-8'), dtype=np.uint8)
+    atomic_write(path, lambda f: np.savez(f, meta=meta, **arrays))
+
+
+def load_checkpoint(path: str) -> dict:
+    with open(path, 'rb') as f:
+        data = np.load(io.BytesIO(f.read()))
+        state = {k: data[k] for k in data.files if k != 'meta'}
+        state['meta'] = json.loads(data['meta'].tobytes().decode('utf-8'))
+    if state['meta'].get('version') != FORMAT_VERSION:
+        raise ValueError(f"Versão de checkpoint não suportada: {state['meta'].get('version')}")
+    return state
+
+
+def restore_state(manager, state: dict) -> tuple:
+    """
+    Aplica um checkpoint ao TrainingManager. Retorna (episódio, stats).
+    Falha se o checkpoint for de outra configuração de treino.
+    """
+    meta = state['meta']
+    agent = manager.agent
+    for name, current in (('agent_symbol', manager.agent_symbol), ('opponent_type', manager.opponent_type),
+                          ('symmetric', agent.symmetric), ('backend', agent.backend)):
+        if meta[name] != current:
+            raise ValueError(f"Checkpoint incompatível: {name}={meta[name]!r}, treino atual usa {current!r}")
+
+    if 'values' in state:
+        agent.q_table = DenseQTable.from_arrays(state['values'], state['visited'])
+    else:
+        agent.q_table = DictQTable.from_dict(meta['q_table'])
+    for name, value in meta['hyperparameters'].items():
+        setattr(agent, name, value)
+    agent.epsilon = meta['epsilon']
+
+    version, internal, gauss_next = meta['random_state']
+    random.setstate((version, tuple(internal), gauss_next))
+    if 'replay' in meta and getattr(manager, 'replay', None) is not None:
+        arrays = {k[len('replay_'):]: v for k, v in state.items() if k.startswith('replay_')}
+        manager.replay.set_state(arrays, meta['replay'])
+    manager.history.truncate(meta['history_offsets'])
+    return meta['episode'], dict(meta['stats'])
+
+
+class Checkpointer:
+    """
+    Checkpoints periódicos do treino (ver TrainingManager, checkpoint_file).
+
+    due() indica se é hora de um checkpoint, a cada every_episodes episódios
+    ou every_seconds segundos. save() recebe o estado já copiado (ver
+    capture_state) e o entrega a uma thread de gravação, sem esperar o
+    disco; se a gravação anterior ainda não terminou, só o estado mais
+    recente é mantido na fila. close() espera a última gravação.
+    """
+
+    def __init__(self, path: str, every_episodes: int = None, every_seconds: float = None):
+        self.path = path
+        self.every_episodes = every_episodes
+        self.every_seconds = every_seconds
+        self._last_save = time.perf_counter()
+        self._writer = BackgroundWriter('checkpoint-writer')
+
+    @property
+    def saves(self) -> int:
+        return self._writer.completed
+
+    @property
+    def skipped(self) -> int:
+        return self._writer.replaced
+
+    def due(self, episode: int) -> bool:
+        if self.every_episodes and episode % self.every_episodes == 0:
+            return True
+        return bool(self.every_seconds) and time.perf_counter() - self._last_save >= self.every_seconds
+
+    def save(self, state: dict):
+        self._last_save = time.perf_counter()
+        self._writer.submit(lambda: write_checkpoint(self.path, state))
+
+    def close(self):
+        """Espera a gravação pendente e encerra a thread."""
+        self._writer.close()
@@ -0,0 +1,58 @@
+"""
+Converte tabelas Q entre o formato JSON original e o formato binário (.qbin).
+
+Exemplos:
+    python convert_q_table.py v1-q_table.json v1-q_table.qbin
+    python convert_q_table.py v1-q_table.qbin v1-q_table.json
+    python convert_q_table.py v1-q_table.json v1-sym.qbin --symmetric
+"""
+import argparse
+import json
+
+import numpy as np
+
+from agents.q_table import DenseQTable, canonicalize_q_dict
+from agents.q_table_io import atomic_write, join_layout, load_binary, save_binary, split_layout
+
+BINARY_EXTENSION = '.qbin'
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Converte tabelas Q entre JSON e binário')
+    parser.add_argument('source', help='Arquivo de origem (.json ou .qbin)')
+    parser.add_argument('target', help='Arquivo de destino (.json ou .qbin)')
+    parser.add_argument(
+        '--symmetric', action='store_true',
+        help='Converte para o referencial canônico de simetrias ao gravar'
+    )
+    parser.add_argument(
+        '--dtype', choices=['float32', 'float64'], default='float32',
+        help='Precisão dos valores no arquivo binário (float64 preserva o JSON exatamente)'
+    )
+    args = parser.parse_args()
+
+    hyperparameters = {}
+    if args.source.endswith(BINARY_EXTENSION):
+        table, header = load_binary(args.source, use_mmap=False)
+        data = table.to_dict()
+        hyperparameters = header.get('hyperparameters', {})
+        layout = {'symmetric': header.get('symmetric', False), 'self_play': header.get('self_play', False)}
+    else:
+        with open(args.source, 'r') as f:
+            data, stored = split_layout(json.load(f))
+        layout = {'symmetric': stored.get('symmetric', False), 'self_play': stored.get('self_play', False)}
+    if args.symmetric and not layout['symmetric']:
+        data = canonicalize_q_dict(data)
+        layout['symmetric'] = True
+
+    if args.target.endswith(BINARY_EXTENSION):
+        table = DenseQTable.from_dict(data, np.dtype(args.dtype))
+        save_binary(args.target, table, hyperparameters, layout['symmetric'], layout['self_play'])
+    else:
+        atomic_write(args.target, lambda f: json.dump(join_layout(data, layout), f, indent=2), mode='w')
+
+    print(f"{args.source} -> {args.target}: {len(data)} estados")
+
+
+if __name__ == '__main__':
+    main()
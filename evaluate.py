@@ -0,0 +1,216 @@
+"""
+Avaliação sem interface gráfica: torneio todos-contra-todos entre agentes.
+
+Cada par de agentes joga games_per_seat partidas com cada um como 'X' e
+como 'O', na velocidade máxima da CPU (opcionalmente em vários processos).
+O relatório traz taxas de vitória/empate/derrota com intervalo de confiança
+de 95% (Wilson), partidas por segundo e percentis de latência por jogada.
+
+Exemplos:
+    python evaluate.py --games 10000
+    python evaluate.py --games 10000 --agents minimax random qlearning:v1-q_table.json qlearning:v2-q_table.json --workers 4
+"""
+import argparse
+import json
+import math
+import multiprocessing
+import os
+import random
+import time
+
+import numpy as np
+
+from agents.registry import registry
+from game.bitboard import BitBoard
+
+
+class RandomPlayer:
+    def choose(self, board: BitBoard, symbol: str) -> int:
+        return random.choice(board.get_available_moves())
+
+
+class MinimaxPlayer:
+    def __init__(self):
+        self.agents = {s: registry.minimax_agent(s, precompute=True) for s in ('X', 'O')}
+
+    def choose(self, board: BitBoard, symbol: str) -> int:
+        return self.agents[symbol].find_best_move(board)
+
+
+class QLearningPlayer:
+    """
+    Um agente por lado sobre a mesma tabela: tabelas do treino --opponent
+    self são consultadas com as peças trocadas quando jogam com 'O'.
+    """
+
+    def __init__(self, q_table_file: str):
+        self.agents = {s: registry.q_learning_agent(q_table_file, epsilon=0, player=s) for s in ('X', 'O')}
+
+    def choose(self, board: BitBoard, symbol: str) -> int:
+        return self.agents[symbol].choose_action(board.get_state(), board.get_available_moves())
+
+
+def make_player(spec: str):
+    """
+    Cria um jogador a partir da especificação: minimax, random ou
+    qlearning:<arquivo> (o layout da tabela, inclusive de self-play, é lido
+    do arquivo).
+    """
+    if spec == 'minimax':
+        return MinimaxPlayer()
+    if spec == 'random':
+        return RandomPlayer()
+    if spec.startswith('qlearning:'):
+        path = spec.split(':', 1)[1]
+        if not os.path.isfile(path):
+            raise FileNotFoundError(f"Tabela Q não encontrada: {path}")
+        return QLearningPlayer(path)
+    raise ValueError(f"Agente desconhecido: {spec}. Use minimax, random ou qlearning:<arquivo>.")
+
+
+# Jogadores já criados neste processo, por especificação
+_players = {}
+
+
+def _get_player(spec: str):
+    if spec not in _players:
+        _players[spec] = make_player(spec)
+    return _players[spec]
+
+
+def play_games(task) -> dict:
+    """
+    Joga num_games partidas de x_spec (como 'X') contra o_spec (como 'O').
+    Retorna as contagens de resultado e as latências (ns) de cada jogada.
+    """
+    x_spec, o_spec, num_games, seed = task
+    random.seed(seed)
+    players = {'X': _get_player(x_spec), 'O': _get_player(o_spec)}
+    results = {'X': 0, 'O': 0, 'Draw': 0}
+    latencies = {'X': [], 'O': []}
+    clock = time.perf_counter_ns
+
+    for _ in range(num_games):
+        board = BitBoard()
+        symbol = 'X'
+        while True:
+            start = clock()
+            move = players[symbol].choose(board, symbol)
+            latencies[symbol].append(clock() - start)
+            board.make_move(move, symbol)
+            winner = board.check_winner()
+            if winner is not None:
+                results[winner] += 1
+                break
+            symbol = 'O' if symbol == 'X' else 'X'
+    return {'results': results, 'latencies': latencies}
+
+
+def wilson_interval(successes: int, total: int, z: float = 1.96) -> tuple:
+    """Intervalo de confiança de Wilson para uma proporção."""
+    if total == 0:
+        return 0.0, 0.0
+    p = successes / total
+    denom = 1 + z * z / total
+    center = (p + z * z / (2 * total)) / denom
+    margin = z * math.sqrt(p * (1 - p) / total + z * z / (4 * total * total)) / denom
+    return max(0.0, center - margin), min(1.0, center + margin)
+
+
+def _rate(count: int, total: int) -> dict:
+    low, high = wilson_interval(count, total)
+    return {'count': count, 'rate': count / total if total else 0.0, 'ci95': [low, high]}
+
+
+def run_tournament(specs: list, games_per_seat: int, workers: int = 1, seed: int = 0) -> dict:
+    """Joga o torneio e retorna o relatório (serializável em JSON)."""
+    pairings = [(a, b) for i, a in enumerate(specs) for b in specs[i + 1:]]
+    matches = [(x, o) for a, b in pairings for x, o in ((a, b), (b, a))]
+
+    pool = multiprocessing.Pool(workers) if workers > 1 else None
+    latencies = {spec: [] for spec in specs}
+    report = {'games_per_seat': games_per_seat, 'matches': [], 'latency_ns': {}}
+    try:
+        for m, (x_spec, o_spec) in enumerate(matches):
+            chunks = max(1, workers)
+            sizes = [games_per_seat // chunks + (1 if k < games_per_seat % chunks else 0) for k in range(chunks)]
+            tasks = [(x_spec, o_spec, n, seed * 1_000_003 + m * 1_009 + k) for k, n in enumerate(sizes) if n]
+
+            start = time.perf_counter()
+            parts = pool.map(play_games, tasks) if pool else [play_games(t) for t in tasks]
+            elapsed = time.perf_counter() - start
+
+            totals = {'X': 0, 'O': 0, 'Draw': 0}
+            for part in parts:
+                for key, count in part['results'].items():
+                    totals[key] += count
+                latencies[x_spec].extend(part['latencies']['X'])
+                latencies[o_spec].extend(part['latencies']['O'])
+
+            report['matches'].append({
+                'x': x_spec,
+                'o': o_spec,
+                'x_wins': _rate(totals['X'], games_per_seat),
+                'draws': _rate(totals['Draw'], games_per_seat),
+                'o_wins': _rate(totals['O'], games_per_seat),
+                'games_per_sec': games_per_seat / elapsed if elapsed else float('inf'),
+            })
+    finally:
+        if pool:
+            pool.close()
+            pool.join()
+
+    for spec, samples in latencies.items():
+        if samples:
+            p50, p90, p99 = np.percentile(samples, [50, 90, 99])
+            report['latency_ns'][spec] = {
+                'moves': len(samples), 'p50': p50, 'p90': p90, 'p99': p99, 'max': max(samples)
+            }
+    return report
+
+
+def print_report(report: dict):
+    def fmt(entry):
+        low, high = entry['ci95']
+        return f"{entry['rate'] * 100:6.2f}% [{low * 100:5.1f}-{high * 100:5.1f}]"
+
+    print(f"\n{'X':<28} {'O':<28} {'Vitórias X':<24} {'Empates':<24} {'Vitórias O':<24} {'jogos/s':>10}")
+    for match in report['matches']:
+        print(
+            f"{match['x']:<28} {match['o']:<28} {fmt(match['x_wins']):<24} "
+            f"{fmt(match['draws']):<24} {fmt(match['o_wins']):<24} {match['games_per_sec']:>10.0f}"
+        )
+    print(f"\n{'Agente':<28} {'jogadas':>10} {'p50 (µs)':>10} {'p90 (µs)':>10} {'p99 (µs)':>10} {'máx (µs)':>10}")
+    for spec, lat in report['latency_ns'].items():
+        print(
+            f"{spec:<28} {lat['moves']:>10} {lat['p50'] / 1000:>10.1f} {lat['p90'] / 1000:>10.1f} "
+            f"{lat['p99'] / 1000:>10.1f} {lat['max'] / 1000:>10.1f}"
+        )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Torneio sem interface gráfica entre agentes')
+    parser.add_argument(
+        '--agents', nargs='+', default=['minimax', 'random', 'qlearning:v1-q_table.json'],
+        help='Agentes: minimax, random ou qlearning:<arquivo da tabela Q>'
+    )
+    parser.add_argument('--games', type=int, default=1000, help='Partidas por par de agentes e por lado')
+    parser.add_argument('--workers', type=int, default=1, help='Número de processos')
+    parser.add_argument('--seed', type=int, default=0, help='Semente aleatória')
+    parser.add_argument('--json', default=None, help='Grava o relatório neste arquivo JSON')
+    args = parser.parse_args(argv)
+    for spec in args.agents:
+        try:
+            _get_player(spec)  # Valida a especificação e a tabela antes do torneio
+        except (FileNotFoundError, ValueError) as exc:
+            parser.error(str(exc))
+
+    report = run_tournament(args.agents, args.games, args.workers, args.seed)
+    print_report(report)
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
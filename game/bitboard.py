@@ -0,0 +1,186 @@
+"""
+Tabuleiro compacto do jogo da velha baseado em bits.
+
+Cada jogador é representado por um inteiro de 9 bits (bit i = casa i):
+  0 | 1 | 2
+  3 | 4 | 5
+  6 | 7 | 8
+A API é compatível com game.tic_tac_toe.TicTacToe (make_move,
+get_available_moves, check_winner, get_winning_line, is_full, get_state),
+acrescida de undo_move e state_id para buscas e tabelas indexadas.
+"""
+
+FULL_MASK = 0b111111111
+
+WIN_LINES = (
+    (0, 1, 2), (3, 4, 5), (6, 7, 8),  # linhas
+    (0, 3, 6), (1, 4, 7), (2, 5, 8),  # colunas
+    (0, 4, 8), (2, 4, 6)              # diagonais
+)
+
+WIN_MASKS = tuple((1 << a) | (1 << b) | (1 << c) for a, b, c in WIN_LINES)
+
+# Para cada máscara de 9 bits: True se contém alguma linha vencedora.
+_IS_WIN = tuple(
+    any(mask & win == win for win in WIN_MASKS) for mask in range(FULL_MASK + 1)
+)
+
+# Para cada máscara de casas ocupadas: tupla com as casas livres.
+_AVAILABLE_MOVES = tuple(
+    tuple(i for i in range(9) if not occupied & (1 << i))
+    for occupied in range(FULL_MASK + 1)
+)
+
+# Cache de state_id -> tupla no formato de TicTacToe.get_state().
+_STATE_TUPLES = {}
+
+
+class BitBoard:
+    """
+    Tabuleiro do jogo da velha com as jogadas de 'X' e 'O' guardadas em dois
+    inteiros de 9 bits. Vitória, tabuleiro cheio e jogadas disponíveis são
+    consultas a tabelas pré-calculadas.
+    """
+
+    __slots__ = ('x_bits', 'o_bits')
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        """Reinicia o tabuleiro para o estado vazio."""
+        self.x_bits = 0
+        self.o_bits = 0
+
+    @classmethod
+    def from_state(cls, state: tuple) -> 'BitBoard':
+        """Cria um tabuleiro a partir de uma tupla no formato de get_state()."""
+        board = cls()
+        for i, cell in enumerate(state):
+            if cell == 'X':
+                board.x_bits |= 1 << i
+            elif cell == 'O':
+                board.o_bits |= 1 << i
+        return board
+
+    @classmethod
+    def from_state_id(cls, sid: int) -> 'BitBoard':
+        """Cria um tabuleiro a partir de um state_id."""
+        board = cls()
+        board.x_bits = sid & FULL_MASK
+        board.o_bits = sid >> 9
+        return board
+
+    def copy(self) -> 'BitBoard':
+        """Retorna uma cópia independente do tabuleiro."""
+        board = BitBoard()
+        board.x_bits = self.x_bits
+        board.o_bits = self.o_bits
+        return board
+
+    def get_available_moves(self):
+        """Retorna uma tupla de índices (0-8) de posições vazias no tabuleiro."""
+        return _AVAILABLE_MOVES[self.x_bits | self.o_bits]
+
+    def make_move(self, position, player):
+        """Marca a posição com o símbolo do jogador ('X' ou 'O')."""
+        if position < 0 or position > 8:
+            raise ValueError(f"Posição inválida: {position}. Deve estar entre 0 e 8.")
+        bit = 1 << position
+        if (self.x_bits | self.o_bits) & bit:
+            raise ValueError(f"Movimento inválido: posição {position} já está ocupada.")
+        if player == 'X':
+            self.x_bits |= bit
+        elif player == 'O':
+            self.o_bits |= bit
+        else:
+            raise ValueError(f"Jogador inválido: {player}. Deve ser 'X' ou 'O'.")
+
+    def undo_move(self, position):
+        """Desfaz a jogada na posição informada (qualquer jogador)."""
+        mask = ~(1 << position)
+        self.x_bits &= mask
+        self.o_bits &= mask
+
+    def check_winner(self):
+        """Verifica o estado do jogo: 'X', 'O', 'Draw' ou None."""
+        if _IS_WIN[self.x_bits]:
+            return 'X'
+        if _IS_WIN[self.o_bits]:
+            return 'O'
+        if self.x_bits | self.o_bits == FULL_MASK:
+            return 'Draw'
+        return None
+
+    def get_winning_line(self):
+        """Retorna a linha vencedora (lista de posições) ou [] se empate."""
+        for bits in (self.x_bits, self.o_bits):
+            if _IS_WIN[bits]:
+                for line, mask in zip(WIN_LINES, WIN_MASKS):
+                    if bits & mask == mask:
+                        return list(line)
+        return [] if self.is_full() else None
+
+    def is_full(self):
+        """Retorna True se o tabuleiro estiver completo."""
+        return self.x_bits | self.o_bits == FULL_MASK
+
+    def state_id(self) -> int:
+        """Identificador inteiro do estado: bits de 'X' | bits de 'O' << 9."""
+        return self.x_bits | (self.o_bits << 9)
+
+    def get_state(self):
+        """Retorna o estado atual do tabuleiro como uma tupla."""
+        sid = self.x_bits | (self.o_bits << 9)
+        state = _STATE_TUPLES.get(sid)
+        if state is None:
+            state = tuple(
+                'X' if self.x_bits & (1 << i) else 'O' if self.o_bits & (1 << i) else None
+                for i in range(9)
+            )
+            _STATE_TUPLES[sid] = state
+        return state
+
+    def __str__(self):
+        """Retorna o tabuleiro como uma string legível."""
+        symbols = [val if val is not None else ' ' for val in self.get_state()]
+        rows = [symbols[0:3], symbols[3:6], symbols[6:9]]
+        lines = [' | '.join(row) for row in rows]
+        return '\n---------\n'.join(lines)
+
+
+_LEGAL_STATE_IDS = None
+
+
+def legal_state_ids():
+    """
+    Retorna, em ordem crescente, o state_id de todas as posições legais
+    alcançáveis a partir do tabuleiro vazio, com 'X' ou 'O' começando
+    (5.478 posições por jogador inicial, incluindo as terminais; o treino
+    permite que o agente 'O' jogue primeiro). O resultado é calculado uma
+    única vez.
+    """
+    global _LEGAL_STATE_IDS
+    if _LEGAL_STATE_IDS is not None:
+        return _LEGAL_STATE_IDS
+
+    seen = set()  # (state_id, jogador da vez)
+    board = BitBoard()
+
+    def visit(player):
+        key = (board.state_id(), player)
+        if key in seen:
+            return
+        seen.add(key)
+        if board.check_winner() is not None:
+            return
+        other = 'O' if player == 'X' else 'X'
+        for move in board.get_available_moves():
+            board.make_move(move, player)
+            visit(other)
+            board.undo_move(move)
+
+    visit('X')
+    visit('O')
+    _LEGAL_STATE_IDS = tuple(sorted({sid for sid, _ in seen}))
+    return _LEGAL_STATE_IDS
@@ -0,0 +1,178 @@
+"""
+Tabuleiro m,n,k: rows x cols casas, vence quem alinhar k peças em linha,
+coluna ou diagonal (3,3,3 é o jogo da velha; 15,15,5 é o Gomoku).
+
+Como em game.bitboard, cada jogador é um inteiro com um bit por casa
+(casa i = linha i // cols, coluna i % cols). As máscaras das linhas
+vencedoras são geradas na construção (uma vez por geometria) e, após cada
+jogada, só as linhas que passam pela casa jogada são verificadas.
+"""
+
+# Geometrias já calculadas: (rows, cols, k) -> _Geometry
+_GEOMETRIES = {}
+
+
+class _Geometry:
+    """Linhas vencedoras e ordem de busca de uma geometria m,n,k."""
+
+    def __init__(self, rows: int, cols: int, k: int):
+        if rows < 1 or cols < 1 or k < 1 or k > max(rows, cols):
+            raise ValueError(f"Geometria inválida: {rows}x{cols} com {k} em linha.")
+        self.cells = rows * cols
+        self.full_mask = (1 << self.cells) - 1
+
+        lines = []
+        for r in range(rows):
+            for c in range(cols):
+                for dr, dc in ((0, 1), (1, 0), (1, 1), (1, -1)):
+                    end_r, end_c = r + dr * (k - 1), c + dc * (k - 1)
+                    if 0 <= end_r < rows and 0 <= end_c < cols:
+                        lines.append(tuple((r + dr * i) * cols + c + dc * i for i in range(k)))
+        self.win_lines = tuple(lines)
+        self.win_masks = tuple(sum(1 << i for i in line) for line in lines)
+
+        # Para cada casa: as máscaras das linhas que passam por ela
+        through = [[] for _ in range(self.cells)]
+        for line, mask in zip(self.win_lines, self.win_masks):
+            for i in line:
+                through[i].append(mask)
+        self.lines_through = tuple(tuple(masks) for masks in through)
+
+        # Casas do centro para as bordas (ordem de busca do Minimax)
+        center_r, center_c = (rows - 1) / 2, (cols - 1) / 2
+        self.center_order = tuple(sorted(
+            range(self.cells),
+            key=lambda i: (abs(i // cols - center_r) + abs(i % cols - center_c), i)
+        ))
+
+        # Vizinhas de cada casa (distância 1 em qualquer direção)
+        self.neighbors = tuple(
+            sum(
+                1 << (nr * cols + nc)
+                for nr in range(max(0, r - 1), min(rows, r + 2))
+                for nc in range(max(0, c - 1), min(cols, c + 2))
+            ) & ~(1 << (r * cols + c))
+            for r in range(rows) for c in range(cols)
+        )
+
+
+def geometry(rows: int, cols: int, k: int) -> _Geometry:
+    """Retorna (calculando uma única vez) a geometria rows x cols com k em linha."""
+    key = (rows, cols, k)
+    geo = _GEOMETRIES.get(key)
+    if geo is None:
+        geo = _GEOMETRIES[key] = _Geometry(rows, cols, k)
+    return geo
+
+
+class MNKBoard:
+    """
+    Tabuleiro m,n,k com a mesma API de BitBoard (make_move, undo_move,
+    get_available_moves, check_winner, get_winning_line, is_full,
+    get_state, state_id e copy).
+    """
+
+    __slots__ = ('rows', 'cols', 'k', 'geometry', 'x_bits', 'o_bits', 'winner')
+
+    def __init__(self, rows: int = 3, cols: int = 3, k: int = 3):
+        self.rows = rows
+        self.cols = cols
+        self.k = k
+        self.geometry = geometry(rows, cols, k)
+        self.reset()
+
+    @property
+    def cells(self) -> int:
+        return self.geometry.cells
+
+    def reset(self):
+        """Reinicia o tabuleiro para o estado vazio."""
+        self.x_bits = 0
+        self.o_bits = 0
+        self.winner = None
+
+    def copy(self) -> 'MNKBoard':
+        """Retorna uma cópia independente do tabuleiro."""
+        board = MNKBoard.__new__(MNKBoard)
+        board.rows, board.cols, board.k, board.geometry = self.rows, self.cols, self.k, self.geometry
+        board.x_bits = self.x_bits
+        board.o_bits = self.o_bits
+        board.winner = self.winner
+        return board
+
+    def get_available_moves(self):
+        """Retorna uma lista de índices de posições vazias no tabuleiro."""
+        free = self.geometry.full_mask & ~(self.x_bits | self.o_bits)
+        moves = []
+        while free:
+            low = free & -free
+            moves.append(low.bit_length() - 1)
+            free ^= low
+        return moves
+
+    def make_move(self, position, player):
+        """Marca a posição com o símbolo do jogador ('X' ou 'O')."""
+        if position < 0 or position >= self.geometry.cells:
+            raise ValueError(f"Posição inválida: {position}. Deve estar entre 0 e {self.geometry.cells - 1}.")
+        bit = 1 << position
+        if (self.x_bits | self.o_bits) & bit:
+            raise ValueError(f"Movimento inválido: posição {position} já está ocupada.")
+        if player == 'X':
+            self.x_bits |= bit
+            bits = self.x_bits
+        elif player == 'O':
+            self.o_bits |= bit
+            bits = self.o_bits
+        else:
+            raise ValueError(f"Jogador inválido: {player}. Deve ser 'X' ou 'O'.")
+        # Verificação incremental: apenas as linhas que passam pela casa jogada
+        for mask in self.geometry.lines_through[position]:
+            if bits & mask == mask:
+                self.winner = player
+                break
+
+    def undo_move(self, position):
+        """Desfaz a jogada na posição informada (qualquer jogador)."""
+        mask = ~(1 << position)
+        self.x_bits &= mask
+        self.o_bits &= mask
+        # Nenhuma jogada é feita após uma vitória: desfazer sempre reabre o jogo
+        self.winner = None
+
+    def check_winner(self):
+        """Verifica o estado do jogo: 'X', 'O', 'Draw' ou None."""
+        if self.winner is not None:
+            return self.winner
+        if self.x_bits | self.o_bits == self.geometry.full_mask:
+            return 'Draw'
+        return None
+
+    def get_winning_line(self):
+        """Retorna a linha vencedora (lista de posições) ou [] se empate."""
+        if self.winner is not None:
+            bits = self.x_bits if self.winner == 'X' else self.o_bits
+            for line, mask in zip(self.geometry.win_lines, self.geometry.win_masks):
+                if bits & mask == mask:
+                    return list(line)
+        return [] if self.is_full() else None
+
+    def is_full(self):
+        """Retorna True se o tabuleiro estiver completo."""
+        return self.x_bits | self.o_bits == self.geometry.full_mask
+
+    def state_id(self) -> int:
+        """Identificador inteiro do estado: bits de 'X' | bits de 'O' << casas."""
+        return self.x_bits | (self.o_bits << self.geometry.cells)
+
+    def get_state(self):
+        """Retorna o estado atual do tabuleiro como uma tupla."""
+        return tuple(
+            'X' if self.x_bits >> i & 1 else 'O' if self.o_bits >> i & 1 else None
+            for i in range(self.geometry.cells)
+        )
+
+    def __str__(self):
+        """Retorna o tabuleiro como uma string legível."""
+        symbols = [val if val is not None else ' ' for val in self.get_state()]
+        rows = [' | '.join(symbols[r * self.cols:(r + 1) * self.cols]) for r in range(self.rows)]
+        return ('\n' + '-' * (4 * self.cols - 3) + '\n').join(rows)
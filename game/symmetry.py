@@ -0,0 +1,114 @@
+"""
+Simetrias do tabuleiro 3x3 (as 8 simetrias do grupo diedral: 4 rotações e
+suas reflexões).
+
+Cada simetria t é uma permutação PERMUTATIONS[t] tal que o tabuleiro
+transformado b' satisfaz b'[i] = b[PERMUTATIONS[t][i]]. O representante
+canônico de uma posição é a transformação de menor state_id; a tabela Q do
+QLearningAgent e o cache do MinimaxAgent podem guardar apenas esse
+representante, traduzindo as ações para dentro e para fora do referencial
+canônico com to_canonical_action / from_canonical_action.
+"""
+from game.bitboard import FULL_MASK, legal_state_ids
+
+
+def _build_permutations():
+    grid = [[0, 1, 2], [3, 4, 5], [6, 7, 8]]
+    perms = []
+    for _ in range(4):
+        perms.append(tuple(i for row in grid for i in row))
+        transposed = [list(col) for col in zip(*grid)]
+        perms.append(tuple(i for row in transposed for i in row))
+        grid = [list(row) for row in zip(*grid[::-1])]  # gira 90°
+    return tuple(perms)
+
+
+PERMUTATIONS = _build_permutations()
+
+# INVERSE[t][a] = casa que a ação a (referencial original) ocupa no tabuleiro transformado.
+INVERSE = tuple(
+    tuple(perm.index(a) for a in range(9)) for perm in PERMUTATIONS
+)
+
+# _MASK_TABLES[t][m] = máscara de 9 bits m transformada pela simetria t.
+_MASK_TABLES = tuple(
+    tuple(
+        sum(1 << i for i in range(9) if mask & (1 << perm[i]))
+        for mask in range(FULL_MASK + 1)
+    )
+    for perm in PERMUTATIONS
+)
+
+# state_id -> (state_id canônico, índice da simetria)
+_CANONICAL_IDS = {}
+
+# tupla do estado -> (tupla canônica, índice da simetria)
+_CANONICAL_STATES = {}
+
+# tupla do estado -> tupla com 'X' e 'O' trocados
+_SWAPPED_STATES = {}
+_SWAP = {'X': 'O', 'O': 'X'}
+
+
+def transform_state_id(sid: int, t: int) -> int:
+    """Aplica a simetria t a um state_id (formato de BitBoard.state_id)."""
+    table = _MASK_TABLES[t]
+    return table[sid & FULL_MASK] | (table[sid >> 9] << 9)
+
+
+def transform_state(state: tuple, t: int) -> tuple:
+    """Aplica a simetria t a uma tupla no formato de get_state()."""
+    return tuple(state[j] for j in PERMUTATIONS[t])
+
+
+def canonical_id(sid: int) -> tuple:
+    """Retorna (state_id canônico, simetria que leva sid até ele)."""
+    cached = _CANONICAL_IDS.get(sid)
+    if cached is None:
+        cached = min((transform_state_id(sid, t), t) for t in range(8))
+        _CANONICAL_IDS[sid] = cached
+    return cached
+
+
+def canonical_state(state: tuple) -> tuple:
+    """Retorna (tupla canônica, simetria que leva state até ela)."""
+    cached = _CANONICAL_STATES.get(state)
+    if cached is None:
+        sid = 0
+        for i, val in enumerate(state):
+            if val == 'X':
+                sid |= 1 << i
+            elif val == 'O':
+                sid |= 1 << (i + 9)
+        _, t = canonical_id(sid)
+        cached = (transform_state(state, t), t)
+        _CANONICAL_STATES[state] = cached
+    return cached
+
+
+def swap_players(state: tuple) -> tuple:
+    """
+    Troca 'X' por 'O' e vice-versa (as casas não mudam). Usada para ver
+    uma posição do ponto de vista de quem joga (self-play em
+    TrainingManager): a posição de 'O' na vez vira a de 'X' na vez.
+    """
+    swapped = _SWAPPED_STATES.get(state)
+    if swapped is None:
+        swapped = tuple(_SWAP.get(val) for val in state)
+        _SWAPPED_STATES[state] = swapped
+    return swapped
+
+
+def to_canonical_action(action: int, t: int) -> int:
+    """Traduz uma ação do referencial original para o canônico."""
+    return INVERSE[t][action]
+
+
+def from_canonical_action(action: int, t: int) -> int:
+    """Traduz uma ação do referencial canônico para o original."""
+    return PERMUTATIONS[t][action]
+
+
+def canonical_state_ids() -> tuple:
+    """state_ids canônicos de todas as posições legais (1.192 ao todo)."""
+    return tuple(sorted({canonical_id(sid)[0] for sid in legal_state_ids()}))
@@ -29,6 +29,10 @@ class TicTacToe:
             raise ValueError(f"Movimento inválido: posição {position} já está ocupada.")
         self.board[position] = player
 
+    def undo_move(self, position):
+        """Desfaz a jogada na posição informada, deixando-a vazia."""
+        self.board[position] = None
+
     def check_winner(self):
         """Verifica o estado do jogo."""
         wins = [
@@ -62,6 +66,19 @@ class TicTacToe:
         """Retorna True se o tabuleiro estiver completo."""
         return all(cell is not None for cell in self.board)
 
+    def state_id(self):
+        """
+        Identificador inteiro do estado, no mesmo formato de BitBoard.state_id:
+        bits das casas de 'X' | bits das casas de 'O' << 9.
+        """
+        sid = 0
+        for i, val in enumerate(self.board):
+            if val == 'X':
+                sid |= 1 << i
+            elif val == 'O':
+                sid |= 1 << (i + 9)
+        return sid
+
     def get_state(self):
         """Retorna o estado atual do tabuleiro como uma tupla."""
         return tuple(self.board)
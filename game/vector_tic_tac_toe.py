@@ -0,0 +1,93 @@
+"""
+Ambiente vetorizado: B tabuleiros do jogo da velha avançando em conjunto.
+
+Os tabuleiros ficam em um array int8[B, 9] (0 vazio, 1 'X', 2 'O'). Uma
+chamada a step aplica B jogadas de uma vez, e os vencedores de todos os
+tabuleiros saem de uma única multiplicação pela matriz de linhas vencedoras.
+"""
+import numpy as np
+
+from game.bitboard import WIN_LINES
+
+EMPTY, X, O = 0, 1, 2
+DRAW = 3
+SYMBOLS = {X: 'X', O: 'O'}
+
+# _WIN_MATRIX[i, j] = 1 se a casa i pertence à linha vencedora j.
+_WIN_MATRIX = np.zeros((9, len(WIN_LINES)), dtype=np.int8)
+for _j, _line in enumerate(WIN_LINES):
+    _WIN_MATRIX[list(_line), _j] = 1
+
+_POWERS = (1 << np.arange(9)).astype(np.int64)
+
+
+class VectorTicTacToe:
+    """
+    num_envs partidas simultâneas. Com auto_reset=True, as partidas que
+    terminam em um step são reiniciadas logo depois (o resultado devolvido
+    por step é o de antes do reinício).
+    """
+
+    def __init__(self, num_envs: int, first_player: int = X, auto_reset: bool = True):
+        if first_player not in (X, O):
+            raise ValueError(f"Jogador inicial inválido: {first_player}. Use X (1) ou O (2).")
+        self.num_envs = num_envs
+        self.first_player = first_player
+        self.auto_reset = auto_reset
+        self.boards = np.zeros((num_envs, 9), dtype=np.int8)
+        self.to_move = np.full(num_envs, first_player, dtype=np.int8)
+        self._rows = np.arange(num_envs)
+
+    def reset(self, mask: np.ndarray = None):
+        """Reinicia todos os tabuleiros, ou apenas os marcados em mask."""
+        if mask is None:
+            self.boards[:] = EMPTY
+            self.to_move[:] = self.first_player
+        else:
+            self.boards[mask] = EMPTY
+            self.to_move[mask] = self.first_player
+
+    def legal_mask(self) -> np.ndarray:
+        """bool[B, 9]: True nas casas livres."""
+        return self.boards == EMPTY
+
+    def state_ids(self) -> np.ndarray:
+        """state_id de cada tabuleiro, no mesmo formato de BitBoard.state_id."""
+        x_bits = (self.boards == X).astype(np.int64) @ _POWERS
+        o_bits = (self.boards == O).astype(np.int64) @ _POWERS
+        return x_bits | (o_bits << 9)
+
+    def winners(self) -> np.ndarray:
+        """int8[B]: X, O, DRAW ou EMPTY (partida em andamento)."""
+        x_win = ((self.boards == X).astype(np.int8) @ _WIN_MATRIX == 3).any(axis=1)
+        o_win = ((self.boards == O).astype(np.int8) @ _WIN_MATRIX == 3).any(axis=1)
+        full = (self.boards != EMPTY).all(axis=1)
+        return np.where(x_win, X, np.where(o_win, O, np.where(full, DRAW, EMPTY))).astype(np.int8)
+
+    def random_actions(self, rng: np.random.Generator) -> np.ndarray:
+        """Uma jogada legal uniformemente aleatória por tabuleiro (-1 se cheio)."""
+        legal = self.legal_mask()
+        scores = np.where(legal, rng.random(legal.shape), -1.0)
+        actions = scores.argmax(axis=1)
+        actions[~legal.any(axis=1)] = -1
+        return actions
+
+    def step(self, actions: np.ndarray, mask: np.ndarray = None) -> np.ndarray:
+        """
+        Aplica actions[i] no tabuleiro i para quem está na vez (apenas onde
+        mask for True, se informada). Retorna o resultado de cada tabuleiro
+        após a jogada (ver winners); tabuleiros fora de mask retornam EMPTY.
+        """
+        rows = self._rows if mask is None else self._rows[mask]
+        moves = np.asarray(actions)[rows]
+        if (moves < 0).any() or (moves > 8).any() or (self.boards[rows, moves] != EMPTY).any():
+            raise ValueError("Movimento inválido: posição fora do tabuleiro ou já ocupada.")
+        self.boards[rows, moves] = self.to_move[rows]
+        self.to_move[rows] = 3 - self.to_move[rows]
+
+        results = self.winners()
+        if mask is not None:
+            results[~mask] = EMPTY
+        if self.auto_reset:
+            self.reset(results != EMPTY)
+        return results
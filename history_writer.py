@@ -0,0 +1,127 @@
+import atexit
+import csv
+import os
+import time
+
+import numpy as np
+
+
+class HistoryWriter:
+    """
+    Escrita em lote do histórico de treinamento (history/history.csv).
+
+    Mantém o arquivo aberto e acumula as linhas em memória, gravando-as a cada
+    flush_every episódios ou flush_seconds segundos (o que vier primeiro).
+    Assim, leitores como o plot_live.py veem os dados com atraso limitado, sem
+    o custo de abrir e fechar o arquivo a cada episódio.
+
+    Opcionalmente grava também um log binário compacto (binary_file), com um
+    registro de tamanho fixo por episódio (ver RECORD_DTYPE), que pode ser
+    lido com numpy.fromfile.
+    """
+
+    HEADER = ["episode", "wins", "draws", "losses", "epsilon"]
+    RECORD_DTYPE = np.dtype([
+        ('episode', '<u4'), ('wins', '<u4'), ('draws', '<u4'), ('losses', '<u4'), ('epsilon', '<f4')
+    ])
+
+    def __init__(
+        self,
+        history_file: str,
+        flush_every: int = 500,
+        flush_seconds: float = 1.0,
+        binary_file: str = None
+    ):
+        self.history_file = history_file
+        self.flush_every = flush_every
+        self.flush_seconds = flush_seconds
+        self.binary_file = binary_file
+
+        self._buffer = []
+        self._csv_file = None
+        self._csv_writer = None
+        self._binary = None
+        self._last_flush = time.perf_counter()
+
+        # Custo do escritor, para medir o impacto no treinamento
+        self.rows_written = 0
+        self.flushes = 0
+        self.write_time = 0.0
+
+        atexit.register(self.close)
+
+    def _open(self):
+        os.makedirs(os.path.dirname(self.history_file) or '.', exist_ok=True)
+        is_new = not os.path.isfile(self.history_file) or os.path.getsize(self.history_file) == 0
+        self._csv_file = open(self.history_file, "a", newline="")
+        self._csv_writer = csv.writer(self._csv_file)
+        if is_new:
+            self._csv_writer.writerow(self.HEADER)
+        if self.binary_file:
+            self._binary = open(self.binary_file, "ab")
+
+    def append(self, episode, wins, draws, losses, epsilon):
+        """Acrescenta uma linha ao buffer, gravando em disco quando necessário."""
+        self._buffer.append((episode, wins, draws, losses, epsilon))
+        if (len(self._buffer) >= self.flush_every
+                or time.perf_counter() - self._last_flush >= self.flush_seconds):
+            self.flush()
+
+    def flush(self):
+        """Grava as linhas pendentes e esvazia o buffer."""
+        self._last_flush = time.perf_counter()
+        if not self._buffer:
+            return
+        start = self._last_flush
+        if self._csv_file is None:
+            self._open()
+        self._csv_writer.writerows(
+            (ep, w, d, l, f"{eps:.6f}") for ep, w, d, l, eps in self._buffer
+        )
+        self._csv_file.flush()
+        if self._binary is not None:
+            np.array(self._buffer, dtype=self.RECORD_DTYPE).tofile(self._binary)
+            self._binary.flush()
+
+        self.rows_written += len(self._buffer)
+        self.flushes += 1
+        self._buffer.clear()
+        self._last_flush = time.perf_counter()
+        self.write_time += self._last_flush - start
+
+    def close(self):
+        """Grava o que estiver pendente e fecha os arquivos."""
+        self.flush()
+        if self._csv_file is not None:
+            self._csv_file.close()
+            self._csv_file = None
+            self._csv_writer = None
+        if self._binary is not None:
+            self._binary.close()
+            self._binary = None
+
+    def offsets(self) -> dict:
+        """Tamanho atual dos arquivos (após flush()), para truncate() ao retomar um treino."""
+        sizes = {'csv': _file_size(self.history_file)}
+        if self.binary_file:
+            sizes['binary'] = _file_size(self.binary_file)
+        return sizes
+
+    def truncate(self, offsets: dict):
+        """Descarta o que foi gravado depois de offsets (ver offsets())."""
+        self.close()
+        for path, key in ((self.history_file, 'csv'), (self.binary_file, 'binary')):
+            if path and key in offsets and _file_size(path) > offsets[key]:
+                with open(path, 'r+b') as f:
+                    f.truncate(offsets[key])
+
+    def stats(self) -> dict:
+        return {
+            'rows_written': self.rows_written,
+            'flushes': self.flushes,
+            'write_time': self.write_time,
+        }
+
+
+def _file_size(path: str) -> int:
+    return os.path.getsize(path) if os.path.isfile(path) else 0
@@ -1,7 +1,16 @@
 import argparse
+import cProfile
+import pstats
+import os
+import random
+from telemetry import DEFAULT_PORT
 from training_manager import TrainingManager
+from parallel_training_manager import ParallelTrainingManager
+from vector_training_manager import VectorTrainingManager
 from ui_tk.main import App as uiAPP
 
+DEFAULT_CHECKPOINT = os.path.join('history', 'checkpoint.npz')
+
 
 def main():
     parser = argparse.ArgumentParser()
@@ -9,8 +18,8 @@ def main():
         '--train', action='store_true', help='Executa treinamento de Q-Learning'
     )
     parser.add_argument(
-        '--opponent', choices=['random', 'minimax'], default='random',
-        help='Tipo de oponente durante o treino'
+        '--opponent', choices=['random', 'minimax', 'mcts', 'self'], default='random',
+        help='Tipo de oponente durante o treino (self: o agente joga com X e O, na mesma tabela)'
     )
     parser.add_argument(
         '--episodes', type=int, default=5000,
@@ -20,15 +29,163 @@ def main():
         '--symbol', choices=['X', 'O'], default='X',
         help='Símbolo do agente Q-Learning'
     )
+    parser.add_argument(
+        '--symmetric', action='store_true', default=None,
+        help='Agrupa estados equivalentes por rotação/reflexão na tabela Q (sem a opção, segue o layout gravado na tabela)'
+    )
+    parser.add_argument(
+        '--q-table', default='q_table.json',
+        help='Arquivo da tabela Q (.json ou .qbin binário)'
+    )
+    parser.add_argument(
+        '--history-binary', action='store_true',
+        help='Grava também um log binário compacto em history/history.bin'
+    )
+    parser.add_argument(
+        '--workers', type=int, default=1,
+        help='Número de processos de treino (>1 ativa o treino paralelo)'
+    )
+    parser.add_argument(
+        '--seed', type=int, default=None,
+        help='Semente aleatória, para treinos reproduzíveis'
+    )
+    parser.add_argument(
+        '--minimax-ties', choices=['random', 'first'], default='random',
+        help='Entre jogadas ótimas empatadas, o oponente Minimax sorteia (random) ou usa sempre a primeira (first)'
+    )
+    parser.add_argument(
+        '--epsilon-decay', type=float, default=None,
+        help='Fator de decaimento do epsilon por episódio (padrão do agente: 0.995)'
+    )
+    parser.add_argument(
+        '--min-epsilon', type=float, default=None,
+        help='Epsilon mínimo (padrão do agente: 0.01)'
+    )
+    parser.add_argument(
+        '--mcts-iterations', type=int, default=200,
+        help='Iterações por jogada do oponente MCTS'
+    )
+    parser.add_argument(
+        '--metrics', nargs='?', const='history/metrics.jsonl', default=None,
+        help='Grava métricas de desempenho por fase do treino serial (padrão: history/metrics.jsonl)'
+    )
+    parser.add_argument(
+        '--metrics-interval', type=int, default=None,
+        help='Episódios entre relatórios de métricas (padrão: o intervalo de log)'
+    )
+    parser.add_argument(
+        '--profile', nargs='?', const='history/profile.prof', default=None,
+        help='Executa o treino sob cProfile e grava o perfil (padrão: history/profile.prof)'
+    )
+    parser.add_argument(
+        '--telemetry', type=int, nargs='?', const=DEFAULT_PORT, default=None,
+        help=f'Publica o progresso por UDP local para o plot_live.py --stream (porta padrão: {DEFAULT_PORT})'
+    )
+    parser.add_argument(
+        '--checkpoint', nargs='?', const=DEFAULT_CHECKPOINT, default=None,
+        help=f'Salva checkpoints do estado completo do treino serial (padrão: {DEFAULT_CHECKPOINT})'
+    )
+    parser.add_argument(
+        '--checkpoint-every', type=int, default=1000,
+        help='Episódios entre checkpoints'
+    )
+    parser.add_argument(
+        '--checkpoint-seconds', type=float, default=None,
+        help='Segundos entre checkpoints (além de --checkpoint-every)'
+    )
+    parser.add_argument(
+        '--resume', action='store_true',
+        help='Retoma o treino do checkpoint (implica --checkpoint); --episodes é o total, incluindo os já jogados'
+    )
+    parser.add_argument(
+        '--trace-lambda', type=float, default=None,
+        help='Atualiza a tabela ao fim de cada partida com o retorno λ (0 a 1) em vez de a cada jogada'
+    )
+    parser.add_argument(
+        '--replay-capacity', type=int, default=0,
+        help='Transições guardadas no buffer de replay (0 desativa)'
+    )
+    parser.add_argument(
+        '--replay-batch', type=int, default=64,
+        help='Transições por lote de replay'
+    )
+    parser.add_argument(
+        '--replay-batches', type=int, default=1,
+        help='Lotes de replay aplicados por episódio'
+    )
+    parser.add_argument(
+        '--vector-envs', type=int, default=0,
+        help='Treina com N partidas simultâneas em lote (NumPy); 0 desativa'
+    )
     args = parser.parse_args()
+    if args.resume and args.checkpoint is None:
+        args.checkpoint = DEFAULT_CHECKPOINT
+    serial = args.workers <= 1 and args.vector_envs <= 0
+    if args.checkpoint and not serial:
+        parser.error('--checkpoint/--resume só estão disponíveis no treino serial')
+    if (args.trace_lambda is not None or args.replay_capacity) and not serial:
+        parser.error('--trace-lambda/--replay-capacity só estão disponíveis no treino serial')
+    if (args.metrics or args.metrics_interval is not None) and not serial:
+        parser.error('--metrics/--metrics-interval só estão disponíveis no treino serial')
+    if args.vector_envs > 0 and args.opponent not in ('random', 'minimax'):
+        parser.error('--vector-envs só aceita --opponent random ou minimax')
+    if args.telemetry is not None and not 0 < args.telemetry < 65536:
+        parser.error(f'--telemetry: porta inválida ({args.telemetry})')
 
     if args.train:
-        manager = TrainingManager(
+        options = dict(
             agent_symbol=args.symbol,
             opponent_type=args.opponent,
-            num_episodes=args.episodes
+            num_episodes=args.episodes,
+            symmetric=args.symmetric,
+            q_table_file=args.q_table,
+            history_binary=args.history_binary,
+            mcts_iterations=args.mcts_iterations,
+            minimax_random_ties=args.minimax_ties == 'random',
+            telemetry_port=args.telemetry
         )
-        stats, eps = manager.train()
+        if args.vector_envs > 0:
+            manager = VectorTrainingManager(
+                num_envs=args.vector_envs,
+                seed=args.seed,
+                **options
+            )
+        elif args.workers > 1:
+            manager = ParallelTrainingManager(
+                num_workers=args.workers,
+                seed=args.seed if args.seed is not None else 0,
+                **options
+            )
+        else:
+            if args.seed is not None:
+                random.seed(args.seed)
+            manager = TrainingManager(
+                metrics_file=args.metrics,
+                metrics_interval=args.metrics_interval,
+                checkpoint_file=args.checkpoint,
+                checkpoint_every=args.checkpoint_every,
+                checkpoint_seconds=args.checkpoint_seconds,
+                resume=args.resume,
+                trace_lambda=args.trace_lambda,
+                replay_capacity=args.replay_capacity,
+                replay_batch=args.replay_batch,
+                replay_batches=args.replay_batches,
+                **options
+            )
+
+        if args.epsilon_decay is not None:
+            manager.agent.epsilon_decay = args.epsilon_decay
+        if args.min_epsilon is not None:
+            manager.agent.min_epsilon = args.min_epsilon
+
+        if args.profile:
+            profiler = cProfile.Profile()
+            stats, eps = profiler.runcall(manager.train)
+            profiler.dump_stats(args.profile)
+            pstats.Stats(profiler).sort_stats('cumulative').print_stats(15)
+            print(f"Perfil gravado em {args.profile} (abra com python -m pstats {args.profile})")
+        else:
+            stats, eps = manager.train()
         print(
             f"Treino concluído: {stats['wins']} vitórias, {stats['draws']} empates, {stats['losses']} derrotas. "
             f"Epsilon final: {eps:.4f}"
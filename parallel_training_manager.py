@@ -0,0 +1,175 @@
+import multiprocessing
+import random
+
+import numpy as np
+from tqdm import tqdm
+
+from agents.q_table import DenseQTable
+from training_manager import TrainingManager
+
+
+class _CountingQTable(DenseQTable):
+    """Tabela densa que conta quantas vezes cada par (estado, ação) foi atualizado."""
+
+    def set(self, state: tuple, action: int, value: float):
+        super().set(state, action, value)
+        self.counts[DenseQTable._index[state], action] += 1
+
+
+# Estado de cada processo trabalhador (criado uma única vez por processo).
+_worker_manager = None
+
+
+def _init_worker(agent_symbol, opponent_type, symmetric, hyperparameters, mcts_iterations, minimax_random_ties):
+    global _worker_manager
+    _worker_manager = TrainingManager(
+        agent_symbol=agent_symbol,
+        opponent_type=opponent_type,
+        num_episodes=0,
+        symmetric=symmetric,
+        q_table_file=None,
+        mcts_iterations=mcts_iterations,
+        minimax_random_ties=minimax_random_ties
+    )
+    agent = _worker_manager.agent
+    agent.alpha = hyperparameters['alpha']
+    agent.gamma = hyperparameters['gamma']
+
+
+def _run_worker_chunk(task):
+    """
+    Joga os episódios de uma rodada a partir de uma cópia da tabela mestre.
+    Retorna os novos valores, a contagem de atualizações por entrada e o
+    resultado de cada episódio ('w', 'd' ou 'l').
+    """
+    seed, episodes, epsilons, values, visited = task
+    random.seed(seed)
+
+    table = _CountingQTable.from_arrays(values.copy(), visited.copy())
+    table.counts = np.zeros(values.shape, dtype=np.uint32)
+    manager = _worker_manager
+    manager.agent.q_table = table
+
+    outcomes = []
+    for ep, eps in zip(episodes, epsilons):
+        manager.agent.epsilon = eps
+        stats = {'wins': 0, 'draws': 0, 'losses': 0}
+        manager.run_episode(ep, stats)
+        outcomes.append('w' if stats['wins'] else 'd' if stats['draws'] else 'l')
+    return table.values, table.counts, outcomes
+
+
+class ParallelTrainingManager(TrainingManager):
+    """
+    Treinamento paralelo: num_workers processos jogam episódios contra o
+    oponente escolhido a partir de cópias da tabela Q mestre. A cada rodada
+    (sync_every episódios por trabalhador) o coordenador une os resultados
+    por média ponderada pelo número de atualizações de cada entrada e envia
+    a tabela unida de volta aos trabalhadores.
+
+    O epsilon segue o mesmo decaimento do treino serial, calculado pelo número
+    global do episódio, e cada trabalhador usa uma semente derivada de
+    (seed, rodada, trabalhador): para uma mesma semente e número de
+    trabalhadores o resultado é reproduzível.
+    """
+
+    def __init__(
+        self,
+        agent_symbol: str,
+        opponent_type: str,
+        num_episodes: int,
+        num_workers: int = 2,
+        sync_every: int = 200,
+        seed: int = 0,
+        **kwargs
+    ):
+        super().__init__(agent_symbol, opponent_type, num_episodes, **kwargs)
+        if not isinstance(self.agent.q_table, DenseQTable):
+            raise ValueError("O treino paralelo requer o backend 'dense' da tabela Q.")
+        self.num_workers = num_workers
+        self.sync_every = sync_every
+        self.seed = seed
+
+    def train(self):
+        try:
+            return self._train_parallel()
+        finally:
+            self._close_outputs()
+
+    def _epsilon_after(self, episodes_done: int, initial_epsilon: float) -> float:
+        agent = self.agent
+        return max(agent.min_epsilon, initial_epsilon * agent.epsilon_decay ** episodes_done)
+
+    def _train_parallel(self):
+        stats = {'wins': 0, 'draws': 0, 'losses': 0}
+        agent = self.agent
+        initial_epsilon = agent.epsilon
+        round_size = self.num_workers * self.sync_every
+        hyperparameters = agent.hyperparameters()
+        last_logged = 0
+
+        pool = multiprocessing.Pool(
+            self.num_workers,
+            initializer=_init_worker,
+            initargs=(self.agent_symbol, self.opponent_type, agent.symmetric, hyperparameters,
+                      self.mcts_iterations, self.minimax_random_ties)
+        )
+        progress = tqdm(total=self.num_episodes, desc=f"Treinando vs {self.opponent_type} "
+                        f"({self.num_workers} processos)", unit="ep")
+        try:
+            for round_idx, first in enumerate(range(1, self.num_episodes + 1, round_size)):
+                last = min(first + round_size - 1, self.num_episodes)
+                values = np.asarray(agent.q_table.values)
+                visited = np.asarray(agent.q_table.visited)
+
+                # Episódios intercalados entre os trabalhadores: o trabalhador k
+                # joga first + k, first + k + num_workers, ...
+                tasks = []
+                for k in range(self.num_workers):
+                    episodes = list(range(first + k, last + 1, self.num_workers))
+                    epsilons = [self._epsilon_after(ep - 1, initial_epsilon) for ep in episodes]
+                    seed = self.seed * 1_000_003 + round_idx * 1_009 + k
+                    tasks.append((seed, episodes, epsilons, values, visited))
+
+                results = pool.map(_run_worker_chunk, tasks)
+                self._merge(values, visited, results)
+
+                # Histórico na ordem global dos episódios
+                outcome_by_ep = {}
+                for task, (_, _, outcomes) in zip(tasks, results):
+                    outcome_by_ep.update(zip(task[1], outcomes))
+                for ep in range(first, last + 1):
+                    key = {'w': 'wins', 'd': 'draws', 'l': 'losses'}[outcome_by_ep[ep]]
+                    stats[key] += 1
+                    agent.epsilon = self._epsilon_after(ep, initial_epsilon)
+                    self._append_history_entry(ep, stats['wins'], stats['draws'], stats['losses'], agent.epsilon)
+                progress.update(last - first + 1)
+
+                if last // self.log_interval > last_logged // self.log_interval or last == self.num_episodes:
+                    last_logged = last
+                    agent.save_q_table(background=True)
+                    self._log_progress(last, stats)
+        finally:
+            progress.close()
+            pool.close()
+            pool.join()
+
+        return stats, agent.epsilon
+
+    def _merge(self, values, visited, results):
+        """
+        Une as tabelas dos trabalhadores: cada entrada atualizada recebe a
+        média dos valores dos trabalhadores, ponderada pelo número de
+        atualizações que cada um fez nela. As demais permanecem inalteradas.
+        """
+        weighted = np.zeros(values.shape, dtype=np.float64)
+        total = np.zeros(values.shape, dtype=np.float64)
+        for worker_values, counts, _ in results:
+            touched = counts > 0
+            weighted[touched] += counts[touched] * worker_values[touched]
+            total += counts
+        touched = total > 0
+        merged = np.array(values, copy=True)
+        merged[touched] = weighted[touched] / total[touched]
+        self.agent.q_table.values = merged.astype(values.dtype)
+        self.agent.q_table.visited = np.asarray(visited) | touched
@@ -1,92 +1,260 @@
-import pandas as pd
+"""
+Gráfico ao vivo do treinamento (history/history.csv).
+
+O arquivo é lido como um "tail": guarda-se a posição já lida e, a cada
+atualização, só as linhas novas são interpretadas. Os dados são reduzidos
+incrementalmente a no máximo MAX_BUCKETS baldes com o mínimo e o máximo de
+cada série (decimação min/max), e as linhas do gráfico são atualizadas no
+lugar com set_data. O custo de cada atualização não cresce com o tamanho do
+histórico.
+
+Com --stream, os dados vêm da telemetria UDP do treino (main.py --train
+--telemetry), sem passar pelo disco, e o gráfico é atualizado a cada
+STREAM_INTERVAL_MS.
+"""
+import argparse
+import os
+
 import matplotlib.pyplot as plt
+import numpy as np
 from matplotlib.animation import FuncAnimation
-import os
-import sys
+
+from telemetry import DEFAULT_PORT, TelemetrySubscriber
 
 # Constantes
 HISTORY_FILE = os.path.join('history', 'history.csv')
 UPDATE_INTERVAL_MS = 280  # Atualiza o gráfico
+STREAM_INTERVAL_MS = 50   # Atualização com --stream
+MAX_BUCKETS = 2048        # Pontos por série na tela: ~2 por pixel de largura
+
+# Colunas das séries decimadas
+WIN_RATE, DRAWS, LOSSES, EPSILON = range(4)
+
+
+class GrowableBuffer:
+    """Array NumPy de linhas com capacidade dobrada sob demanda."""
+
+    def __init__(self, columns: int, capacity: int = 1024):
+        self.data = np.empty((capacity, columns))
+        self.size = 0
 
-# Configuração inicial do Gráfico
-fig, ax1 = plt.subplots(figsize=(12, 7))
-ax2 = ax1.twinx()  # Cria um segundo eixo Y para o Epsilon
+    def extend(self, rows: np.ndarray):
+        needed = self.size + len(rows)
+        if needed > len(self.data):
+            capacity = len(self.data)
+            while capacity < needed:
+                capacity *= 2
+            grown = np.empty((capacity, self.data.shape[1]))
+            grown[:self.size] = self.data[:self.size]
+            self.data = grown
+        self.data[self.size:needed] = rows
+        self.size = needed
 
-# Adiciona um título inicial
-fig.suptitle('Aguardando dados do treinamento...', fontsize=16)
+    def view(self) -> np.ndarray:
+        return self.data[:self.size]
 
-def animate(i):
+    def drop_front(self, count: int):
+        """Descarta as count primeiras linhas (já consumidas)."""
+        remaining = self.size - count
+        self.data[:remaining] = self.data[count:self.size]
+        self.size = remaining
+
+
+class HistoryTail:
+    """Lê apenas as linhas acrescentadas ao CSV desde a última chamada."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.offset = 0
+        self._partial = b''
+
+    def poll(self) -> np.ndarray:
+        """
+        Linhas novas completas como array float[n, 5] (episode, wins,
+        draws, losses, epsilon). Se o arquivo encolher (foi recriado), a
+        leitura recomeça do início e reset() deve ser aplicado ao gráfico.
+        """
+        try:
+            size = os.path.getsize(self.path)
+        except FileNotFoundError:
+            return np.empty((0, 5))
+        if size < self.offset:
+            self.offset = 0
+            self._partial = b''
+        if size == self.offset:
+            return np.empty((0, 5))
+
+        with open(self.path, 'rb') as f:
+            f.seek(self.offset)
+            chunk = f.read(size - self.offset)
+        self.offset += len(chunk)
+
+        lines = (self._partial + chunk).split(b'\n')
+        self._partial = lines.pop()  # Última linha pode estar incompleta
+        rows = [line for line in lines if line[:1].isdigit()]  # Ignora o cabeçalho
+        if not rows:
+            return np.empty((0, 5))
+        return np.loadtxt(rows, delimiter=',', ndmin=2)
+
+
+class MinMaxDecimator:
     """
-    Função que lê os dados e atualiza o gráfico.
-    É chamada periodicamente pela FuncAnimation.
+    Mantém, de forma incremental, até max_buckets baldes com o mínimo e o
+    máximo de cada série. Cada balde cobre width linhas; quando os baldes
+    acabam, pares vizinhos são unidos e width dobra. Apenas as linhas ainda
+    não agrupadas ficam guardadas (no máximo width).
     """
-    if not os.path.exists(HISTORY_FILE):
-        return
 
-    try:
-        data = pd.read_csv(HISTORY_FILE)
-        if data.empty:
+    def __init__(self, columns: int, max_buckets: int = MAX_BUCKETS):
+        self.max_buckets = max_buckets - max_buckets % 2
+        self.width = 1
+        self.count = 0
+        self.x_first = np.empty(self.max_buckets)
+        self.x_last = np.empty(self.max_buckets)
+        self.low = np.empty((self.max_buckets, columns))
+        self.high = np.empty((self.max_buckets, columns))
+        self.pending = GrowableBuffer(columns + 1)  # x + séries
+
+    def extend(self, x: np.ndarray, values: np.ndarray):
+        self.pending.extend(np.column_stack([x, values]))
+        pending = self.pending.view()
+        consumed = 0
+        while True:
+            n = min((len(pending) - consumed) // self.width, self.max_buckets - self.count)
+            if n == 0:
+                if (len(pending) - consumed) >= self.width and self.count == self.max_buckets:
+                    self._merge()
+                    continue
+                break
+            block = pending[consumed:consumed + n * self.width].reshape(n, self.width, -1)
+            end = self.count + n
+            self.x_first[self.count:end] = block[:, 0, 0]
+            self.x_last[self.count:end] = block[:, -1, 0]
+            self.low[self.count:end] = block[:, :, 1:].min(axis=1)
+            self.high[self.count:end] = block[:, :, 1:].max(axis=1)
+            self.count = end
+            consumed += n * self.width
+        self.pending.drop_front(consumed)
+
+    def _merge(self):
+        half = self.count // 2
+        self.x_first[:half] = self.x_first[0:self.count:2]
+        self.x_last[:half] = self.x_last[1:self.count:2]
+        self.low[:half] = np.minimum(self.low[0:self.count:2], self.low[1:self.count:2])
+        self.high[:half] = np.maximum(self.high[0:self.count:2], self.high[1:self.count:2])
+        self.count = half
+        self.width *= 2
+
+    def series(self, column: int) -> tuple:
+        """(x, y) para desenhar a série: mínimo no início e máximo no fim de cada balde."""
+        x = np.empty(2 * self.count)
+        y = np.empty(2 * self.count)
+        x[0::2] = self.x_first[:self.count]
+        x[1::2] = self.x_last[:self.count]
+        y[0::2] = self.low[:self.count, column]
+        y[1::2] = self.high[:self.count, column]
+        tail = self.pending.view()
+        return np.concatenate([x, tail[:, 0]]), np.concatenate([y, tail[:, column + 1]])
+
+
+class LivePlot:
+    """Figura com as séries do treino, atualizadas no lugar a cada nova leva de linhas."""
+
+    def __init__(self):
+        self.fig, self.ax1 = plt.subplots(figsize=(12, 7))
+        self.ax2 = self.ax1.twinx()  # Cria um segundo eixo Y para o Epsilon
+        self.fig.suptitle('Aguardando dados do treinamento...', fontsize=16)
+
+        # --- Eixo 1: Taxa de Vitória e Contagens ---
+        (self.win_line,) = self.ax1.plot([], [], label='Taxa de Vitória (%)', color='green', linewidth=2)
+        (self.draw_line,) = self.ax1.plot([], [], label='Empates', color='orange', linestyle='--')
+        (self.loss_line,) = self.ax1.plot([], [], label='Derrotas', color='red', linestyle='--')
+        self.ax1.set_xlabel('Episódios', fontsize=12)
+        self.ax1.set_ylabel('Contagem / Taxa de Vitória (%)', color='black', fontsize=12)
+        self.ax1.tick_params(axis='y', labelcolor='black')
+        self.ax1.grid(axis='y', linestyle=':', linewidth=0.7)
+
+        # --- Eixo 2: Epsilon ---
+        (self.eps_line,) = self.ax2.plot([], [], label='Epsilon (ε)', color='purple', linestyle=':')
+        self.ax2.tick_params(axis='y', labelcolor='purple')
+        self.ax2.set_ylim(-0.05, 1.05)
+
+        lines = [self.win_line, self.draw_line, self.loss_line, self.eps_line]
+        self.ax2.legend(lines, [line.get_label() for line in lines], loc='upper left')
+        self.reset()
+
+    def reset(self):
+        self.decimator = MinMaxDecimator(4)
+        self.last_row = None
+
+    def add_rows(self, rows: np.ndarray):
+        """rows: float[n, 5] com episode, wins, draws, losses, epsilon."""
+        if len(rows) == 0:
             return
-    except (pd.errors.EmptyDataError, FileNotFoundError):
-        return
-    
-    # Extrai as colunas
-    episodes = data['episode']
-    wins = data['wins']
-    draws = data['draws']
-    losses = data['losses']
-    epsilon = data['epsilon']
-
-    # Calcula a taxa de vitória (Win Rate)
-    total_games = wins + draws + losses
-    win_rate = (wins / total_games.replace(0, 1)) * 100
-
-    # Limpa os eixos para redesenhar
-    ax1.cla()
-    ax2.cla()
-
-    # --- Eixo 1: Taxa de Vitória e Contagens ---
-    ax1.plot(episodes, win_rate, label='Taxa de Vitória (%)', color='green', linewidth=2)
-    ax1.plot(episodes, draws, label='Empates', color='orange', linestyle='--')
-    ax1.plot(episodes, losses, label='Derrotas', color='red', linestyle='--')
-    
-    ax1.set_xlabel('Episódios', fontsize=12)
-    ax1.set_ylabel('Contagem / Taxa de Vitória (%)', color='black', fontsize=12)
-    ax1.tick_params(axis='y', labelcolor='black')
-    ax1.grid(axis='y', linestyle=':', linewidth=0.7)
-
-    # --- Eixo 2: Epsilon ---
-    ax2.plot(episodes, epsilon, label='Epsilon (ε)', color='purple', linestyle=':')
-    #ax2.set_ylabel('Epsilon (ε)', color='purple', fontsize=12)
-    ax2.tick_params(axis='y', labelcolor='purple')
-    ax2.set_ylim(-0.05, 1.05) # Ajustado o limite superior para 1.05
-
-    # --- Título e Legenda (CORRIGIDO) ---
-    # Pega o último valor de cada série para exibir no título
-    last_episode = episodes.iloc[-1]
-    last_wins = wins.iloc[-1]
-    last_draws = draws.iloc[-1]
-    last_losses = losses.iloc[-1]
-    last_epsilon = epsilon.iloc[-1]
-
-    # Usa os valores únicos no título
-    fig.suptitle(
-        f"Episódio: {last_episode} | "
-        f"{last_wins} {((last_wins/last_episode)*100):.2f}% vitórias,"
-        f"{last_draws} {((last_draws/last_episode)*100):.2f}% empates,"
-        f"{last_losses} {((last_losses/last_episode)*100):.2f}% derrotas | "
-        f"ε={last_epsilon:.4f}",
-        fontsize=14
+        if self.last_row is not None and rows[0, 0] < self.last_row[0]:
+            self.reset()  # Episódios recomeçaram: novo treino
+        episodes, wins, draws, losses, epsilon = rows.T
+        total = wins + draws + losses
+        win_rate = wins / np.where(total == 0, 1, total) * 100
+        self.decimator.extend(episodes, np.column_stack([win_rate, draws, losses, epsilon]))
+        self.last_row = rows[-1]
+
+    def redraw(self):
+        for line, column in ((self.win_line, WIN_RATE), (self.draw_line, DRAWS),
+                             (self.loss_line, LOSSES), (self.eps_line, EPSILON)):
+            line.set_data(*self.decimator.series(column))
+        self.ax1.relim()
+        self.ax1.autoscale_view()
+        self.ax2.set_xlim(self.ax1.get_xlim())
+
+        # Título com o último valor de cada série
+        last_episode, last_wins, last_draws, last_losses, last_epsilon = self.last_row
+        last_episode = max(last_episode, 1)
+        self.fig.suptitle(
+            f"Episódio: {last_episode:.0f} | "
+            f"{last_wins:.0f} {((last_wins/last_episode)*100):.2f}% vitórias,"
+            f"{last_draws:.0f} {((last_draws/last_episode)*100):.2f}% empates,"
+            f"{last_losses:.0f} {((last_losses/last_episode)*100):.2f}% derrotas | "
+            f"ε={last_epsilon:.4f}",
+            fontsize=14
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Gráfico ao vivo do treinamento')
+    parser.add_argument(
+        '--stream', type=int, nargs='?', const=DEFAULT_PORT, default=None,
+        help=f'Assina a telemetria UDP do treino em vez de ler {HISTORY_FILE} (porta padrão: {DEFAULT_PORT})'
     )
-    
-    lines1, labels1 = ax1.get_legend_handles_labels()
-    lines2, labels2 = ax2.get_legend_handles_labels()
-    ax2.legend(lines1 + lines2, labels1 + labels2, loc='upper left')
+    args = parser.parse_args()
+
+    plot = LivePlot()
+    if args.stream is not None:
+        source = TelemetrySubscriber(port=args.stream)
+        interval = STREAM_INTERVAL_MS
+    else:
+        source = HistoryTail(HISTORY_FILE)
+        interval = UPDATE_INTERVAL_MS
+
+    def animate(i):
+        """Lê só as linhas novas (do arquivo ou da telemetria) e atualiza o gráfico."""
+        offset = getattr(source, 'offset', 0)
+        rows = source.poll()
+        if getattr(source, 'offset', 0) < offset:
+            plot.reset()  # Arquivo recriado: recomeça o gráfico
+        if len(rows):
+            plot.add_rows(rows)
+            plot.redraw()
+
+    # Inicia a animação
+    ani = FuncAnimation(plot.fig, animate, interval=interval, cache_frame_data=False)
+
+    plt.tight_layout(rect=[0, 0, 1, 0.96])
+    plt.show()
 
-# Inicia a animação
-ani = FuncAnimation(fig, animate, interval=UPDATE_INTERVAL_MS, cache_frame_data=False)
+    print("Janela de plotagem fechada.")
+    return ani
 
-plt.tight_layout(rect=[0, 0, 1, 0.96])
-plt.show()
 
-print("Janela de plotagem fechada.")
\ No newline at end of file
+if __name__ == '__main__':
+    main()
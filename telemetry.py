@@ -0,0 +1,96 @@
+import socket
+import struct
+import time
+
+import numpy as np
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 47800
+
+MAGIC = b'TTTM'
+_HEADER = struct.Struct('<4sI')  # magic, número de linhas
+COLUMNS = 5                      # episode, wins, draws, losses, epsilon
+MAX_ROWS = 1500                  # Cabe num datagrama UDP (< 64 KiB)
+
+
+class TelemetryPublisher:
+    """
+    Publica as linhas do histórico (episode, wins, draws, losses, epsilon)
+    por UDP local, para painéis ao vivo como o plot_live.py --stream.
+
+    As linhas são acumuladas e enviadas em um único datagrama a cada
+    interval segundos. O envio nunca bloqueia o treino: sem assinante os
+    datagramas simplesmente se perdem, e se o socket estiver cheio o lote é
+    descartado. Lotes com mais de MAX_ROWS linhas são reduzidos a MAX_ROWS
+    linhas espaçadas (sempre com a última), o que basta para contagens
+    acumuladas.
+    """
+
+    def __init__(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, interval: float = 0.05):
+        self.address = (host, port)
+        self.interval = interval
+        self._socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self._socket.setblocking(False)
+        self._rows = []
+        self._last_send = time.perf_counter()
+
+        self.sent = 0
+        self.dropped = 0
+
+    def publish(self, episode, wins, draws, losses, epsilon):
+        self._rows.append((episode, wins, draws, losses, epsilon))
+        if time.perf_counter() - self._last_send >= self.interval:
+            self.flush()
+
+    def flush(self):
+        """Envia as linhas pendentes em um datagrama."""
+        self._last_send = time.perf_counter()
+        if not self._rows or self._socket is None:
+            return
+        rows = np.array(self._rows, dtype='<f8')
+        self._rows.clear()
+        if len(rows) > MAX_ROWS:
+            rows = rows[np.linspace(0, len(rows) - 1, MAX_ROWS).astype(int)]
+        try:
+            self._socket.sendto(_HEADER.pack(MAGIC, len(rows)) + rows.tobytes(), self.address)
+            self.sent += 1
+        except OSError:
+            # Buffer cheio (BlockingIOError) ou assinante ausente (ConnectionRefused no Windows)
+            self.dropped += 1
+
+    def close(self):
+        if self._socket is not None:
+            self.flush()
+            self._socket.close()
+            self._socket = None
+
+
+class TelemetrySubscriber:
+    """Recebe os lotes do TelemetryPublisher sem bloquear (ver poll)."""
+
+    def __init__(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT):
+        self._socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self._socket.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 1 << 20)
+        self._socket.bind((host, port))
+        self._socket.setblocking(False)
+
+    def poll(self) -> np.ndarray:
+        """Todas as linhas recebidas desde a última chamada, como float[n, 5]."""
+        batches = []
+        while True:
+            try:
+                data = self._socket.recv(65536)
+            except (BlockingIOError, ConnectionResetError):
+                break
+            if len(data) < _HEADER.size:
+                continue
+            magic, count = _HEADER.unpack_from(data)
+            if magic != MAGIC or len(data) != _HEADER.size + count * COLUMNS * 8:
+                continue
+            batches.append(np.frombuffer(data, dtype='<f8', offset=_HEADER.size).reshape(count, COLUMNS))
+        if not batches:
+            return np.empty((0, COLUMNS))
+        return np.concatenate(batches)
+
+    def close(self):
+        self._socket.close()
@@ -1,90 +1,213 @@
 import os
-import csv
 import random
 from tqdm import tqdm
 
-from game.tic_tac_toe import TicTacToe
+from game.bitboard import BitBoard
+from game.symmetry import swap_players
+from agents.mcts_agent import MCTSAgent
+from agents.q_table import DenseQTable
 from agents.minimax_agent import MinimaxAgent
 from agents.qlearning_agent import QLearningAgent
+from agents.replay_buffer import ReplayBuffer
+from checkpoint import Checkpointer, capture_state, load_checkpoint, restore_state
+from history_writer import HistoryWriter
+from telemetry import TelemetryPublisher
+from training_metrics import TrainingMetrics
 
 class TrainingManager:
     """
-    Gerencia o treinamento do agente Q-Learning contra
-    oponente aleatório ou Minimax, salvando Q-table e histórico
-    incremental em history/history.csv a cada episódio.
+    Gerencia o treinamento do agente Q-Learning contra oponente aleatório,
+    Minimax, MCTS ou contra si mesmo (self-play), salvando Q-table e
+    histórico incremental em history/history.csv a cada episódio (gravado em
+    lotes pelo HistoryWriter).
+
+    Com metrics_file, o tempo gasto em cada fase (jogada do agente, jogada do
+    oponente, atualização Q, histórico e gravação da tabela), os nós do
+    Minimax, o tamanho da tabela Q e os episódios por segundo são gravados a
+    cada metrics_interval episódios (ver TrainingMetrics). Sem metrics_file
+    nenhum método é instrumentado.
+
+    Com telemetry_port, cada linha do histórico é também publicada por UDP
+    local (ver TelemetryPublisher), para o plot_live.py --stream.
+
+    Com checkpoint_file, o estado completo do treino (tabela Q, epsilon,
+    episódio, contadores e gerador aleatório) é salvo em segundo plano a cada
+    checkpoint_every episódios e/ou checkpoint_seconds segundos, e ao fim do
+    treino (ver checkpoint.py). Com resume=True o treino continua do último
+    checkpoint, exatamente como se não tivesse parado, e as linhas do
+    histórico posteriores a ele são descartadas.
+
+    Por padrão a tabela Q é atualizada a cada jogada (update_q). Com
+    trace_lambda, as transições da partida são guardadas e aplicadas ao fim
+    dela com o retorno λ (QLearningAgent.update_episode), de trás para
+    frente. Com replay_capacity, as transições também vão para um
+    ReplayBuffer, e replay_batches lotes de replay_batch transições sorteadas
+    são aplicados em lote ao fim de cada partida.
     """
     def __init__(
         self,
         agent_symbol: str,
         opponent_type: str,
         num_episodes: int,
-        log_interval: int = 100  # Intervalo para imprimir o status no console
+        log_interval: int = 100,  # Intervalo para imprimir o status no console
+        symmetric: bool = None,   # Reduz os estados pelas simetrias (None: segue a tabela carregada)
+        q_table_file: str = 'q_table.json',  # .json ou .qbin (binário)
+        history_flush_every: int = 500,      # Episódios por gravação do histórico
+        history_flush_seconds: float = 1.0,  # Atraso máximo do histórico em disco
+        history_binary: bool = False,        # Grava também history/history.bin
+        history_dir: str = 'history',        # Pasta de history.csv e history.bin
+        mcts_iterations: int = 200,          # Iterações por jogada do oponente MCTS
+        metrics_file: str = None,            # Arquivo JSONL de métricas (None desativa)
+        metrics_interval: int = None,        # Episódios entre relatórios (padrão: log_interval)
+        telemetry_port: int = None,          # Porta UDP local da telemetria (None desativa)
+        checkpoint_file: str = None,         # Arquivo de checkpoint (None desativa)
+        checkpoint_every: int = None,        # Episódios entre checkpoints
+        checkpoint_seconds: float = None,    # Segundos entre checkpoints
+        resume: bool = False,                # Retoma do checkpoint_file, se existir
+        trace_lambda: float = None,          # λ do retorno ao fim da partida (None: update_q a cada jogada)
+        replay_capacity: int = 0,            # Transições no buffer de replay (0 desativa)
+        replay_batch: int = 64,              # Transições por lote de replay
+        replay_batches: int = 1,             # Lotes de replay por episódio
+        minimax_random_ties: bool = True     # Minimax sorteia entre as jogadas ótimas
     ):
-        self.agent = QLearningAgent()
+        self.agent = QLearningAgent(
+            q_table_file=q_table_file, symmetric=symmetric, self_play=opponent_type.lower() == 'self'
+        )
         self.agent_symbol    = agent_symbol        # 'X' ou 'O'
-        self.opponent_type   = opponent_type.lower() # 'random' ou 'minimax'
+        self.opponent_type   = opponent_type.lower() # 'random', 'minimax', 'mcts' ou 'self'
         self.num_episodes    = num_episodes
         self.opponent_symbol = 'O' if agent_symbol == 'X' else 'X'
         self.log_interval    = log_interval
+        self.mcts_iterations = mcts_iterations
+        self.minimax_random_ties = minimax_random_ties
 
         # Prepara pasta e arquivo único de histórico
-        os.makedirs("history", exist_ok=True)
-        self.history_file = os.path.join("history", "history.csv")
-        if not os.path.isfile(self.history_file):
-            with open(self.history_file, "w", newline="") as f:
-                writer = csv.writer(f)
-                writer.writerow(["episode", "wins", "draws", "losses", "epsilon"])
-
-        # Se for vs Minimax, cria o agente adversário
+        os.makedirs(history_dir, exist_ok=True)
+        self.history_file = os.path.join(history_dir, "history.csv")
+        self.history = HistoryWriter(
+            self.history_file,
+            flush_every=history_flush_every,
+            flush_seconds=history_flush_seconds,
+            binary_file=os.path.join(history_dir, "history.bin") if history_binary else None
+        )
+
+        # Se for vs Minimax, cria o agente adversário: a árvore é resolvida uma
+        # única vez (ou lida do livro de aberturas) e cada jogada é uma consulta,
+        # sorteada entre todas as jogadas ótimas
         if self.opponent_type == 'minimax':
             self.minimax = MinimaxAgent(
                 ai_player=self.opponent_symbol,
-                human_player=self.agent_symbol
+                human_player=self.agent_symbol,
+                precompute=True,
+                random_ties=minimax_random_ties
+            )
+        elif self.opponent_type == 'mcts':
+            self.mcts = MCTSAgent(
+                ai_player=self.opponent_symbol,
+                human_player=self.agent_symbol,
+                iterations=mcts_iterations
             )
+            self._mcts_iterations_done = 0  # Para o relatório de iterações/s
+            self._mcts_time = 0.0
+
+        self.metrics = None
+        self.metrics_interval = metrics_interval or log_interval
+        if metrics_file:
+            self._setup_metrics(metrics_file)
+
+        self.telemetry = TelemetryPublisher(port=telemetry_port) if telemetry_port else None
+
+        self.trace_lambda = trace_lambda
+        self.replay_batch = replay_batch
+        self.replay_batches = replay_batches
+        self.replay = None
+        if replay_capacity:
+            if not isinstance(self.agent.q_table, DenseQTable):
+                raise ValueError("O buffer de replay requer o backend 'dense' da tabela Q.")
+            self.replay = ReplayBuffer(replay_capacity, seed=random.getrandbits(64))
+        self._trajectory = []
+        if trace_lambda is None and self.replay is None:
+            self._learn = self.agent.update_q  # Direto ao update_q, sem custo extra por jogada
+
+        self.start_episode = 0
+        self.initial_stats = {'wins': 0, 'draws': 0, 'losses': 0}
+        self.checkpointer = None
+        if checkpoint_file:
+            if resume and os.path.isfile(checkpoint_file):
+                self.start_episode, self.initial_stats = restore_state(self, load_checkpoint(checkpoint_file))
+                tqdm.write(f"Retomando do episódio {self.start_episode} ({checkpoint_file}), ε={self.agent.epsilon:.4f}")
+                if self.metrics is not None:
+                    self.metrics._last_episode = self.start_episode
+            elif resume:
+                tqdm.write(f"Checkpoint {checkpoint_file} não encontrado; iniciando do zero.")
+            self.checkpointer = Checkpointer(checkpoint_file, checkpoint_every, checkpoint_seconds)
+
+    def _setup_metrics(self, metrics_file):
+        metrics = self.metrics = TrainingMetrics(metrics_file)
+        metrics.instrument(self.agent, 'choose_action', 'agent_move')
+        metrics.instrument(self.agent, 'update_q', 'q_update')
+        metrics.instrument(self.agent, 'update_episode', 'q_update')
+        metrics.instrument(self.agent, 'update_batch', 'q_update')
+        metrics.instrument(self.agent, 'save_q_table', 'q_save')
+        metrics.instrument(self.history, 'append', 'history_io')
+        if self.opponent_type == 'minimax':
+            metrics.instrument(self.minimax, 'find_best_move', 'opponent_move',
+                               after=lambda agent: metrics.count('minimax_nodes', agent.nodes_searched))
+        elif self.opponent_type == 'mcts':
+            metrics.instrument(self.mcts, 'find_best_move', 'opponent_move',
+                               after=lambda agent: metrics.count('mcts_iterations', agent.last_iterations))
+        elif self.opponent_type == 'random':
+            metrics.instrument(self, '_random_opponent_move', 'opponent_move')
 
     def train(self):
         """Escolhe o modo de treino conforme opponent_type."""
-        if self.opponent_type == 'random':
-            return self._train_vs_random()
-        else:
-            return self._train_vs_minimax()
+        try:
+            if self.opponent_type == 'random':
+                return self._train_vs_random()
+            elif self.opponent_type == 'mcts':
+                return self._train_vs_mcts()
+            elif self.opponent_type == 'self':
+                return self._train_vs_self()
+            else:
+                return self._train_vs_minimax()
+        finally:
+            self._close_outputs()
+            if self.metrics is not None:
+                self.metrics.close()
+            if self.checkpointer is not None:
+                self.checkpointer.close()
+            stats = self.history.stats()
+            tqdm.write(
+                f"Histórico: {stats['rows_written']} linhas em {stats['flushes']} gravações, "
+                f"{stats['write_time'] * 1000:.1f} ms de escrita"
+            )
+
+    def _close_outputs(self):
+        """Garante que histórico, telemetria e tabela Q pendentes vão para o destino, mesmo se interrompido."""
+        self.history.close()
+        if self.telemetry is not None:
+            self.telemetry.close()
+        self.agent.wait_for_save()
 
     def _train_vs_random(self):
-        stats = {'wins': 0, 'draws': 0, 'losses': 0}
+        return self._run_episodes(self._play_episode_vs_random, "Treinando vs Random")
 
-        for ep in tqdm(range(1, self.num_episodes + 1),
-                       desc="Treinando vs Random", unit="ep"):
-            game = TicTacToe()
-            state = game.get_state()
-            done = False
+    def _train_vs_minimax(self):
+        return self._run_episodes(self._play_episode_vs_minimax, "Treinando vs Minimax")
 
-            while not done:
-                # Jogada do agente
-                move = self.agent.choose_action(state, game.get_available_moves())
-                game.make_move(move, self.agent_symbol)
-                next_state = game.get_state()
-                winner = game.check_winner()
+    def _train_vs_mcts(self):
+        return self._run_episodes(self._play_episode_vs_mcts, "Treinando vs MCTS")
 
-                if winner is not None:
-                    done = True
-                    if winner == self.agent_symbol:
-                        stats['wins'] += 1
-                        r = 1.0
-                    elif winner == 'Draw':
-                        stats['draws'] += 1
-                        r = 1.0
-                    else:
-                        stats['losses'] += 1
-                        r = -1.0
-                    self.agent.update_q(state, move, r, next_state, [])
-                else:
-                    # Jogada aleatória do oponente
-                    opp = random.choice(game.get_available_moves())
-                    game.make_move(opp, self.opponent_symbol)
-                    ns2 = game.get_state()
-                    self.agent.update_q(state, move, 0.0, ns2,
-                                        game.get_available_moves())
-                    state = ns2
+    def _train_vs_self(self):
+        return self._run_episodes(self._play_episode_vs_self, "Treinando em self-play")
+
+    def _run_episodes(self, play_episode, desc):
+        stats = dict(self.initial_stats)
+
+        episodes = range(self.start_episode + 1, self.num_episodes + 1)
+        for ep in tqdm(episodes, desc=desc, unit="ep", initial=self.start_episode, total=self.num_episodes):
+            play_episode(ep, stats)
+            self._finish_episode()
 
             # Decaimento de epsilon
             self.agent.epsilon = max(self.agent.min_epsilon,
@@ -92,104 +215,244 @@ class TrainingManager:
 
             # Salva histórico e Q-table ao final de cada episódio
             self._append_history_entry(ep, stats['wins'], stats['draws'], stats['losses'], self.agent.epsilon)
-            
+
+            # Checkpoint: a cópia do estado é feita aqui, a gravação em segundo plano
+            if self.checkpointer is not None and (self.checkpointer.due(ep) or ep == self.num_episodes):
+                self.checkpointer.save(capture_state(self, ep, stats))
 
             # Log periódico no console
             if ep % self.log_interval == 0 or ep == self.num_episodes:
-                self.agent.save_q_table()
-                tqdm.write(
-                    f"{ep}/{self.num_episodes}: "
-                    f"{stats['wins']} vitórias, {stats['draws']} empates, {stats['losses']} derrotas, ε={self.agent.epsilon:.4f}"
-                )
+                self.agent.save_q_table(background=True)
+                self._log_progress(ep, stats)
+
+            if self.metrics is not None and (ep % self.metrics_interval == 0 or ep == self.num_episodes):
+                self.metrics.report(ep, len(self.agent.q_table))
 
         return stats, self.agent.epsilon
 
-    def _train_vs_minimax(self):
-        stats = {'wins': 0, 'draws': 0, 'losses': 0}
+    def _log_progress(self, ep, stats):
+        line = (
+            f"{ep}/{self.num_episodes}: "
+            f"{stats['wins']} vitórias, {stats['draws']} empates, {stats['losses']} derrotas, ε={self.agent.epsilon:.4f}"
+        )
+        if self.opponent_type == 'mcts' and self._mcts_time > 0:
+            line += f", MCTS {self._mcts_iterations_done / self._mcts_time:.0f} iterações/s"
+        tqdm.write(line)
 
-        for ep in tqdm(range(1, self.num_episodes + 1),
-                       desc="Treinando vs Minimax", unit="ep"):
-            game = TicTacToe()
-            state = game.get_state()
+    def run_episode(self, ep, stats):
+        """Joga um episódio contra o oponente configurado, atualizando stats."""
+        if self.opponent_type == 'random':
+            self._play_episode_vs_random(ep, stats)
+        elif self.opponent_type == 'mcts':
+            self._play_episode_vs_mcts(ep, stats)
+        elif self.opponent_type == 'self':
+            self._play_episode_vs_self(ep, stats)
+        else:
+            self._play_episode_vs_minimax(ep, stats)
+        self._finish_episode()
+
+    def _learn(self, state, move, reward, next_state, next_moves):
+        """Aprendizado após cada jogada do agente: imediato, ou guardado para o fim da partida."""
+        if self.replay is not None:
+            self.replay.add(*self.agent.encode_transition(state, move, reward, next_state, next_moves))
+        if self.trace_lambda is None:
+            self.agent.update_q(state, move, reward, next_state, next_moves)
+        else:
+            self._trajectory.append((state, move, reward, next_state, next_moves))
+
+    def _finish_episode(self):
+        """Aplica o retorno λ da partida encerrada e os lotes de replay."""
+        if self._trajectory:
+            self.agent.update_episode(self._trajectory, self.trace_lambda)
+            self._trajectory = []
+        if self.replay is not None and len(self.replay) >= self.replay_batch:
+            for _ in range(self.replay_batches):
+                self.agent.update_batch(*self.replay.sample(self.replay_batch))
+
+    def _play_episode_vs_random(self, ep, stats):
+        game = BitBoard()
+        state = game.get_state()
+        done = False
+
+        while not done:
+            # Jogada do agente
+            move = self.agent.choose_action(state, game.get_available_moves())
+            game.make_move(move, self.agent_symbol)
+            next_state = game.get_state()
+            winner = game.check_winner()
 
-            while True:
-                # Jogada do agente
-                move = self.agent.choose_action(state, game.get_available_moves())
-                if move not in game.get_available_moves():
-                    raise RuntimeError(f"Movimento inválido: {move}")
-                game.make_move(move, self.agent_symbol)
-
-                # Verifica término após agente
-                w = game.check_winner()
-                if w is not None:
-                    if w == self.agent_symbol:
-                        # Anomalia: o agente não deveria vencer o Minimax
-                        stats['wins'] += 1
-                        r = 1.0 # Recompensa alta por um evento raro
-                        tqdm.write(f"[ANOMALIA] Minimax perdeu no episódio {ep}\n{game}")
-                    elif w == 'Draw':
-                        stats['draws'] += 1
-                        r = 1.0
-                    else: # Unreachable code if Minimax plays optimally
-                        stats['losses'] += 1
-                        r = -1.0
-                    self.agent.update_q(state, move, r, game.get_state(), [])
-                    break
-
-                # Jogada do Minimax
-                opp_move = self.minimax.find_best_move(game)
-                if opp_move not in game.get_available_moves():
-                    raise RuntimeError(f"Minimax jogou inválido: {opp_move}")
-                game.make_move(opp_move, self.opponent_symbol)
-                
-                next_state_after_opp = game.get_state()
-                winner_after_opp = game.check_winner()
-
-                if winner_after_opp is not None:
-                    # Agente perdeu ou empatou
-                    if winner_after_opp == 'Draw':
-                        stats['draws'] += 1
-                        r = 0.5
-                    else: # Agente perdeu
-                        stats['losses'] += 1
-                        r = -1.0
-                    self.agent.update_q(state, move, r, next_state_after_opp, [])
-                    break
+            if winner is not None:
+                done = True
+                if winner == self.agent_symbol:
+                    stats['wins'] += 1
+                    r = 1.0
+                elif winner == 'Draw':
+                    stats['draws'] += 1
+                    r = 1.0
                 else:
-                    # Jogo continua, estado intermediário
-                    r = 0.0 # Recompensa neutra por sobreviver a um turno
-                    self.agent.update_q(state, move, r, next_state_after_opp, game.get_available_moves())
-                
-                state = next_state_after_opp
+                    stats['losses'] += 1
+                    r = -1.0
+                self._learn(state, move, r, next_state, [])
+            else:
+                # Jogada aleatória do oponente
+                opp = self._random_opponent_move(game)
+                game.make_move(opp, self.opponent_symbol)
+                ns2 = game.get_state()
+                self._learn(state, move, 0.0, ns2,
+                                    game.get_available_moves())
+                state = ns2
 
-            # Decaimento de epsilon
-            self.agent.epsilon = max(self.agent.min_epsilon,
-                                     self.agent.epsilon * self.agent.epsilon_decay)
+    def _random_opponent_move(self, game):
+        return random.choice(game.get_available_moves())
 
-            # Salva histórico e Q-table ao final de cada episódio
-            self._append_history_entry(ep, stats['wins'], stats['draws'], stats['losses'], self.agent.epsilon)
-            
+    def _play_episode_vs_mcts(self, ep, stats):
+        game = BitBoard()
+        state = game.get_state()
+        done = False
 
-            # Log periódico no console
-            if ep % self.log_interval == 0 or ep == self.num_episodes:
-                self.agent.save_q_table()
-                tqdm.write(
-                    f"{ep}/{self.num_episodes}: "
-                    f"{stats['wins']} vitórias, {stats['draws']} empates, {stats['losses']} derrotas, ε={self.agent.epsilon:.4f}"
-                )
+        while not done:
+            # Jogada do agente
+            move = self.agent.choose_action(state, game.get_available_moves())
+            game.make_move(move, self.agent_symbol)
+            winner = game.check_winner()
 
-        return stats, self.agent.epsilon
+            if winner is None:
+                # Jogada do MCTS
+                opp = self.mcts.find_best_move(game)
+                self._mcts_iterations_done += self.mcts.last_iterations
+                if self.mcts.iterations_per_second > 0:
+                    self._mcts_time += self.mcts.last_iterations / self.mcts.iterations_per_second
+                game.make_move(opp, self.opponent_symbol)
+                winner = game.check_winner()
+
+            next_state = game.get_state()
+            if winner is not None:
+                done = True
+                if winner == self.agent_symbol:
+                    stats['wins'] += 1
+                    r = 1.0
+                elif winner == 'Draw':
+                    stats['draws'] += 1
+                    r = 1.0
+                else:
+                    stats['losses'] += 1
+                    r = -1.0
+                self._learn(state, move, r, next_state, [])
+            else:
+                self._learn(state, move, 0.0, next_state, game.get_available_moves())
+                state = next_state
+
+    def _play_episode_vs_minimax(self, ep, stats):
+        game = BitBoard()
+        state = game.get_state()
+
+        while True:
+            # Jogada do agente
+            move = self.agent.choose_action(state, game.get_available_moves())
+            if move not in game.get_available_moves():
+                raise RuntimeError(f"Movimento inválido: {move}")
+            game.make_move(move, self.agent_symbol)
+
+            # Verifica término após agente
+            w = game.check_winner()
+            if w is not None:
+                if w == self.agent_symbol:
+                    # Anomalia: o agente não deveria vencer o Minimax
+                    stats['wins'] += 1
+                    r = 1.0 # Recompensa alta por um evento raro
+                    tqdm.write(f"[ANOMALIA] Minimax perdeu no episódio {ep}\n{game}")
+                elif w == 'Draw':
+                    stats['draws'] += 1
+                    r = 1.0
+                else: # Unreachable code if Minimax plays optimally
+                    stats['losses'] += 1
+                    r = -1.0
+                self._learn(state, move, r, game.get_state(), [])
+                break
+
+            # Jogada do Minimax
+            opp_move = self.minimax.find_best_move(game)
+            if opp_move not in game.get_available_moves():
+                raise RuntimeError(f"Minimax jogou inválido: {opp_move}")
+            game.make_move(opp_move, self.opponent_symbol)
+
+            next_state_after_opp = game.get_state()
+            winner_after_opp = game.check_winner()
+
+            if winner_after_opp is not None:
+                # Agente perdeu ou empatou
+                if winner_after_opp == 'Draw':
+                    stats['draws'] += 1
+                    r = 0.5
+                else: # Agente perdeu
+                    stats['losses'] += 1
+                    r = -1.0
+                self._learn(state, move, r, next_state_after_opp, [])
+                break
+            else:
+                # Jogo continua, estado intermediário
+                r = 0.0 # Recompensa neutra por sobreviver a um turno
+                self._learn(state, move, r, next_state_after_opp, game.get_available_moves())
+
+            state = next_state_after_opp
+
+    def _play_episode_vs_self(self, ep, stats):
+        """
+        Self-play: o agente joga com 'X' e com 'O' sobre a mesma tabela. Cada
+        lado vê o tabuleiro do ponto de vista de quem joga (com 'O' na vez, as
+        peças são trocadas por swap_players), de modo que a tabela guarda as
+        duas cadeiras no mesmo referencial, com 'X' na vez. As contagens de
+        peças diferem ('X' tem tantas peças quanto 'O'; 'O', trocado, uma a
+        mais), então as cadeiras nunca compartilham entradas. A tabela é
+        gravada com self_play=True (ver QLearningAgent). As transições de cada lado vão do seu estado
+        ao seu próximo estado (após a resposta do adversário) e são aplicadas
+        em lote ao fim da partida, com update_episode (λ = trace_lambda, ou 0).
+        Recompensas: vitória +1, empate +0.5, derrota -1. stats conta os
+        resultados de agent_symbol.
+        """
+        game = BitBoard()
+        player = 'X'
+        trajectories = {'X': [], 'O': []}
+        pending = {'X': None, 'O': None}  # (estado, jogada) à espera do próximo estado
+
+        while True:
+            state = game.get_state()
+            if player == 'O':
+                state = swap_players(state)
+            moves = game.get_available_moves()
+            if pending[player] is not None:
+                trajectories[player].append(pending[player] + (0.0, state, moves))
+            move = self.agent.choose_action(state, moves)
+            game.make_move(move, player)
+            pending[player] = (state, move)
+            winner = game.check_winner()
+            if winner is not None:
+                break
+            player = 'O' if player == 'X' else 'X'
+
+        final = game.get_state()
+        for side, trajectory in trajectories.items():
+            if pending[side] is None:
+                continue
+            reward = 0.5 if winner == 'Draw' else 1.0 if winner == side else -1.0
+            trajectory.append(pending[side] + (reward, final if side == 'X' else swap_players(final), []))
+            if self.replay is not None:
+                for transition in trajectory:
+                    self.replay.add(*self.agent.encode_transition(*transition))
+            self.agent.update_episode(trajectory, self.trace_lambda or 0.0)
+
+        if winner == 'Draw':
+            stats['draws'] += 1
+        elif winner == self.agent_symbol:
+            stats['wins'] += 1
+        else:
+            stats['losses'] += 1
 
     def _append_history_entry(self, episode, wins, draws, losses, epsilon):
         """
         Acrescenta uma única linha com os resultados do episódio em history/history.csv.
+        A linha é bufferizada pelo HistoryWriter e gravada em lote.
         """
-        with open(self.history_file, "a", newline="") as f:
-            writer = csv.writer(f)
-            writer.writerow([
-                episode,
-                wins,
-                draws,
-                losses,
-                f"{epsilon:.6f}"
-            ])
\ No newline at end of file
+        self.history.append(episode, wins, draws, losses, epsilon)
+        if self.telemetry is not None:
+            self.telemetry.publish(episode, wins, draws, losses, epsilon)
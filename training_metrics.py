@@ -0,0 +1,93 @@
+import json
+import os
+import time
+from collections import defaultdict
+
+from tqdm import tqdm
+
+
+class TrainingMetrics:
+    """
+    Instrumentação opcional do treinamento (ver TrainingManager, metrics_file).
+
+    instrument() troca um método de um objeto por uma versão cronometrada,
+    apenas naquele objeto: sem instrumentação nada é envolvido e o treino
+    não paga custo algum. A cada report() uma linha JSON é acrescentada ao
+    arquivo de métricas, com o tempo e o número de chamadas de cada fase,
+    os contadores (p.ex. nós do Minimax), o tamanho da tabela Q e sua
+    variação, e os episódios por segundo do intervalo.
+    """
+
+    def __init__(self, metrics_file: str):
+        self.metrics_file = metrics_file
+        os.makedirs(os.path.dirname(metrics_file) or '.', exist_ok=True)
+        self._file = open(metrics_file, 'a')
+        self.times = defaultdict(float)
+        self.calls = defaultdict(int)
+        self.counters = defaultdict(int)
+        self._last_report = time.perf_counter()
+        self._last_episode = 0
+        self._last_q_size = None
+
+    def instrument(self, obj, method: str, phase: str, after=None):
+        """
+        Cronometra obj.method sob o nome phase. after(obj), se informado, é
+        chamado depois de cada chamada (para atualizar contadores).
+        """
+        func = getattr(obj, method)
+        times, calls, clock = self.times, self.calls, time.perf_counter
+
+        def timed(*args, **kwargs):
+            start = clock()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                times[phase] += clock() - start
+                calls[phase] += 1
+                if after is not None:
+                    after(obj)
+
+        setattr(obj, method, timed)
+
+    def count(self, name: str, amount: int = 1):
+        self.counters[name] += amount
+
+    def report(self, episode: int, q_table_size: int) -> dict:
+        """Grava e imprime as métricas acumuladas desde o último relatório."""
+        now = time.perf_counter()
+        elapsed = now - self._last_report
+        episodes = episode - self._last_episode
+        entry = {
+            'episode': episode,
+            'elapsed': elapsed,
+            'episodes_per_sec': episodes / elapsed if elapsed > 0 else 0.0,
+            'phases': {
+                phase: {'seconds': seconds, 'calls': self.calls[phase], 'share': seconds / elapsed if elapsed > 0 else 0.0}
+                for phase, seconds in self.times.items()
+            },
+            'counters': dict(self.counters),
+            'q_table_size': q_table_size,
+            'q_table_growth': q_table_size - self._last_q_size if self._last_q_size is not None else q_table_size,
+        }
+        self._file.write(json.dumps(entry) + '\n')
+        self._file.flush()
+
+        shares = ', '.join(
+            f"{phase} {info['share'] * 100:.0f}%" for phase, info in sorted(entry['phases'].items())
+        )
+        tqdm.write(
+            f"[métricas] {entry['episodes_per_sec']:.0f} ep/s, tabela Q {q_table_size} estados "
+            f"(+{entry['q_table_growth']}); {shares}"
+        )
+
+        self.times.clear()
+        self.calls.clear()
+        self.counters.clear()
+        self._last_report = now
+        self._last_episode = episode
+        self._last_q_size = q_table_size
+        return entry
+
+    def close(self):
+        if not self._file.closed:
+            self._file.close()
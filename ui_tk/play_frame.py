@@ -1,13 +1,25 @@
 import tkinter as tk
 from tkinter import ttk, font
 import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 
-from game.tic_tac_toe import TicTacToe
-from agents.minimax_agent import MinimaxAgent
-from agents.qlearning_agent import QLearningAgent
+from game.bitboard import BitBoard
+from game.mnk_board import MNKBoard
+from agents.mcts_agent import MCTSAgent
+from agents.minimax_agent import SearchCancelled
+from agents.registry import registry
 
 class PlayFrame(tk.Frame):
-    PLAYER_OPTIONS = ["Human", "Minimax", "Q-Learning", "Random"]
+    PLAYER_OPTIONS = ["Human", "Minimax", "MCTS", "Q-Learning", "Random"]
+    AI_POLL_MS = 30  # Intervalo de verificação da jogada calculada em segundo plano
+    TURBO_REFRESH_MS = 100  # Modo turbo: placar e tabuleiro atualizados a 10 Hz
+    # Tabuleiros m,n,k: (linhas, colunas, peças em linha)
+    BOARD_OPTIONS = {"3x3": (3, 3, 3), "4x4": (4, 4, 4), "5x5 (4 em linha)": (5, 5, 4), "7x7 (5 em linha)": (7, 7, 5)}
+    MNK_TIME_LIMIT = 2.0  # Segundos por jogada do Minimax em tabuleiros maiores que 3x3
+    MCTS_TIME_LIMIT = 1.0  # Segundos por jogada do MCTS
+    MCTS_TURBO_ITERATIONS = 2000  # Iterações por jogada do MCTS no modo turbo
 
     def __init__(self, parent, controller):
         super().__init__(parent)
@@ -18,13 +30,24 @@ class PlayFrame(tk.Frame):
         self.player_types = {}
         self.agents = {}
         self.current_symbol = 'X'
+        self.rows, self.cols, self.k = self.BOARD_OPTIONS["3x3"]
         self.is_running = False  # Controla se uma sequência de jogos está ativa
 
+        # Jogadas das IAs são calculadas fora da thread do Tk
+        self.executor = ThreadPoolExecutor(max_workers=1)
+        self.ai_future = None
+        self.ai_cancel = None   # threading.Event da busca em andamento (um por jogada)
+        self.ai_generation = 0  # Invalida resultados de buscas canceladas
+        self.sequence_id = 0    # Invalida callbacks agendados de sequências anteriores
+        self.turbo_stop = None  # threading.Event da simulação turbo em andamento
+
         # --- Variáveis da UI ---
         self.player_x_var = tk.StringVar(value=self.PLAYER_OPTIONS[0])
         self.player_o_var = tk.StringVar(value=self.PLAYER_OPTIONS[1])
         self.games_to_play_var = tk.IntVar(value=1)
         self.delay_var = tk.IntVar(value=500)
+        self.turbo_var = tk.BooleanVar(value=False)
+        self.board_var = tk.StringVar(value="3x3")
         self.score_x = tk.IntVar(value=0)
         self.score_o = tk.IntVar(value=0)
         self.draws = tk.IntVar(value=0)
@@ -67,10 +90,19 @@ class PlayFrame(tk.Frame):
         self.delay_scale = tk.Scale(self.controls_frame, variable=self.delay_var, from_=50, to=2000, orient="horizontal", length=150)
         self.delay_scale.grid(row=0, column=7, padx=5)
 
+        # Seletor do tabuleiro
+        tk.Label(self.controls_frame, text="Tabuleiro:").grid(row=1, column=0, pady=(5, 0))
+        self.board_menu = ttk.Combobox(self.controls_frame, textvariable=self.board_var, values=list(self.BOARD_OPTIONS), state="readonly", width=16)
+        self.board_menu.grid(row=1, column=1, columnspan=2, sticky="w", padx=5, pady=(5, 0))
+
+        # Modo turbo: simula sem animação (apenas IA contra IA)
+        self.turbo_check = ttk.Checkbutton(self.controls_frame, text="Turbo", variable=self.turbo_var)
+        self.turbo_check.grid(row=1, column=6, columnspan=2, pady=(5, 0))
+
         # Botões de Ação
         self.start_button = ttk.Button(self.controls_frame, text="Iniciar Sequência", command=self.start_sequence)
         self.start_button.grid(row=0, column=8, padx=10)
-        ttk.Button(self.controls_frame, text="Voltar", command=self.controller.show_menu).grid(row=0, column=9, padx=10)
+        ttk.Button(self.controls_frame, text="Voltar", command=self.on_back).grid(row=0, column=9, padx=10)
 
     def _create_status_frame(self):
         status_container = tk.Frame(self)
@@ -92,11 +124,27 @@ class PlayFrame(tk.Frame):
         self.board_frame = tk.Frame(self)
         self.board_frame.pack(fill="both", expand=True, padx=20, pady=20)
         self.buttons = []
-        for r in range(3):
-            self.board_frame.rowconfigure(r, weight=1)
-            self.board_frame.columnconfigure(r, weight=1)
+        self._build_board_buttons()
+
+    def _build_board_buttons(self):
+        """(Re)cria a grade de botões com self.rows x self.cols casas."""
+        for row in self.buttons:
+            for btn in row:
+                btn.destroy()
+        for i in range(max(self.rows, self.cols, 7)):
+            self.board_frame.rowconfigure(i, weight=1 if i < self.rows else 0)
+            self.board_frame.columnconfigure(i, weight=1 if i < self.cols else 0)
+
+        # Fonte e espaçamento menores em tabuleiros maiores
+        self.btn_font.configure(size=32 if self.cols <= 3 else max(14, 96 // self.cols))
+        padding = 20 if self.cols <= 3 else 6
+        ttk.Style().configure("Victory.TButton", padding=padding)
+        ttk.Style().configure("Board.TButton", padding=padding)
+
+        self.buttons = []
+        for r in range(self.rows):
             row_buttons = []
-            for c in range(3):
+            for c in range(self.cols):
                 btn = ttk.Button(self.board_frame, text=" ", style="Board.TButton",
                                  command=lambda rr=r, cc=c: self.on_human_move(rr, cc))
                 btn.grid(row=r, column=c, sticky="nsew", padx=5, pady=5)
@@ -108,26 +156,54 @@ class PlayFrame(tk.Frame):
     def start_sequence(self):
         if self.is_running:
             return
-            
+
+        player_types = {'X': self.player_x_var.get(), 'O': self.player_o_var.get()}
+        geometry = self.BOARD_OPTIONS[self.board_var.get()]
+        if geometry != (3, 3, 3) and "Q-Learning" in player_types.values():
+            self.status_label.config(text="O agente Q-Learning só joga no tabuleiro 3x3.")
+            return
+
+        self._cancel_ai_move()
+        if geometry != (self.rows, self.cols, self.k):
+            self.rows, self.cols, self.k = geometry
+            self._build_board_buttons()
+        self.sequence_id += 1
         self.is_running = True
         self._toggle_controls_state(tk.DISABLED)
         self._reset_scores()
         
-        self.player_types = {'X': self.player_x_var.get(), 'O': self.player_o_var.get()}
+        self.player_types = player_types
         self._initialize_agents()
-        
-        self._start_new_game()
+
+        if self.turbo_var.get() and "Human" not in self.player_types.values():
+            self._start_turbo()
+        else:
+            self._start_new_game()
 
     def _start_new_game(self):
-        self.game = TicTacToe()
+        self.game = self._new_board()
         self.current_symbol = 'X'
         self._clear_board()
         
+        self.status_label.config(text=self._game_title())
+
+        self._schedule(50, self._game_loop) # Pequeno delay para iniciar o loop
+
+    def _new_board(self):
+        """Tabuleiro vazio da geometria atual (BitBoard no 3x3, usado pelas tabelas do Minimax e da Q)."""
+        if (self.rows, self.cols, self.k) == (3, 3, 3):
+            return BitBoard()
+        return MNKBoard(self.rows, self.cols, self.k)
+
+    def _schedule(self, delay_ms, callback):
+        """after() que ignora o callback se a sequência tiver sido interrompida ou reiniciada."""
+        sequence_id = self.sequence_id
+        self.after(delay_ms, lambda: callback() if sequence_id == self.sequence_id else None)
+
+    def _game_title(self):
         current_game_num = self.score_x.get() + self.score_o.get() + self.draws.get() + 1
         total_games = self.games_to_play_var.get()
-        self.status_label.config(text=f"Jogo {current_game_num} de {total_games}")
-        
-        self.after(50, self._game_loop) # Pequeno delay para iniciar o loop
+        return f"Jogo {current_game_num} de {total_games}"
 
     def _game_loop(self):
         if not self.is_running:
@@ -135,30 +211,182 @@ class PlayFrame(tk.Frame):
 
         winner = self.game.check_winner()
         if winner:
-            self.after(self.delay_var.get(), lambda: self._handle_game_over(winner))
+            self._schedule(self.delay_var.get(), lambda: self._handle_game_over(winner))
             return
 
         if self.player_types[self.current_symbol] == "Human":
             self._enable_available_cells()
         else: # É a vez de uma IA
-            self.after(self.delay_var.get(), self._make_ai_move)
+            self._schedule(self.delay_var.get(), self._make_ai_move)
 
     def _make_ai_move(self):
-        move = self._get_ai_move(self.game, self.current_symbol)
+        """Dispara o cálculo da jogada em segundo plano e passa a acompanhá-lo."""
+        if not self.is_running:
+            return
+        self.ai_generation += 1
+        board = self.game.copy()  # A busca nunca toca o tabuleiro exibido
+        self.ai_cancel = threading.Event()
+        self.ai_future = self.executor.submit(self._get_ai_move, board, self.current_symbol, self.ai_cancel)
+        self.ai_started = time.perf_counter()
+        self._poll_ai_move(self.ai_generation)
+
+    def _poll_ai_move(self, generation):
+        if not self.is_running or generation != self.ai_generation:
+            return  # Busca cancelada ou sequência encerrada
+
+        if not self.ai_future.done():
+            elapsed = time.perf_counter() - self.ai_started
+            self.status_label.config(text=f"{self._game_title()} — {self.current_symbol} pensando... {elapsed:.1f}s")
+            self.after(self.AI_POLL_MS, lambda: self._poll_ai_move(generation))
+            return
+
+        try:
+            move = self.ai_future.result()
+        except SearchCancelled:
+            return
+        except Exception as exc:
+            self.ai_future = None
+            self.ai_cancel = None
+            self._stop_sequence(f"Erro na jogada de {self.current_symbol}: {exc}")
+            return
+        self.ai_future = None
+        self.ai_cancel = None
+        elapsed = time.perf_counter() - self.ai_started
+        status = f"{self._game_title()} — {self.current_symbol} jogou em {elapsed:.2f}s"
+        agent = self.agents.get(self.current_symbol)
+        if isinstance(agent, MCTSAgent):
+            status += f" ({agent.last_iterations} iterações, {agent.iterations_per_second:.0f}/s)"
+        self.status_label.config(text=status)
         self._apply_move(move)
-        
+
         self._game_loop() # Continua para o próximo turno
 
+    # --- MODO TURBO ---
+
+    def _start_turbo(self):
+        """
+        Simula a sequência inteira em segundo plano, na velocidade máxima, e
+        só atualiza placar e tabuleiro a cada TURBO_REFRESH_MS.
+        """
+        self._clear_board()
+        self.turbo_stop = threading.Event()
+        self.turbo_progress = {'X': 0, 'O': 0, 'Draw': 0, 'board': None, 'lock': threading.Lock()}
+        self.turbo_started = time.perf_counter()
+        self.ai_future = self.executor.submit(
+            self._run_turbo_games, self.games_to_play_var.get(), self.turbo_progress, self.turbo_stop
+        )
+        self._schedule(self.TURBO_REFRESH_MS, self._poll_turbo)
+
+    def _run_turbo_games(self, total_games, progress, stop):
+        """Executado fora da thread do Tk: joga as partidas e publica o progresso."""
+        if "Minimax" in self.player_types.values() and (self.rows, self.cols, self.k) == (3, 3, 3):
+            # Resolve o jogo uma única vez: cada jogada do Minimax vira uma consulta
+            registry.solve_minimax()
+        for _ in range(total_games):
+            game = self._new_board()
+            symbol = 'X'
+            winner = None
+            while winner is None:
+                if stop.is_set():
+                    return
+                try:
+                    move = self._get_ai_move(game, symbol, stop)
+                except SearchCancelled:
+                    return
+                game.make_move(move, symbol)
+                symbol = 'O' if symbol == 'X' else 'X'
+                winner = game.check_winner()
+            with progress['lock']:
+                progress[winner] += 1
+                progress['board'] = game.get_state()
+
+    def _poll_turbo(self):
+        with self.turbo_progress['lock']:
+            x_wins = self.turbo_progress['X']
+            o_wins = self.turbo_progress['O']
+            draws = self.turbo_progress['Draw']
+            board = self.turbo_progress['board']
+        self.score_x.set(x_wins)
+        self.score_o.set(o_wins)
+        self.draws.set(draws)
+        if board is not None:
+            self._show_board(board)
+
+        played = x_wins + o_wins + draws
+        elapsed = time.perf_counter() - self.turbo_started
+        rate = played / elapsed if elapsed > 0 else 0.0
+        status = f"Turbo: {played} de {self.games_to_play_var.get()} jogos — {rate:.0f} jogos/s"
+
+        if self.ai_future.done():
+            future, self.ai_future = self.ai_future, None
+            try:
+                future.result()
+            except Exception as exc:
+                # Falha na simulação: interrompe o turbo e mantém o placar parcial
+                if self.turbo_stop is not None:
+                    self.turbo_stop.set()
+                    self.turbo_stop = None
+                self._stop_sequence(f"Erro no turbo após {played} jogos: {exc}")
+                return
+            self.turbo_stop = None
+            self.status_label.config(
+                text=f"Sequência concluída! Placar final: X {x_wins} - O {o_wins} - Empates {draws} ({rate:.0f} jogos/s)"
+            )
+            self.is_running = False
+            self._toggle_controls_state(tk.NORMAL)
+        else:
+            self.status_label.config(text=status)
+            self._schedule(self.TURBO_REFRESH_MS, self._poll_turbo)
+
+    def _show_board(self, state):
+        for pos, val in enumerate(state):
+            r, c = divmod(pos, self.cols)
+            self.buttons[r][c].config(text=val if val is not None else " ")
+
+    def _cancel_ai_move(self):
+        """Cancela a busca (ou simulação turbo) em andamento e descarta seu resultado."""
+        self.ai_generation += 1
+        if self.turbo_stop is not None:
+            self.turbo_stop.set()
+            self.turbo_stop = None
+        if self.ai_cancel is not None:
+            # Só este pedido é cancelado; os agentes (compartilhados pelo registro) não mudam
+            self.ai_cancel.set()
+            self.ai_cancel = None
+        if self.ai_future is not None:
+            self.ai_future.cancel()
+            self.ai_future = None
+
+    def _stop_sequence(self, message):
+        """Encerra a sequência em andamento, libera os controles e mostra a mensagem."""
+        self.sequence_id += 1
+        self.is_running = False
+        self._disable_all_cells()
+        self._toggle_controls_state(tk.NORMAL)
+        self.status_label.config(text=message)
+
+    def on_back(self):
+        """Interrompe a sequência atual (e a busca em andamento) e volta ao menu."""
+        self._cancel_ai_move()
+        if self.is_running:
+            self._stop_sequence("Sequência interrompida.")
+        self.controller.show_menu()
+
+    def destroy(self):
+        self._cancel_ai_move()
+        self.executor.shutdown(wait=False)
+        super().destroy()
+
     def on_human_move(self, row, col):
         self._disable_all_cells()
-        move = row * 3 + col
+        move = row * self.cols + col
         self._apply_move(move)
         
         self._game_loop() # Continua para o próximo turno
 
     def _apply_move(self, move):
         # Aplica a jogada na lógica e na UI
-        r, c = divmod(move, 3)
+        r, c = divmod(move, self.cols)
         self.buttons[r][c].config(text=self.current_symbol)
         self.game.make_move(move, self.current_symbol)
         self.current_symbol = 'O' if self.current_symbol == 'X' else 'X'
@@ -171,7 +399,7 @@ class PlayFrame(tk.Frame):
         
         if total_games_played < total_games_to_play:
             # Pausa para mostrar o resultado antes de começar o próximo jogo
-            self.after(1500, self._start_new_game)
+            self._schedule(1500, self._start_new_game)
         else:
             self.status_label.config(text=f"Sequência concluída! Placar final: X {self.score_x.get()} - O {self.score_o.get()} - Empates {self.draws.get()}")
             self.is_running = False
@@ -183,21 +411,33 @@ class PlayFrame(tk.Frame):
         for symbol in ('X', 'O'):
             ptype = self.player_types.get(symbol)
             if ptype == 'Minimax':
-                self.agents[symbol] = MinimaxAgent(ai_player=symbol, human_player='O' if symbol == 'X' else 'X')
+                # Reaproveitado entre sequências; a tabela de transposição é do processo
+                if (self.rows, self.cols, self.k) == (3, 3, 3):
+                    self.agents[symbol] = registry.minimax_agent(symbol, alpha_beta=True, use_book=True)
+                else:
+                    self.agents[symbol] = registry.minimax_agent(symbol, time_limit=self.MNK_TIME_LIMIT)
+            elif ptype == 'MCTS':
+                # Uma árvore por sequência, reaproveitada entre as jogadas; no
+                # turbo o orçamento é de iterações, não de tempo
+                if self.turbo_var.get():
+                    self.agents[symbol] = MCTSAgent(symbol, 'O' if symbol == 'X' else 'X', iterations=self.MCTS_TURBO_ITERATIONS)
+                else:
+                    self.agents[symbol] = MCTSAgent(symbol, 'O' if symbol == 'X' else 'X', time_limit=self.MCTS_TIME_LIMIT)
             elif ptype == 'Q-Learning':
-                self.agents[symbol] = QLearningAgent(0.5, 0.9, .01, 0.995, 0.01, f'q_table.json')
+                # A tabela só é relida do disco se q_table.json tiver mudado
+                self.agents[symbol] = registry.q_learning_agent('q_table.json', epsilon=.01, player=symbol)
             else:
                 self.agents[symbol] = None
 
-    def _get_ai_move(self, game, symbol):
+    def _get_ai_move(self, game, symbol, cancel_event=None):
         ptype = self.player_types[symbol]
         if ptype == 'Random':
             return random.choice(game.get_available_moves())
         
         agent = self.agents[symbol]
         state = game.get_state()
-        if ptype == 'Minimax':
-            return agent.find_best_move(game)
+        if ptype in ('Minimax', 'MCTS'):
+            return agent.find_best_move(game, cancel_event)
         elif ptype == 'Q-Learning':
             return agent.choose_action(state, game.get_available_moves())
         return None
@@ -215,17 +455,17 @@ class PlayFrame(tk.Frame):
             
             # Destaca a linha vencedora
             for pos in self.game.get_winning_line():
-                r, c = divmod(pos, 3)
+                r, c = divmod(pos, self.cols)
                 self.buttons[r][c].config(style="Victory.TButton")
 
     def _clear_board(self):
-        for r in range(3):
-            for c in range(3):
-                self.buttons[r][c].config(text=" ", style="Board.TButton", state=tk.DISABLED)
+        for row in self.buttons:
+            for btn in row:
+                btn.config(text=" ", style="Board.TButton", state=tk.DISABLED)
 
     def _enable_available_cells(self):
         for pos in self.game.get_available_moves():
-            r, c = divmod(pos, 3)
+            r, c = divmod(pos, self.cols)
             self.buttons[r][c].config(state=tk.NORMAL)
 
     def _disable_all_cells(self):
@@ -243,4 +483,6 @@ class PlayFrame(tk.Frame):
         self.p_o_menu.config(state=state)
         self.num_games_spinbox.config(state=state)
         self.delay_scale.config(state=state)
+        self.turbo_check.config(state=state)
+        self.board_menu.config(state="readonly" if state == tk.NORMAL else state)
         self.start_button.config(state=state)
\ No newline at end of file
@@ -0,0 +1,203 @@
+import numpy as np
+from tqdm import tqdm
+
+from agents.minimax_agent import MinimaxAgent
+from agents.q_table import DenseQTable
+from game.bitboard import BitBoard
+from game.symmetry import INVERSE, canonical_state
+from game.vector_tic_tac_toe import DRAW, EMPTY, O, X, VectorTicTacToe
+from training_manager import TrainingManager
+
+
+class VectorTrainingManager(TrainingManager):
+    """
+    Treinamento em lote: num_envs partidas avançam juntas em um
+    VectorTicTacToe, e as escolhas do agente e as atualizações da tabela Q
+    são feitas com indexação avançada sobre a tabela densa.
+
+    As recompensas seguem o treino serial contra o Minimax: vitória +1,
+    empate +1 quando encerrado pela jogada do agente e +0,5 quando encerrado
+    pela do oponente, derrota -1 (detectada logo após a jogada do oponente). Atualizações
+    repetidas do mesmo par (estado, ação) em um passo são combinadas pela
+    média dos erros de TD. O oponente Minimax consulta a solução completa do
+    jogo (MinimaxAgent.solve_game_tree) convertida em uma máscara das jogadas
+    ótimas de cada estado, sorteando entre elas (ou usando a de menor índice
+    com minimax_random_ties=False).
+    """
+
+    def __init__(
+        self,
+        agent_symbol: str,
+        opponent_type: str,
+        num_episodes: int,
+        num_envs: int = 4096,
+        seed: int = None,
+        **kwargs
+    ):
+        # Com milhares de episódios por passo, salvar a cada 100 seria constante
+        kwargs.setdefault('log_interval', 100_000)
+        if opponent_type.lower() not in ('random', 'minimax'):
+            raise ValueError("O treino vetorizado só aceita os oponentes 'random' e 'minimax'.")
+        super().__init__(agent_symbol, opponent_type, num_episodes, **kwargs)
+        if not isinstance(self.agent.q_table, DenseQTable):
+            raise ValueError("O treino vetorizado requer o backend 'dense' da tabela Q.")
+        self.num_envs = num_envs
+        self.rng = np.random.default_rng(seed)
+        self.agent_code = X if agent_symbol == 'X' else O
+        self.opponent_code = O if self.agent_code == X else X
+        self._build_lookup_tables()
+
+    def _build_lookup_tables(self):
+        state_ids = DenseQTable._state_ids
+        num_states = len(state_ids)
+
+        # Referencial canônico de cada estado (apenas com simetria)
+        if self.agent.symmetric:
+            index = DenseQTable._index
+            self._canon_index = np.empty(num_states, dtype=np.int32)
+            self._canon_transform = np.empty(num_states, dtype=np.int8)
+            for i, sid in enumerate(state_ids):
+                cstate, t = canonical_state(BitBoard.from_state_id(sid).get_state())
+                self._canon_index[i] = index[cstate]
+                self._canon_transform[i] = t
+            self._inverse = np.array(INVERSE, dtype=np.int64)
+
+        # Jogadas ótimas do Minimax em cada estado em que o oponente está na vez
+        if self.opponent_type == 'minimax':
+            solution = MinimaxAgent.solve_game_tree()
+            self._opponent_moves = np.zeros((num_states, 9), dtype=bool)
+            for i, sid in enumerate(state_ids):
+                entry = solution.get((sid, self.opponent_symbol))
+                if entry is not None:
+                    self._opponent_moves[i, entry[1]] = True
+
+    # --- Acesso à tabela Q em lote ---
+
+    def _q_rows(self, idx: np.ndarray) -> np.ndarray:
+        """Linhas Q dos estados idx, no referencial original do tabuleiro."""
+        values = self.agent.q_table.values
+        if not self.agent.symmetric:
+            return values[idx]
+        rows = values[self._canon_index[idx]]
+        return np.take_along_axis(rows, self._inverse[self._canon_transform[idx]], axis=1)
+
+    def _q_coords(self, idx: np.ndarray, actions: np.ndarray) -> tuple:
+        """Linha e coluna da tabela Q para cada par (estado, ação)."""
+        if not self.agent.symmetric:
+            return idx, actions
+        return self._canon_index[idx], self._inverse[self._canon_transform[idx], actions]
+
+    def _choose_actions(self, env: VectorTicTacToe, rows: np.ndarray, idx: np.ndarray, epsilon: float) -> np.ndarray:
+        """Política epsilon-gulosa para os tabuleiros rows (de estados idx)."""
+        q = self._q_rows(idx)
+        best = q == q.max(axis=1, keepdims=True)
+        # Desempate aleatório entre as ações de maior valor
+        actions = np.where(best, self.rng.random(best.shape), -1.0).argmax(axis=1)
+        if epsilon > 0:
+            explore = self.rng.random(len(idx)) < epsilon
+            actions = np.where(explore, env.random_actions(self.rng)[rows], actions)
+        return actions
+
+    def _batch_update(self, idx, actions, rewards, next_idx, has_next):
+        table = self.agent.q_table
+        rows, cols = self._q_coords(idx, actions)
+        future = np.zeros(len(idx))
+        if has_next.any():
+            future[has_next] = self._q_rows(next_idx[has_next]).max(axis=1)
+        td_error = rewards + self.agent.gamma * future - table.values[rows, cols]
+
+        flat = rows.astype(np.int64) * 9 + cols
+        size = table.values.size
+        sums = np.bincount(flat, weights=td_error, minlength=size)
+        counts = np.bincount(flat, minlength=size)
+        touched = counts > 0
+        table.values.reshape(-1)[touched] += self.agent.alpha * sums[touched] / counts[touched]
+        table.visited.reshape(-1)[touched] = True
+
+    # --- Laço principal ---
+
+    def train(self):
+        try:
+            return self._run(self.num_episodes, learn=True)
+        finally:
+            self._close_outputs()
+
+    def evaluate(self, num_games: int) -> dict:
+        """Joga num_games partidas com a política gulosa, sem aprender."""
+        stats, _ = self._run(num_games, learn=False)
+        return stats
+
+    def _run(self, num_games: int, learn: bool):
+        stats = {'wins': 0, 'draws': 0, 'losses': 0}
+        agent = self.agent
+        batch = min(self.num_envs, num_games)
+        env = VectorTicTacToe(batch, first_player=self.agent_code, auto_reset=False)
+        active = np.ones(batch, dtype=bool)
+        started = batch
+        finished = 0
+        epsilon = agent.epsilon if learn else 0.0
+
+        progress = tqdm(total=num_games, desc=f"Treinando vs {self.opponent_type} (lote {batch})"
+                        if learn else "Avaliando", unit="ep")
+        while finished < num_games:
+            rows = np.flatnonzero(active)
+            idx = DenseQTable.indices(env.state_ids()[rows])
+            actions = np.zeros(batch, dtype=np.int64)
+            actions[rows] = self._choose_actions(env, rows, idx, epsilon)
+
+            # Jogada do agente
+            result = env.step(actions, mask=active)
+            agent_done = result != EMPTY
+
+            # Jogada do oponente nas partidas que continuam
+            opp_mask = active & ~agent_done
+            if self.opponent_type == 'minimax':
+                opp_actions = np.zeros(batch, dtype=np.int64)
+                opp_rows = np.flatnonzero(opp_mask)
+                optimal = self._opponent_moves[DenseQTable.indices(env.state_ids()[opp_rows])]
+                if self.minimax_random_ties:
+                    optimal = np.where(optimal, self.rng.random(optimal.shape), -1.0)
+                opp_actions[opp_rows] = optimal.argmax(axis=1)
+            else:
+                opp_actions = env.random_actions(self.rng)
+            opp_result = env.step(opp_actions, mask=opp_mask)
+            result = np.where(agent_done, result, opp_result)[rows]
+
+            done = result != EMPTY
+            wins = result == self.agent_code
+            draws = result == DRAW
+            losses = done & ~wins & ~draws
+
+            if learn:
+                draw_reward = np.where(agent_done[rows], 1.0, 0.5)
+                rewards = np.where(wins, 1.0, np.where(draws, draw_reward, np.where(losses, -1.0, 0.0)))
+                next_idx = np.zeros(len(rows), dtype=np.int64)
+                if (~done).any():
+                    next_idx[~done] = DenseQTable.indices(env.state_ids()[rows[~done]])
+                self._batch_update(idx, actions[rows], rewards, next_idx, ~done)
+
+            n_done = int(done.sum())
+            stats['wins'] += int(wins.sum())
+            stats['draws'] += int(draws.sum())
+            stats['losses'] += int(losses.sum())
+            previous = finished
+            finished += n_done
+
+            # Reinicia as partidas encerradas enquanto houver episódios a iniciar
+            done_envs = rows[done]
+            env.reset(np.isin(np.arange(batch), done_envs))
+            restart = min(len(done_envs), num_games - started)
+            active[done_envs[restart:]] = False
+            started += restart
+
+            if learn and n_done:
+                epsilon = max(agent.min_epsilon, epsilon * agent.epsilon_decay ** n_done)
+                agent.epsilon = epsilon
+                self._append_history_entry(finished, stats['wins'], stats['draws'], stats['losses'], epsilon)
+                if finished // self.log_interval > previous // self.log_interval or finished == num_games:
+                    agent.save_q_table(background=True)
+                    self._log_progress(finished, stats)
+            progress.update(n_done)
+        progress.close()
+
+        return stats, agent.epsilon